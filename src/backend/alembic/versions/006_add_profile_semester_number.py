@@ -0,0 +1,57 @@
+"""Add normalized semester number to profiles
+
+Revision ID: 006_profile_semester_number
+Revises: 005_add_verification_code
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.semester import parse_semester
+
+
+# revision identifiers, used by Alembic.
+revision: str = "006_profile_semester_number"
+down_revision: Union[str, Sequence[str], None] = "005_add_verification_code"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+profiles = sa.table(
+    "profiles",
+    sa.column("id", sa.Integer),
+    sa.column("semester", sa.String),
+    sa.column("semester_number", sa.Integer),
+)
+
+
+def upgrade() -> None:
+    op.add_column("profiles", sa.Column("semester_number", sa.Integer(), nullable=True))
+
+    # Backfill: o parser é o mesmo usado pelo model, então roda em Python
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(profiles.c.id, profiles.c.semester).where(profiles.c.semester.isnot(None))
+    ).all()
+    updates = [
+        {"profile_id": profile_id, "number": number}
+        for profile_id, semester in rows
+        if (number := parse_semester(semester)) is not None
+    ]
+    if updates:
+        conn.execute(
+            profiles.update()
+            .where(profiles.c.id == sa.bindparam("profile_id"))
+            .values(semester_number=sa.bindparam("number")),
+            updates,
+        )
+
+    op.create_index("ix_profiles_semester_number", "profiles", ["semester_number"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_profiles_semester_number", table_name="profiles")
+    op.drop_column("profiles", "semester_number")
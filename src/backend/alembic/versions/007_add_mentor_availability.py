@@ -0,0 +1,51 @@
+"""Add mentor availability read model
+
+Revision ID: 007_mentor_availability
+Revises: 006_profile_semester_number
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "007_mentor_availability"
+down_revision: Union[str, Sequence[str], None] = "006_profile_semester_number"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MIN_SEMESTER_FOR_MENTOR = 4  # MentorshipService.MIN_SEMESTER_FOR_MENTOR na data da migração
+
+
+def upgrade() -> None:
+    op.create_table(
+        "mentor_availability",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("active_mentees", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=False), server_default=sa.func.now()),
+    )
+    op.create_index("ix_mentor_availability_active_mentees", "mentor_availability", ["active_mentees"])
+
+    # Backfill a partir de perfis e mentorias ativas
+    op.execute(
+        f"""
+        INSERT INTO mentor_availability (user_id, active_mentees)
+        SELECT p.user_id, COALESCE(m.active, 0)
+        FROM profiles p
+        LEFT JOIN (
+            SELECT mentor_id, COUNT(*) AS active
+            FROM mentorships
+            WHERE status = 'active'
+            GROUP BY mentor_id
+        ) m ON m.mentor_id = p.user_id
+        WHERE p.semester_number >= {MIN_SEMESTER_FOR_MENTOR}
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_mentor_availability_active_mentees", table_name="mentor_availability")
+    op.drop_table("mentor_availability")
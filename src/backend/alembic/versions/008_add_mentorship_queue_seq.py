@@ -0,0 +1,56 @@
+"""Add ordered sequence to the mentorship queue
+
+Revision ID: 008_mentorship_queue_seq
+Revises: 007_mentor_availability
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "008_mentorship_queue_seq"
+down_revision: Union[str, Sequence[str], None] = "007_mentor_availability"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "mentorship_queue_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("next_seq", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+    op.add_column("mentorship_queue", sa.Column("queue_seq", sa.Integer(), nullable=True))
+
+    # Backfill na ordem atual da fila (requested_at, com user_id desempatando)
+    op.execute(
+        """
+        UPDATE mentorship_queue
+        SET queue_seq = ranked.seq
+        FROM (
+            SELECT user_id, ROW_NUMBER() OVER (ORDER BY requested_at, user_id) AS seq
+            FROM mentorship_queue
+        ) AS ranked
+        WHERE ranked.user_id = mentorship_queue.user_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO mentorship_queue_state (id, next_seq)
+        SELECT 1, COALESCE(MAX(queue_seq), 0) + 1 FROM mentorship_queue
+        """
+    )
+
+    op.alter_column("mentorship_queue", "queue_seq", nullable=False)
+    op.create_index("ix_mentorship_queue_queue_seq", "mentorship_queue", ["queue_seq"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_mentorship_queue_queue_seq", table_name="mentorship_queue")
+    op.drop_column("mentorship_queue", "queue_seq")
+    op.drop_table("mentorship_queue_state")
@@ -0,0 +1,121 @@
+"""Store each friendship as a single canonical row
+
+Revision ID: 009_canonical_friendships
+Revises: 008_mentorship_queue_seq
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "009_canonical_friendships"
+down_revision: Union[str, Sequence[str], None] = "008_mentorship_queue_seq"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("friendships", sa.Column("user_low_id", sa.Integer(), nullable=True))
+    op.add_column("friendships", sa.Column("user_high_id", sa.Integer(), nullable=True))
+    op.add_column("friendships", sa.Column("requester_id", sa.Integer(), nullable=True))
+
+    op.execute("DELETE FROM friendships WHERE user_id = friend_id")
+    op.execute(
+        """
+        UPDATE friendships
+        SET user_low_id = LEAST(user_id, friend_id),
+            user_high_id = GREATEST(user_id, friend_id),
+            requester_id = user_id
+        """
+    )
+
+    # Pares espelhados: a linha que sobra herda "accepted" se qualquer lado
+    # estava aceito, e o solicitante é o autor da linha mais antiga
+    op.execute(
+        """
+        UPDATE friendships AS keep
+        SET status = CASE
+                WHEN keep.status = 'accepted' OR mirror.status = 'accepted' THEN 'accepted'
+                ELSE keep.status
+            END,
+            requester_id = CASE
+                WHEN mirror.created_at < keep.created_at THEN mirror.user_id
+                ELSE keep.user_id
+            END,
+            created_at = LEAST(keep.created_at, mirror.created_at)
+        FROM friendships AS mirror
+        WHERE mirror.user_id = keep.friend_id
+          AND mirror.friend_id = keep.user_id
+          AND keep.user_id < keep.friend_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM friendships AS drop_row
+        USING friendships AS keep
+        WHERE keep.user_id = drop_row.friend_id
+          AND keep.friend_id = drop_row.user_id
+          AND drop_row.user_id > drop_row.friend_id
+        """
+    )
+
+    op.drop_constraint("unique_friendship_pair", "friendships", type_="unique")
+    op.drop_column("friendships", "user_id")
+    op.drop_column("friendships", "friend_id")
+
+    for column in ("user_low_id", "user_high_id", "requester_id"):
+        op.alter_column("friendships", column, nullable=False)
+        op.create_foreign_key(
+            f"fk_friendships_{column}", "friendships", "users", [column], ["id"], ondelete="CASCADE"
+        )
+
+    op.create_unique_constraint("unique_friendship_pair", "friendships", ["user_low_id", "user_high_id"])
+    op.create_check_constraint("ck_friendship_canonical_pair", "friendships", "user_low_id < user_high_id")
+    op.create_index("ix_friendships_low_status", "friendships", ["user_low_id", "status", "user_high_id"])
+    op.create_index("ix_friendships_high_status", "friendships", ["user_high_id", "status", "user_low_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_friendships_high_status", table_name="friendships")
+    op.drop_index("ix_friendships_low_status", table_name="friendships")
+    op.drop_constraint("ck_friendship_canonical_pair", "friendships", type_="check")
+    op.drop_constraint("unique_friendship_pair", "friendships", type_="unique")
+
+    op.add_column(
+        "friendships",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=True),
+    )
+    op.add_column(
+        "friendships",
+        sa.Column("friend_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE friendships
+        SET user_id = requester_id,
+            friend_id = CASE WHEN requester_id = user_low_id THEN user_high_id ELSE user_low_id END
+        """
+    )
+    # Amizades aceitas voltam a ser gravadas nos dois sentidos
+    op.execute(
+        """
+        INSERT INTO friendships (user_id, friend_id, status, created_at, updated_at,
+                                 user_low_id, user_high_id, requester_id)
+        SELECT friend_id, user_id, status, created_at, updated_at,
+               user_low_id, user_high_id, requester_id
+        FROM friendships
+        WHERE status = 'accepted'
+        """
+    )
+
+    for column in ("user_low_id", "user_high_id", "requester_id"):
+        op.drop_constraint(f"fk_friendships_{column}", "friendships", type_="foreignkey")
+        op.drop_column("friendships", column)
+
+    op.alter_column("friendships", "user_id", nullable=False)
+    op.alter_column("friendships", "friend_id", nullable=False)
+    op.create_unique_constraint("unique_friendship_pair", "friendships", ["user_id", "friend_id"])
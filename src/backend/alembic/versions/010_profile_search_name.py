@@ -0,0 +1,62 @@
+"""Add normalized, trigram-indexed search name to profiles
+
+Revision ID: 010_profile_search_name
+Revises: 009_canonical_friendships
+Create Date: 2026-10-19 16:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.text_search import normalize_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = "010_profile_search_name"
+down_revision: Union[str, Sequence[str], None] = "009_canonical_friendships"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+profiles = sa.table(
+    "profiles",
+    sa.column("id", sa.Integer),
+    sa.column("full_name", sa.String),
+    sa.column("nickname", sa.String),
+    sa.column("search_name", sa.String),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column("profiles", sa.Column("search_name", sa.String(length=160), nullable=True))
+
+    # Backfill: a normalização é a mesma usada pelo model, então roda em Python
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(profiles.c.id, profiles.c.full_name, profiles.c.nickname)).all()
+    updates = [
+        {"profile_id": profile_id, "name": normalize_name(full_name, nickname)}
+        for profile_id, full_name, nickname in rows
+    ]
+    if updates:
+        conn.execute(
+            profiles.update()
+            .where(profiles.c.id == sa.bindparam("profile_id"))
+            .values(search_name=sa.bindparam("name")),
+            updates,
+        )
+
+    op.create_index(
+        "ix_profiles_search_name_trgm",
+        "profiles",
+        ["search_name"],
+        postgresql_using="gin",
+        postgresql_ops={"search_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_profiles_search_name_trgm", table_name="profiles")
+    op.drop_column("profiles", "search_name")
@@ -0,0 +1,54 @@
+"""Add seat counter and waitlist to events
+
+Revision ID: 011_event_seat_counter
+Revises: 010_profile_search_name
+Create Date: 2026-10-19 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "011_event_seat_counter"
+down_revision: Union[str, Sequence[str], None] = "010_profile_search_name"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "events",
+        sa.Column("confirmed_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("event_participants", sa.Column("waitlisted_at", sa.DateTime(), nullable=True))
+
+    # Backfill com os confirmados atuais (pode haver eventos já acima do limite;
+    # nesse caso ninguém novo entra até sobrar vaga)
+    op.execute(
+        """
+        UPDATE events
+        SET confirmed_count = (
+            SELECT COUNT(*)
+            FROM event_participants
+            WHERE event_participants.event_id = events.id
+              AND event_participants.status = 'confirmed'
+        )
+        """
+    )
+
+    op.create_index(
+        "ix_event_participants_waitlist",
+        "event_participants",
+        ["event_id", "status", "waitlisted_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_participants_waitlist", table_name="event_participants")
+    # Sem fila de espera, quem aguardava volta a ser só 'maybe'
+    op.execute("UPDATE event_participants SET status = 'maybe' WHERE status = 'waitlisted'")
+    op.drop_column("event_participants", "waitlisted_at")
+    op.drop_column("events", "confirmed_count")
@@ -0,0 +1,71 @@
+"""Add scheduled notifications for event reminders
+
+Revision ID: 012_scheduled_notifications
+Revises: 011_event_seat_counter
+Create Date: 2026-10-19 19:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "012_scheduled_notifications"
+down_revision: Union[str, Sequence[str], None] = "011_event_seat_counter"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_notifications",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("notification_type", sa.String(length=50), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("link", sa.String(length=500), nullable=True),
+        sa.Column("reference_id", sa.Integer(), nullable=True),
+        sa.Column("reference_type", sa.String(length=50), nullable=True),
+        sa.Column("due_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.UniqueConstraint(
+            "user_id",
+            "notification_type",
+            "reference_type",
+            "reference_id",
+            name="unique_scheduled_notification",
+        ),
+    )
+    op.create_index("ix_scheduled_notifications_id", "scheduled_notifications", ["id"])
+    op.create_index(
+        "ix_scheduled_notifications_pending",
+        "scheduled_notifications",
+        ["due_at"],
+        postgresql_where=sa.text("sent_at IS NULL"),
+    )
+
+    # Agenda os lembretes ainda por vir dos eventos futuros já existentes
+    for hours, notification_type, time_str in ((24, "event_reminder_24h", "24 horas"), (1, "event_reminder_1h", "1 hora")):
+        op.execute(
+            f"""
+            INSERT INTO scheduled_notifications
+                (user_id, notification_type, title, content, link, reference_id, reference_type, due_at)
+            SELECT ep.user_id, '{notification_type}', 'Lembrete: ' || substr(e.title, 1, 190), 'O evento começa em {time_str}',
+                   '/events/' || e.id, e.id, 'event', e.start_datetime - INTERVAL '{hours} hours'
+            FROM event_participants ep
+            JOIN events e ON e.id = ep.event_id
+            WHERE ep.status = 'confirmed'
+              AND e.is_cancelled = false
+              AND e.start_datetime - INTERVAL '{hours} hours' > now()
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scheduled_notifications_pending", table_name="scheduled_notifications")
+    op.drop_index("ix_scheduled_notifications_id", table_name="scheduled_notifications")
+    op.drop_table("scheduled_notifications")
@@ -0,0 +1,29 @@
+"""Index event participants by arrival order
+
+Revision ID: 013_event_participants_joined
+Revises: 012_scheduled_notifications
+Create Date: 2026-10-19 20:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "013_event_participants_joined"
+down_revision: Union[str, Sequence[str], None] = "012_scheduled_notifications"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_event_participants_joined",
+        "event_participants",
+        ["event_id", "joined_at", "user_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_participants_joined", table_name="event_participants")
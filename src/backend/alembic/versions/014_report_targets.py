@@ -0,0 +1,70 @@
+"""Aggregate reports per target and allow hiding threads/comments
+
+Revision ID: 014_report_targets
+Revises: 013_event_participants_joined
+Create Date: 2026-10-19 21:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "014_report_targets"
+down_revision: Union[str, Sequence[str], None] = "013_event_participants_joined"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_targets",
+        sa.Column("target_type", sa.String(length=20), primary_key=True),
+        sa.Column("target_id", sa.Integer(), primary_key=True),
+        sa.Column("report_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pending_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("reporter_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("top_category", sa.String(length=50), nullable=True),
+        sa.Column("last_reported_at", sa.DateTime(), nullable=True),
+        sa.Column("hidden_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_report_targets_pending_count", "report_targets", ["pending_count"])
+    op.create_index("ix_reports_target", "reports", ["target_type", "target_id"])
+
+    op.add_column("threads", sa.Column("is_hidden", sa.Boolean(), nullable=False, server_default="false"))
+    op.add_column("comments", sa.Column("is_hidden", sa.Boolean(), nullable=False, server_default="false"))
+
+    # Backfill do agregado com as denúncias existentes
+    op.execute(
+        """
+        INSERT INTO report_targets
+            (target_type, target_id, report_count, pending_count, reporter_count, top_category, last_reported_at)
+        SELECT
+            r.target_type,
+            r.target_id,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE r.status = 'pending'),
+            COUNT(DISTINCT r.reporter_id),
+            (
+                SELECT c.category
+                FROM reports c
+                WHERE c.target_type = r.target_type AND c.target_id = r.target_id
+                GROUP BY c.category
+                ORDER BY COUNT(*) DESC, MAX(c.id) DESC
+                LIMIT 1
+            ),
+            MAX(r.created_at)
+        FROM reports r
+        GROUP BY r.target_type, r.target_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("comments", "is_hidden")
+    op.drop_column("threads", "is_hidden")
+    op.drop_index("ix_reports_target", table_name="reports")
+    op.drop_index("ix_report_targets_pending_count", table_name="report_targets")
+    op.drop_table("report_targets")
@@ -0,0 +1,46 @@
+"""Cascade content deletes in the database and index the child foreign keys
+
+Revision ID: 015_cascade_content_deletes
+Revises: 014_report_targets
+Create Date: 2026-10-19 22:00:00.000000
+
+As FKs de threads, comentários e votos já têm ON DELETE CASCADE desde a
+001; faltava a de polls.created_by. Sem índice na coluna filha, cada
+cascata (e cada DELETE em lote do purge) varre a tabela filha inteira.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "015_cascade_content_deletes"
+down_revision: Union[str, Sequence[str], None] = "014_report_targets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHILD_INDEXES = (
+    ("ix_threads_user_id", "threads", "user_id"),
+    ("ix_comments_thread_id", "comments", "thread_id"),
+    ("ix_comments_user_id", "comments", "user_id"),
+    ("ix_thread_votes_thread_id", "thread_votes", "thread_id"),
+    ("ix_comment_votes_comment_id", "comment_votes", "comment_id"),
+    ("ix_polls_created_by", "polls", "created_by"),
+)
+
+
+def upgrade() -> None:
+    op.drop_constraint("polls_created_by_fkey", "polls", type_="foreignkey")
+    op.create_foreign_key(
+        "polls_created_by_fkey", "polls", "users", ["created_by"], ["id"], ondelete="CASCADE"
+    )
+    for name, table, column in CHILD_INDEXES:
+        op.create_index(name, table, [column])
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(CHILD_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_constraint("polls_created_by_fkey", "polls", type_="foreignkey")
+    op.create_foreign_key("polls_created_by_fkey", "polls", "users", ["created_by"], ["id"])
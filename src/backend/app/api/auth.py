@@ -30,8 +30,6 @@ from fastapi import Form
 
 logger = logging.getLogger(__name__)
 
-logger.setLevel(logging.DEBUG)
-
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -86,7 +84,7 @@ async def upload_emails_csv(
 
     """
 
-    logger.info(f" Upload CSV iniciado: {file.filename}")
+    logger.info("Upload CSV iniciado: %s", file.filename)
 
     
 
@@ -120,7 +118,7 @@ async def upload_emails_csv(
 
         existing_user = db.query(User).filter(User.email == email).first()
         if existing_user:
-            logger.warning(f"  Email j existe: {email}")
+            logger.warning("Email j existe: %s", email)
             skipped.append(email)
             continue
 
@@ -133,18 +131,18 @@ async def upload_emails_csv(
         )
         db.add(user)
         created.append({"email": email, "verification_code": verification_code})
-        logger.info(f" Usurio criado (pendente): {email} - code={verification_code}")
+        logger.info("Usurio criado (pendente): %s - code=%s", email, verification_code)
 
         try:
             send_verification_email(email, verification_code)
         except Exception as e:
-            logger.error(f" Falha ao enviar e-mail para {email}: {e}")
+            logger.error("Falha ao enviar e-mail para %s: %s", email, e)
 
 
 
     db.commit()
 
-    logger.info(f" CSV processado: {len(created)} criados, {len(skipped)} ignorados")
+    logger.info("CSV processado: %s criados, %s ignorados", len(created), len(skipped))
 
 
 
@@ -170,10 +168,10 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     Registro de novo usuário.
     Cria automaticamente Profile e UserStats após o registro.
     """
-    logger.info(f" Registro iniciado para: {user_in.email}")
+    logger.debug("Registro iniciado para: %s", user_in.email)
 
     user = db.query(User).filter(User.email == user_in.email).first()
-    logger.debug(f"   Usuário existe no banco? {user is not None}")
+    logger.debug("Usuário existe no banco? %s", user is not None)
 
     admin_exists = db.query(User).filter(User.is_admin == True).count() > 0
     is_master_password = user_in.password == settings.ADMIN_MASTER_PASSWORD
@@ -184,7 +182,7 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
                 status_code=400,
                 detail="Email não encontrado. Solicite pré-cadastro ao administrador.",
             )
-        logger.info(f" Criando novo usuário: {user_in.email}")
+        logger.info("Criando novo usuário: %s", user_in.email)
         user = User(
             email=user_in.email,
             hashed_password=hash_password(user_in.password),
@@ -194,10 +192,10 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
         )
         db.add(user)
         db.flush()
-        logger.info(f"   Usuário criado com user_id={user.id}")
+        logger.info("Usuário criado com user_id=%s", user.id)
     else:
         if user.hashed_password:
-            logger.warning(f" Email já cadastrado: {user_in.email}")
+            logger.warning("Email já cadastrado: %s", user_in.email)
             raise HTTPException(status_code=400, detail="Email já cadastrado")
         if not user_in.verification_code:
             raise HTTPException(
@@ -215,7 +213,7 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
         user.is_verified = True
         user.is_admin = user.is_admin or is_master_password
         user.verification_code = None
-        logger.info(f" Usuário pendente ativado: {user.email}")
+        logger.info("Usuário pendente ativado: %s", user.email)
 
     if not admin_exists and not user.is_admin:
         user.is_admin = True
@@ -231,7 +229,7 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
             is_public=True
         )
         db.add(profile)
-        logger.info(f" Profile criado para user_id={user.id}")
+        logger.info("Profile criado para user_id=%s", user.id)
 
     stats = db.query(UserStats).filter(UserStats.user_id == user.id).first()
     if not stats:
@@ -244,13 +242,13 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
             badges_count=0
         )
         db.add(stats)
-        logger.info(f" UserStats criado para user_id={user.id}")
+        logger.info("UserStats criado para user_id=%s", user.id)
 
     db.commit()
     db.refresh(user)
 
-    logger.info(f" Registro completo: {user_in.email}")
-    logger.info(f"   ID: {user.id}, Is Admin: {user.is_admin}, Is Verified: {user.is_verified}")
+    logger.info("Registro completo: %s", user_in.email)
+    logger.info("ID: %s, Is Admin: %s, Is Verified: %s", user.id, user.is_admin, user.is_verified)
 
     return user
 
@@ -276,7 +274,7 @@ def login(
 
     """
 
-    logger.info(f" Login tentativa: {form_data.username}")
+    logger.debug("Login tentativa: %s", form_data.username)
 
     
 
@@ -286,7 +284,7 @@ def login(
 
     if not user:
 
-        logger.warning(f" Usurio no encontrado: {form_data.username}")
+        logger.warning("Usurio no encontrado: %s", form_data.username)
 
         raise HTTPException(status_code=400, detail="Usurio no encontrado ou sem senha definida")
 
@@ -294,7 +292,7 @@ def login(
 
     if not user.hashed_password:
 
-        logger.warning(f" Usurio sem senha: {form_data.username}")
+        logger.warning("Usurio sem senha: %s", form_data.username)
 
         raise HTTPException(status_code=400, detail="Usurio no encontrado ou sem senha definida")
 
@@ -302,7 +300,7 @@ def login(
 
     if not verify_password(form_data.password, user.hashed_password):
 
-        logger.warning(f" Senha incorreta: {form_data.username}")
+        logger.warning("Senha incorreta: %s", form_data.username)
 
         raise HTTPException(status_code=400, detail="Senha incorreta")
 
@@ -310,13 +308,13 @@ def login(
 
     if not user.is_verified:
 
-        logger.warning(f" Conta no verificada: {form_data.username}")
+        logger.warning("Conta no verificada: %s", form_data.username)
 
         raise HTTPException(status_code=403, detail="Conta no verificada")
 
     
 
-    logger.info(f" Login bem-sucedido: {form_data.username} (is_admin={user.is_admin})")
+    logger.info("Login bem-sucedido: %s (is_admin=%s)", form_data.username, user.is_admin)
 
 
     # Incluir user_id no token
@@ -1,27 +1,55 @@
+import csv
+import io
+import json
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Iterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Result
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.api.deps import get_db, get_current_user
+from app.core.security import create_calendar_token, verify_calendar_token
 from app.models.user import User
-from app.models.event import Event, EventParticipant
-from app.models.profile import Profile
+from app.models.event import Event
 from app.schemas.event import (
     EventCreate,
     EventUpdate,
     EventOut,
     EventRSVP,
     EventStatsOut,
+    ParticipantListResponse,
     ParticipantOut,
 )
+from app.services.calendar_feed import CalendarFeedService, feed_etag
+from app.services.event_reminders import EventReminderService
 from app.services.event_service import EventService
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
+EXPORT_COLUMNS = ("user_id", "full_name", "university", "status", "attended", "joined_at")
+EXPORT_BATCH_SIZE = 500  # Linhas buscadas por vez do cursor no servidor
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+CALENDAR_MAX_AGE = 300  # Segundos que o app de calendário pode reusar o feed
+
+
+def _events_out(db: Session, events: List[Event], viewer_id: int) -> List[EventOut]:
+    """Converte uma página de eventos com contagens e RSVP do usuário (1 query)"""
+    stats = EventService.get_events_stats(db, [event.id for event in events], viewer_id)
+    result = []
+    for event in events:
+        event_stats = stats[event.id]
+        event_out = EventOut.model_validate(event)
+        event_out.participant_count = event_stats["total_rsvp"]
+        event_out.confirmed_count = event_stats["confirmed"]
+        event_out.maybe_count = event_stats["maybe"]
+        event_out.user_rsvp_status = event_stats["viewer_status"]
+        result.append(event_out)
+    return result
+
 
 @router.post("/", response_model=EventOut, status_code=status.HTTP_201_CREATED)
 def create_event(
@@ -35,7 +63,7 @@ def create_event(
     - Qualquer usuário pode criar eventos
     - Validação de datas (end > start)
     """
-    logger.info(f"📅 User {current_user.id} creating event: {event_data.title}")
+    logger.info("User %s creating event: %s", current_user.id, event_data.title)
 
     # Validar datas
     if event_data.end_datetime <= event_data.start_datetime:
@@ -87,7 +115,7 @@ def list_events(
     - Por padrão mostra apenas eventos futuros
     - Ordenado por data de início
     """
-    logger.info(f"📋 Listing events (type={event_type}, uni={university})")
+    logger.debug("Listing events (type=%s, uni=%s)", event_type, university)
 
     query = db.query(Event).filter(Event.is_cancelled == False)
 
@@ -102,27 +130,8 @@ def list_events(
 
     events = query.order_by(Event.start_datetime.asc()).offset(skip).limit(limit).all()
 
-    # Enriquecer com contagens
-    result = []
-    for event in events:
-        stats = EventService.get_event_stats(db, event.id)
-        event_out = EventOut.model_validate(event)
-        event_out.participant_count = stats["total_rsvp"]
-
-        # Verificar RSVP do usuário
-        participant = (
-            db.query(EventParticipant)
-            .filter(
-                EventParticipant.event_id == event.id,
-                EventParticipant.user_id == current_user.id,
-            )
-            .first()
-        )
-        event_out.user_rsvp_status = participant.status if participant else None
-
-        result.append(event_out)
-
-    return result
+    # Enriquecer com contagens e RSVP do usuário (uma query para a página)
+    return _events_out(db, events, current_user.id)
 
 
 @router.get("/{event_id}", response_model=EventOut)
@@ -134,7 +143,7 @@ def get_event(
     """
     🔍 Ver detalhes de um evento
     """
-    logger.info(f"🔍 User {current_user.id} viewing event {event_id}")
+    logger.debug("User %s viewing event %s", current_user.id, event_id)
 
     event = db.query(Event).filter(Event.id == event_id).first()
 
@@ -144,22 +153,7 @@ def get_event(
             detail="Evento não encontrado",
         )
 
-    stats = EventService.get_event_stats(db, event_id)
-    event_out = EventOut.model_validate(event)
-    event_out.participant_count = stats["total_rsvp"]
-
-    # Verificar RSVP do usuário
-    participant = (
-        db.query(EventParticipant)
-        .filter(
-            EventParticipant.event_id == event_id,
-            EventParticipant.user_id == current_user.id,
-        )
-        .first()
-    )
-    event_out.user_rsvp_status = participant.status if participant else None
-
-    return event_out
+    return _events_out(db, [event], current_user.id)[0]
 
 
 @router.put("/{event_id}", response_model=EventOut)
@@ -174,7 +168,7 @@ def update_event(
 
     - Apenas o criador pode atualizar
     """
-    logger.info(f"✏️ User {current_user.id} updating event {event_id}")
+    logger.info("User %s updating event %s", current_user.id, event_id)
 
     event = db.query(Event).filter(Event.id == event_id).first()
 
@@ -202,14 +196,19 @@ def update_event(
             detail="Data de término deve ser posterior à data de início",
         )
 
+    # Limite maior libera vagas para a fila de espera
+    if "max_participants" in update_data:
+        db.flush()
+        EventService.promote_waitlist(db, event_id)
+
+    # Horário/título novos: refaz os lembretes ainda não enviados
+    if {"start_datetime", "title"} & update_data.keys():
+        EventReminderService.schedule_event(db, event)
+
     db.commit()
     db.refresh(event)
 
-    event_out = EventOut.model_validate(event)
-    stats = EventService.get_event_stats(db, event_id)
-    event_out.participant_count = stats["total_rsvp"]
-
-    return event_out
+    return _events_out(db, [event], current_user.id)[0]
 
 
 @router.delete("/{event_id}", response_model=dict)
@@ -225,7 +224,7 @@ def cancel_event(
     - Apenas o criador pode cancelar
     - Motivo opcional
     """
-    logger.info(f"❌ User {current_user.id} cancelling event {event_id}")
+    logger.info("User %s cancelling event %s", current_user.id, event_id)
 
     event = db.query(Event).filter(Event.id == event_id).first()
 
@@ -243,6 +242,7 @@ def cancel_event(
 
     event.is_cancelled = True
     event.cancelled_reason = reason
+    EventReminderService.schedule_event(db, event)
     db.commit()
 
     # TODO: Notificar participantes sobre cancelamento
@@ -261,9 +261,9 @@ def rsvp_to_event(
     ✅ Confirmar presença em evento
 
     - Status: confirmed, maybe, declined
-    - Verifica limite de participantes
+    - Evento lotado: 'confirmed' vira 'waitlisted' (fila de espera)
     """
-    logger.info(f"✅ User {current_user.id} RSVPing to event {event_id}: {rsvp_data.status}")
+    logger.info("User %s RSVPing to event %s: %s", current_user.id, event_id, rsvp_data.status)
 
     try:
         participant = EventService.rsvp_event(
@@ -275,7 +275,7 @@ def rsvp_to_event(
 
         return {
             "status": "success",
-            "message": f"RSVP registrado como '{rsvp_data.status}'",
+            "message": f"RSVP registrado como '{participant.status}'",
             "rsvp_status": participant.status,
         }
     except ValueError as e:
@@ -285,19 +285,23 @@ def rsvp_to_event(
         )
 
 
-@router.get("/{event_id}/participants", response_model=List[ParticipantOut])
+@router.get("/{event_id}/participants", response_model=ParticipantListResponse)
 def list_event_participants(
     event_id: int,
-    status_filter: Optional[str] = Query(None, pattern="^(confirmed|maybe|declined)$"),
+    status_filter: Optional[str] = Query(None, pattern="^(confirmed|maybe|declined|waitlisted)$"),
+    university: Optional[str] = Query(None, max_length=100),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
     """
     👥 Listar participantes de um evento
 
-    - Filtrar por status
-    - Inclui informações do perfil
+    - Filtrar por status e universidade
+    - Inclui informações do perfil (participante + perfil em uma query)
+    - Paginação por cursor, em ordem de inscrição
     """
-    logger.info(f"👥 Listing participants for event {event_id}")
+    logger.debug("Listing participants for event %s", event_id)
 
     event = db.query(Event).filter(Event.id == event_id).first()
 
@@ -307,32 +311,90 @@ def list_event_participants(
             detail="Evento não encontrado",
         )
 
-    query = db.query(EventParticipant).filter(EventParticipant.event_id == event_id)
+    try:
+        rows, next_cursor = EventService.list_participants(
+            db, event_id, status=status_filter, university=university, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    if status_filter:
-        query = query.filter(EventParticipant.status == status_filter)
+    return ParticipantListResponse(
+        participants=[ParticipantOut(**row._mapping) for row in rows],
+        next_cursor=next_cursor,
+    )
 
-    participants = query.all()
 
-    # Enriquecer com dados do perfil
-    result = []
-    for participant in participants:
-        profile = (
-            db.query(Profile).filter(Profile.user_id == participant.user_id).first()
+def _export_lines(result: Result, export_format: str) -> Iterator[str]:
+    """Converte o resultado em linhas CSV/NDJSON, um lote do cursor por vez"""
+    try:
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
+            for batch in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([getattr(row, column) for column in EXPORT_COLUMNS] for row in batch)
+                yield buffer.getvalue()
+        else:
+            for batch in result.partitions():
+                yield "".join(
+                    json.dumps(
+                        {column: getattr(row, column) for column in EXPORT_COLUMNS},
+                        default=str,
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                    for row in batch
+                )
+    finally:
+        result.close()
+
+
+@router.get("/{event_id}/participants/export")
+def export_event_participants(
+    event_id: int,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    status_filter: Optional[str] = Query(None, pattern="^(confirmed|maybe|declined|waitlisted)$"),
+    university: Optional[str] = Query(None, max_length=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    ⬇️ Exportar participantes (CSV ou NDJSON)
+
+    - Apenas o criador do evento
+    - Mesmos filtros da listagem
+    - Resposta em streaming: as linhas vêm de um cursor no servidor, em
+      lotes, sem montar a lista inteira em memória
+    """
+    event = db.query(Event).filter(Event.id == event_id).first()
+
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Evento não encontrado",
         )
 
-        result.append(
-            ParticipantOut(
-                user_id=participant.user_id,
-                full_name=profile.full_name if profile else None,
-                photo_url=profile.photo_url if profile else None,
-                status=participant.status,
-                attended=participant.attended,
-                joined_at=participant.joined_at,
-            )
+    if event.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas o criador pode exportar os participantes",
         )
 
-    return result
+    logger.info("User %s exporting participants of event %s as %s", current_user.id, event_id, export_format)
+
+    query = EventService.participants_query(event_id, status_filter, university)
+    result = db.execute(query.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+
+    return StreamingResponse(
+        _export_lines(result, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="evento-{event_id}-participantes.{export_format}"'
+        },
+    )
 
 
 @router.get("/{event_id}/stats", response_model=EventStatsOut)
@@ -363,7 +425,7 @@ def mark_participant_attendance(
     - Atribui +20 pontos ao participante
     - Apenas criador do evento pode marcar
     """
-    logger.info(f"✅ User {current_user.id} marking attendance for user {user_id} at event {event_id}")
+    logger.info("User %s marking attendance for user %s at event %s", current_user.id, user_id, event_id)
 
     try:
         marked = EventService.mark_attendance(
@@ -410,23 +472,90 @@ def get_my_events(
         include_past=include_past,
     )
 
-    result = []
-    for event in events:
-        stats = EventService.get_event_stats(db, event.id)
-        event_out = EventOut.model_validate(event)
-        event_out.participant_count = stats["total_rsvp"]
-
-        # Pegar status do usuário
-        participant = (
-            db.query(EventParticipant)
-            .filter(
-                EventParticipant.event_id == event.id,
-                EventParticipant.user_id == current_user.id,
-            )
-            .first()
+    return _events_out(db, events, current_user.id)
+
+
+def _calendar_user(db: Session, token: str) -> User:
+    user_id = verify_calendar_token(token)
+    user = db.get(User, user_id) if user_id is not None else None
+    if not user or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de calendário inválido",
         )
-        event_out.user_rsvp_status = participant.status if participant else None
+    return user
 
-        result.append(event_out)
 
-    return result
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def _ics_response(request: Request, feed_key: tuple, version: str, build) -> Response:
+    """Responde o feed .ics, ou 304 se o cliente já tem essa versão"""
+    etag = feed_etag(feed_key, version)
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={CALENDAR_MAX_AGE}"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = CalendarFeedService.cached_body(feed_key, version, build)
+    return Response(content=body, media_type="text/calendar", headers=headers)
+
+
+@router.get("/calendar/token", response_model=dict)
+def get_calendar_token(current_user: User = Depends(get_current_user)):
+    """
+    🔑 Token dos feeds de calendário (.ics)
+
+    - Apps de calendário não enviam o header Authorization, então os feeds
+      recebem este token na URL
+    """
+    token = create_calendar_token(current_user.id)
+    return {
+        "token": token,
+        "my_events_url": f"/api/events/calendar/me.ics?token={token}",
+    }
+
+
+@router.get("/calendar/me.ics")
+def my_events_calendar(
+    request: Request,
+    token: str = Query(..., max_length=100),
+    db: Session = Depends(get_db),
+):
+    """
+    📆 Feed .ics dos meus eventos (criados ou com RSVP ativo)
+
+    - Suporta If-None-Match (304 quando nada mudou)
+    """
+    user = _calendar_user(db, token)
+    version = CalendarFeedService.user_feed_version(db, user.id)
+    return _ics_response(
+        request,
+        ("user", user.id),
+        version,
+        lambda: CalendarFeedService.build_user_feed(db, user.id),
+    )
+
+
+@router.get("/calendar/university/{university}.ics")
+def university_events_calendar(
+    university: str,
+    request: Request,
+    token: str = Query(..., max_length=100),
+    db: Session = Depends(get_db),
+):
+    """
+    📆 Feed .ics dos eventos de uma universidade
+
+    - Suporta If-None-Match (304 quando nada mudou)
+    """
+    _calendar_user(db, token)
+    version = CalendarFeedService.university_feed_version(db, university)
+    return _ics_response(
+        request,
+        ("university", university),
+        version,
+        lambda: CalendarFeedService.build_university_feed(db, university),
+    )
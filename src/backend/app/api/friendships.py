@@ -2,22 +2,24 @@ import logging
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import select, func
 
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
-from app.models.profile import Profile
-from app.models.social import Friendship
 from app.schemas.friendship import (
     FriendOut,
     FriendRequestOut,
     FriendshipResponse,
     FriendListResponse,
+    FriendRequestListResponse,
 )
 from app.services.social_graph import (
     create_friendship,
     respond_friendship,
+    remove_friendship,
     get_friend_status,
+    friendship_edges,
+    list_friend_profiles,
 )
 
 logger = logging.getLogger(__name__)
@@ -25,81 +27,77 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/friendships", tags=["friendships"])
 
 
+def _friend_out(row) -> FriendOut:
+    return FriendOut(
+        user_id=row.other_id,
+        full_name=row.full_name,
+        nickname=row.nickname,
+        university=row.university,
+        course=row.course,
+        semester=row.semester,
+        photo_url=row.photo_url,
+        status="accepted",
+        created_at=row.created_at,
+    )
+
+
+def _request_out(row) -> FriendRequestOut:
+    return FriendRequestOut(
+        user_id=row.other_id,
+        full_name=row.full_name,
+        nickname=row.nickname,
+        university=row.university,
+        photo_url=row.photo_url,
+        created_at=row.created_at,
+    )
+
+
+def _list_page(db: Session, user_id: int, **kwargs):
+    try:
+        return list_friend_profiles(db, user_id, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/", response_model=FriendListResponse)
 def list_friends(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
     limit: int = Query(20, ge=1, le=100),
+    name: Optional[str] = Query(None, min_length=1, max_length=100, description="Prefixo do nome ou nickname"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     📋 Lista todos os amigos aceitos do usuário atual
 
-    - Retorna perfis completos dos amigos
-    - Suporta paginação
+    - Retorna perfis completos dos amigos (amizade + perfil em uma query)
+    - Paginação por cursor: envie o `next_cursor` recebido para a próxima página
+    - Filtro opcional por prefixo do nome/nickname
     - Ordenado por data de criação (mais recentes primeiro)
+    - `total` é o número de amigos, sem o filtro por nome
     """
-    logger.info(f"📋 User {current_user.id} listing friends")
-
-    # Buscar amizades aceitas (bidirecional)
-    friendships = (
-        db.query(Friendship)
-        .filter(
-            or_(
-                Friendship.user_id == current_user.id,
-                Friendship.friend_id == current_user.id,
-            ),
-            Friendship.status == "accepted",
-        )
-        .order_by(Friendship.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    logger.debug("User %s listing friends", current_user.id)
+
+    rows, next_cursor = _list_page(
+        db, current_user.id, cursor=cursor, limit=limit, name_prefix=name
     )
 
-    total = (
-        db.query(Friendship)
-        .filter(
-            or_(
-                Friendship.user_id == current_user.id,
-                Friendship.friend_id == current_user.id,
-            ),
-            Friendship.status == "accepted",
-        )
-        .count()
+    # Uma linha por par: cada amigo aparece uma vez, e o total não duplica
+    edges = friendship_edges(current_user.id, "accepted")
+    total = db.scalar(select(func.count()).select_from(edges))
+
+    return FriendListResponse(
+        friends=[_friend_out(row) for row in rows],
+        total=total,
+        next_cursor=next_cursor,
     )
 
-    friends_list = []
-    for friendship in friendships:
-        # Determinar qual é o amigo (não o usuário atual)
-        friend_id = (
-            friendship.friend_id
-            if friendship.user_id == current_user.id
-            else friendship.user_id
-        )
 
-        # Buscar perfil do amigo
-        profile = db.query(Profile).filter(Profile.user_id == friend_id).first()
-        if profile:
-            friends_list.append(
-                FriendOut(
-                    user_id=friend_id,
-                    full_name=profile.full_name,
-                    nickname=profile.nickname,
-                    university=profile.university,
-                    course=profile.course,
-                    semester=profile.semester,
-                    photo_url=profile.photo_url,
-                    status="accepted",
-                    created_at=friendship.created_at,
-                )
-            )
-
-    return FriendListResponse(friends=friends_list, total=total)
-
-
-@router.get("/pending/sent", response_model=List[FriendRequestOut])
+@router.get("/pending/sent", response_model=FriendRequestListResponse)
 def list_sent_requests(
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    limit: int = Query(20, ge=1, le=100),
+    name: Optional[str] = Query(None, min_length=1, max_length=100, description="Prefixo do nome ou nickname"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -108,39 +106,26 @@ def list_sent_requests(
 
     - Retorna perfis dos usuários para quem você enviou solicitação
     - Apenas solicitações com status 'pending'
+    - Paginação por cursor e filtro opcional por prefixo do nome
     """
-    logger.info(f"📤 User {current_user.id} listing sent friend requests")
+    logger.debug("User %s listing sent friend requests", current_user.id)
 
-    sent_requests = (
-        db.query(Friendship)
-        .filter(
-            Friendship.user_id == current_user.id,
-            Friendship.status == "pending",
-        )
-        .order_by(Friendship.created_at.desc())
-        .all()
+    rows, next_cursor = _list_page(
+        db, current_user.id, status="pending", direction="sent",
+        cursor=cursor, limit=limit, name_prefix=name,
+    )
+
+    return FriendRequestListResponse(
+        requests=[_request_out(row) for row in rows],
+        next_cursor=next_cursor,
     )
 
-    requests_list = []
-    for request in sent_requests:
-        profile = db.query(Profile).filter(Profile.user_id == request.friend_id).first()
-        if profile:
-            requests_list.append(
-                FriendRequestOut(
-                    user_id=request.friend_id,
-                    full_name=profile.full_name,
-                    nickname=profile.nickname,
-                    university=profile.university,
-                    photo_url=profile.photo_url,
-                    created_at=request.created_at,
-                )
-            )
-
-    return requests_list
-
-
-@router.get("/pending/received", response_model=List[FriendRequestOut])
+
+@router.get("/pending/received", response_model=FriendRequestListResponse)
 def list_received_requests(
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    limit: int = Query(20, ge=1, le=100),
+    name: Optional[str] = Query(None, min_length=1, max_length=100, description="Prefixo do nome ou nickname"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -149,36 +134,20 @@ def list_received_requests(
 
     - Retorna perfis dos usuários que enviaram solicitação
     - Apenas solicitações com status 'pending'
+    - Paginação por cursor e filtro opcional por prefixo do nome
     - Pode aceitar ou rejeitar através do endpoint de resposta
     """
-    logger.info(f"📥 User {current_user.id} listing received friend requests")
+    logger.debug("User %s listing received friend requests", current_user.id)
 
-    received_requests = (
-        db.query(Friendship)
-        .filter(
-            Friendship.friend_id == current_user.id,
-            Friendship.status == "pending",
-        )
-        .order_by(Friendship.created_at.desc())
-        .all()
+    rows, next_cursor = _list_page(
+        db, current_user.id, status="pending", direction="received",
+        cursor=cursor, limit=limit, name_prefix=name,
     )
 
-    requests_list = []
-    for request in received_requests:
-        profile = db.query(Profile).filter(Profile.user_id == request.user_id).first()
-        if profile:
-            requests_list.append(
-                FriendRequestOut(
-                    user_id=request.user_id,
-                    full_name=profile.full_name,
-                    nickname=profile.nickname,
-                    university=profile.university,
-                    photo_url=profile.photo_url,
-                    created_at=request.created_at,
-                )
-            )
-
-    return requests_list
+    return FriendRequestListResponse(
+        requests=[_request_out(row) for row in rows],
+        next_cursor=next_cursor,
+    )
 
 
 @router.delete("/{user_id}", response_model=FriendshipResponse)
@@ -190,10 +159,10 @@ def remove_friend(
     """
     ❌ Remove uma amizade existente
 
-    - Deleta ambos os lados da amizade (bidirecional)
+    - Deleta a linha única do par (vale para os dois usuários)
     - Funciona para amizades aceitas ou solicitações pendentes
     """
-    logger.info(f"❌ User {current_user.id} removing friendship with user {user_id}")
+    logger.info("User %s removing friendship with user %s", current_user.id, user_id)
 
     if user_id == current_user.id:
         raise HTTPException(
@@ -209,23 +178,8 @@ def remove_friend(
             detail="Usuário não encontrado",
         )
 
-    # Deletar ambos os lados da amizade
-    deleted_count = (
-        db.query(Friendship)
-        .filter(
-            or_(
-                and_(
-                    Friendship.user_id == current_user.id,
-                    Friendship.friend_id == user_id,
-                ),
-                and_(
-                    Friendship.user_id == user_id,
-                    Friendship.friend_id == current_user.id,
-                ),
-            )
-        )
-        .delete(synchronize_session=False)
-    )
+    # Deletar a amizade do par
+    deleted_count = remove_friendship(db, current_user.id, user_id)
 
     if deleted_count == 0:
         raise HTTPException(
@@ -233,8 +187,6 @@ def remove_friend(
             detail="Amizade não encontrada",
         )
 
-    db.commit()
-
     return FriendshipResponse(
         status="success",
         message="Amizade removida com sucesso",
@@ -244,6 +196,7 @@ def remove_friend(
 @router.get("/search", response_model=List[FriendOut])
 def search_friends(
     query: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(50, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -253,67 +206,13 @@ def search_friends(
     - Busca apenas entre amigos aceitos
     - Case-insensitive search
     - Busca em full_name e nickname
+    - Amizade + perfil em uma única query (até `limit` resultados)
     """
-    logger.info(f"🔍 User {current_user.id} searching friends with query: {query}")
-
-    # Buscar IDs de amigos aceitos
-    friendships = (
-        db.query(Friendship)
-        .filter(
-            or_(
-                Friendship.user_id == current_user.id,
-                Friendship.friend_id == current_user.id,
-            ),
-            Friendship.status == "accepted",
-        )
-        .all()
-    )
-
-    friend_ids = []
-    friendship_map = {}  # Para manter a data de criação
-    for friendship in friendships:
-        friend_id = (
-            friendship.friend_id
-            if friendship.user_id == current_user.id
-            else friendship.user_id
-        )
-        friend_ids.append(friend_id)
-        friendship_map[friend_id] = friendship.created_at
-
-    if not friend_ids:
-        return []
-
-    # Buscar perfis que correspondam à query
-    search_pattern = f"%{query}%"
-    profiles = (
-        db.query(Profile)
-        .filter(
-            Profile.user_id.in_(friend_ids),
-            or_(
-                Profile.full_name.ilike(search_pattern),
-                Profile.nickname.ilike(search_pattern),
-            ),
-        )
-        .all()
-    )
+    logger.debug("User %s searching friends with query: %s", current_user.id, query)
 
-    results = []
-    for profile in profiles:
-        results.append(
-            FriendOut(
-                user_id=profile.user_id,
-                full_name=profile.full_name,
-                nickname=profile.nickname,
-                university=profile.university,
-                course=profile.course,
-                semester=profile.semester,
-                photo_url=profile.photo_url,
-                status="accepted",
-                created_at=friendship_map[profile.user_id],
-            )
-        )
+    rows, _ = list_friend_profiles(db, current_user.id, limit=limit, search=query)
 
-    return results
+    return [_friend_out(row) for row in rows]
 
 
 @router.get("/status/{user_id}", response_model=dict)
@@ -332,7 +231,7 @@ def check_friendship_status(
     - "incoming": você recebeu solicitação
     - "none": sem relação
     """
-    logger.info(f"🔍 User {current_user.id} checking friendship status with {user_id}")
+    logger.debug("User %s checking friendship status with %s", current_user.id, user_id)
 
     status_value = get_friend_status(db, current_user.id, user_id)
 
@@ -32,7 +32,7 @@ def get_my_points(
     - Informações sobre próximo nível
     - Pontos agrupados por tipo de ação
     """
-    logger.info(f"📊 User {current_user.id} requesting points summary")
+    logger.debug("User %s requesting points summary", current_user.id)
 
     summary = GamificationService.get_user_points_summary(db, current_user.id)
 
@@ -58,7 +58,7 @@ def get_points_history(
     - Ordenado por data (mais recente primeiro)
     - Suporta paginação
     """
-    logger.info(f"📜 User {current_user.id} requesting points history")
+    logger.debug("User %s requesting points history", current_user.id)
 
     history = GamificationService.get_point_history(db, current_user.id, skip, limit)
 
@@ -186,7 +186,7 @@ def check_profile_completion_bonus(
     - Atribui 50 pontos se for a primeira vez
     - Retorna status da verificação
     """
-    logger.info(f"🎁 User {current_user.id} checking profile completion bonus")
+    logger.debug("User %s checking profile completion bonus", current_user.id)
 
     bonus_awarded = GamificationService.check_profile_completion_bonus(
         db, current_user.id
@@ -1,18 +1,21 @@
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
-from app.models.mentorship import Mentorship, MentorshipQueue
+from app.models.mentorship import Mentorship
 from app.models.profile import Profile
 from app.schemas.mentorship import (
     MentorshipOut,
     MentorshipRequestResponse,
     MentorOut,
     QueuePositionOut,
+    QueueSnapshotOut,
+    BatchAssignmentReport,
 )
+from app.services.mentor_availability import MentorAvailabilityService
 from app.services.mentorship_service import MentorshipService
 
 logger = logging.getLogger(__name__)
@@ -32,7 +35,7 @@ def request_mentor(
     - Se não encontrar, adiciona à fila
     - Baseado em compatibilidade de interesses
     """
-    logger.info(f"🎓 User {current_user.id} requesting mentor")
+    logger.info("User %s requesting mentor", current_user.id)
 
     result = MentorshipService.request_mentor(db, current_user.id)
 
@@ -41,6 +44,8 @@ def request_mentor(
 
 @router.get("/available-mentors", response_model=List[MentorOut])
 def list_available_mentors(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -49,47 +54,26 @@ def list_available_mentors(
 
     - Mostra mentores elegíveis (4º semestre+)
     - Com slots disponíveis (< 3 mentorados)
-    - Ordenado por compatibilidade
+    - Ordenado por compatibilidade com o usuário
     """
-    logger.info(f"📋 User {current_user.id} listing available mentors")
-
-    # Buscar perfis de potenciais mentores
-    profiles = db.query(Profile).filter(Profile.user_id != current_user.id).all()
-
-    available_mentors = []
-
-    for profile in profiles:
-        # Verificar elegibilidade
-        is_eligible, _ = MentorshipService.is_eligible_mentor(db, profile.user_id)
-
-        if not is_eligible:
-            continue
-
-        # Contar mentorados ativos
-        active_mentees = (
-            db.query(Mentorship)
-            .filter(
-                Mentorship.mentor_id == profile.user_id,
-                Mentorship.status == "active",
-            )
-            .count()
+    logger.debug("User %s listing available mentors", current_user.id)
+
+    rows = MentorAvailabilityService.list_available(db, current_user.id, skip, limit)
+
+    return [
+        MentorOut(
+            user_id=profile.user_id,
+            full_name=profile.full_name,
+            university=profile.university,
+            course=profile.course,
+            semester=profile.semester,
+            photo_url=profile.photo_url,
+            active_mentees=active_mentees,
+            available_slots=MentorshipService.MAX_MENTEES_PER_MENTOR - active_mentees,
+            compatibility=compatibility,
         )
-
-        available_mentors.append(
-            MentorOut(
-                user_id=profile.user_id,
-                full_name=profile.full_name,
-                university=profile.university,
-                course=profile.course,
-                semester=profile.semester,
-                photo_url=profile.photo_url,
-                active_mentees=active_mentees,
-                available_slots=MentorshipService.MAX_MENTEES_PER_MENTOR
-                - active_mentees,
-            )
-        )
-
-    return available_mentors
+        for profile, active_mentees, compatibility in rows
+    ]
 
 
 @router.get("/my-mentees", response_model=List[MentorshipOut])
@@ -103,7 +87,7 @@ def get_my_mentees(
     - Lista mentorados ativos
     - Inclui informações do perfil
     """
-    logger.info(f"👥 User {current_user.id} viewing their mentees")
+    logger.debug("User %s viewing their mentees", current_user.id)
 
     mentorships = (
         db.query(Mentorship)
@@ -141,7 +125,7 @@ def get_my_mentor(
     - Retorna mentor ativo
     - Inclui informações do perfil
     """
-    logger.info(f"🎓 User {current_user.id} viewing their mentor")
+    logger.debug("User %s viewing their mentor", current_user.id)
 
     mentorship = (
         db.query(Mentorship)
@@ -181,7 +165,7 @@ def complete_mentorship(
 
     - Mentor ou mentee podem finalizar
     """
-    logger.info(f"✅ User {current_user.id} completing mentorship {mentorship_id}")
+    logger.info("User %s completing mentorship %s", current_user.id, mentorship_id)
 
     try:
         MentorshipService.complete_mentorship(
@@ -209,37 +193,69 @@ def get_my_queue_position(
     """
     📊 Minha posição na fila de espera
     """
-    logger.info(f"📊 User {current_user.id} checking queue position")
+    logger.debug("User %s checking queue position", current_user.id)
 
-    queue_entry = (
-        db.query(MentorshipQueue)
-        .filter(MentorshipQueue.user_id == current_user.id)
-        .first()
-    )
+    result = MentorshipService.get_queue_position(db, current_user.id)
 
-    if not queue_entry:
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Você não está na fila de espera",
         )
 
-    # Calcular posição na fila
-    position = (
-        db.query(MentorshipQueue)
-        .filter(MentorshipQueue.requested_at < queue_entry.requested_at)
-        .count()
-        + 1
-    )
-
-    total_in_queue = db.query(MentorshipQueue).count()
+    position, queue_entry = result
 
     return QueuePositionOut(
         position=position,
-        total_in_queue=total_in_queue,
+        total_in_queue=max(MentorshipService.get_queue_length(db), position),
         requested_at=queue_entry.requested_at,
     )
 
 
+@router.get("/queue/snapshot", response_model=QueueSnapshotOut)
+def get_queue_snapshot(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    📋 Fila de espera completa com posições (admin)
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas administradores podem ver a fila completa",
+        )
+
+    entries = MentorshipService.get_queue_snapshot(db)
+
+    return QueueSnapshotOut(total_in_queue=len(entries), entries=entries)
+
+
+@router.post("/queue/assign", response_model=BatchAssignmentReport)
+def assign_queue_batch(
+    dry_run: bool = Query(True, description="Apenas simular, sem criar mentorias"),
+    limit: Optional[int] = Query(None, ge=1, description="Processar só os primeiros N da fila"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    🧮 Atribuição ótima da fila de espera (admin)
+
+    - Maximiza a compatibilidade total da fila inteira
+    - Respeita o limite de mentorados por mentor
+    - Retorna relatório comparando com o matching guloso (FIFO)
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas administradores podem processar a fila",
+        )
+
+    logger.info("Admin %s running batch assignment (dry_run=%s)", current_user.id, dry_run)
+
+    return BatchAssignmentReport(**MentorshipService.assign_queue_batch(db, limit=limit, dry_run=dry_run))
+
+
 @router.get("/stats", response_model=dict)
 def get_mentorship_stats(
     db: Session = Depends(get_db),
@@ -250,24 +266,7 @@ def get_mentorship_stats(
     - Total de mentorias ativas
     - Pessoas na fila
     - Mentores disponíveis
-    """
-    active_mentorships = (
-        db.query(Mentorship).filter(Mentorship.status == "active").count()
-    )
-
-    in_queue = db.query(MentorshipQueue).count()
-
-    # Contar mentores com slots disponíveis
-    all_profiles = db.query(Profile).all()
-    available_mentors = 0
 
-    for profile in all_profiles:
-        is_eligible, _ = MentorshipService.is_eligible_mentor(db, profile.user_id)
-        if is_eligible:
-            available_mentors += 1
-
-    return {
-        "active_mentorships": active_mentorships,
-        "in_queue": in_queue,
-        "available_mentors": available_mentors,
-    }
+    Servido do read model, com cache curto (endpoint público)
+    """
+    return MentorAvailabilityService.get_stats(db)
@@ -15,7 +15,18 @@ from app.schemas.report import (
     ReportOut,
     ReportUpdate,
     ReportResponse,
+    ReportTargetOut,
+    BulkReportUpdate,
+    BulkContentAction,
+    BulkItemResult,
+    BulkActionResponse,
+    UserBanRequest,
+    UserBanResponse,
 )
+from app.services.bulk_moderation import BulkModerationService
+from app.services.purge_service import PurgeService
+from app.services.moderation_stats import ModerationStatsService, stats_cache
+from app.services.report_service import ReportService
 
 logger = logging.getLogger(__name__)
 
@@ -39,10 +50,16 @@ def create_report(
     - Tipos suportados: thread, comment, user
     - Categorias: spam, offensive, harassment, inappropriate, fake, other
     - Previne denúncias duplicadas (mesmo reporter, target e categoria)
+    - Atualiza o agregado do alvo; threads/comentários com denunciantes
+      suficientes são ocultados na mesma transação
     """
     logger.info(
-        f"🚨 User {current_user.id} reporting {report_data.target_type} "
-        f"#{report_data.target_id} for {report_data.category}"
+        "User %s reporting %s "
+        "#%s for %s",
+        current_user.id,
+        report_data.target_type,
+        report_data.target_id,
+        report_data.category,
     )
 
     # Verificar se o alvo existe
@@ -97,9 +114,9 @@ def create_report(
         status="pending",
     )
 
-    db.add(new_report)
+    ReportService.record_report(db, new_report)
     db.commit()
-    db.refresh(new_report)
+    stats_cache.invalidate()
 
     return ReportResponse(
         status="success",
@@ -130,7 +147,7 @@ def list_reports(
             detail="Apenas administradores podem listar denúncias",
         )
 
-    logger.info(f"📋 Admin {current_user.id} listing reports")
+    logger.debug("Admin %s listing reports", current_user.id)
 
     query = db.query(Report)
 
@@ -160,7 +177,7 @@ def get_report(
             detail="Apenas administradores podem ver denúncias",
         )
 
-    logger.info(f"🔍 Admin {current_user.id} viewing report {report_id}")
+    logger.debug("Admin %s viewing report %s", current_user.id, report_id)
 
     report = db.query(Report).filter(Report.id == report_id).first()
 
@@ -194,7 +211,10 @@ def update_report_status(
         )
 
     logger.info(
-        f"✏️ Admin {current_user.id} updating report {report_id} to {update_data.status}"
+        "Admin %s updating report %s to %s",
+        current_user.id,
+        report_id,
+        update_data.status,
     )
 
     report = db.query(Report).filter(Report.id == report_id).first()
@@ -205,8 +225,8 @@ def update_report_status(
             detail="Denúncia não encontrada",
         )
 
-    # Atualizar status
-    report.status = update_data.status
+    # Atualizar status (e os pendentes do alvo)
+    ReportService.set_status(db, report, update_data.status)
     if update_data.admin_notes:
         report.admin_notes = update_data.admin_notes
 
@@ -216,6 +236,7 @@ def update_report_status(
         report.reviewed_at = datetime.utcnow()
 
     db.commit()
+    stats_cache.invalidate()
 
     return ReportResponse(
         status="success",
@@ -223,6 +244,218 @@ def update_report_status(
     )
 
 
+def _bulk_response(results: dict) -> BulkActionResponse:
+    processed = sum(1 for result in results.values() if result != "not_found")
+    return BulkActionResponse(
+        status="success",
+        processed=processed,
+        results=[BulkItemResult(id=item_id, result=result) for item_id, result in results.items()],
+    )
+
+
+@router.post("/reports/bulk", response_model=BulkActionResponse)
+def bulk_update_reports(
+    update_data: BulkReportUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    📦 Atualizar várias denúncias de uma vez (Admin only)
+
+    - Até 500 ids, um UPDATE só, numa transação
+    - Ajusta os pendentes de cada alvo na fila de moderação
+    - Resultado por id: updated ou not_found
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas administradores podem atualizar denúncias",
+        )
+
+    logger.info(
+        "Admin %s bulk updating %s reports to %s",
+        current_user.id,
+        len(update_data.report_ids),
+        update_data.status,
+    )
+
+    results = BulkModerationService.resolve_reports(
+        db,
+        current_user.id,
+        update_data.report_ids,
+        update_data.status,
+        update_data.admin_notes,
+    )
+    db.commit()
+    stats_cache.invalidate()
+
+    return _bulk_response(results)
+
+
+@router.post("/content/bulk", response_model=BulkActionResponse)
+def bulk_moderate_content(
+    action_data: BulkContentAction,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    🧹 Ocultar, reexibir ou excluir várias threads/comentários (Admin only)
+
+    - hide/unhide: um UPDATE só; ocultar aprova as denúncias pendentes
+    - delete: exclui comentários e votos junto, sem carregar objetos
+    - Resultado por id: hidden, unhidden, deleted ou not_found
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas administradores podem moderar conteúdo",
+        )
+
+    logger.info(
+        "Admin %s bulk %s on %s %ss",
+        current_user.id,
+        action_data.action,
+        len(action_data.ids),
+        action_data.target_type,
+    )
+
+    if action_data.action == "delete":
+        results = BulkModerationService.delete_content(
+            db, current_user.id, action_data.target_type, action_data.ids
+        )
+    else:
+        results = BulkModerationService.set_hidden(
+            db,
+            current_user.id,
+            action_data.target_type,
+            action_data.ids,
+            hidden=action_data.action == "hide",
+        )
+    db.commit()
+    stats_cache.invalidate()
+
+    return _bulk_response(results)
+
+
+@router.post("/users/{user_id}/ban", response_model=UserBanResponse)
+def ban_user(
+    user_id: int,
+    ban_data: UserBanRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    ⛔ Banir um usuário (Admin only)
+
+    - Desativa a conta
+    - Oculta (ou, com delete_content, exclui) todas as threads e comentários
+    - Aprova as denúncias pendentes contra o usuário e o conteúdo dele
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas administradores podem banir usuários",
+        )
+
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Você não pode banir a si mesmo",
+        )
+
+    logger.info("Admin %s banning user %s", current_user.id, user_id)
+
+    counts = BulkModerationService.ban_user(db, current_user.id, user_id, ban_data.delete_content)
+    if counts is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuário não encontrado",
+        )
+    db.commit()
+    stats_cache.invalidate()
+
+    return UserBanResponse(status="success", user_id=user_id, **counts)
+
+
+@router.delete("/users/{user_id}", response_model=dict)
+def delete_user(
+    user_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    🗑️ Excluir uma conta e todo o conteúdo dela (Admin only)
+
+    - Threads (com comentários e votos de terceiros), comentários, votos,
+      enquetes e notificações saem em lotes, sem carregar objetos
+    - O restante (perfil, amizades, estatísticas...) sai pelo ON DELETE CASCADE
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas administradores podem excluir usuários",
+        )
+
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Você não pode excluir a si mesmo",
+        )
+
+    if db.query(User.id).filter(User.id == user_id).scalar() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuário não encontrado",
+        )
+
+    logger.info("Admin %s deleting user %s", current_user.id, user_id)
+
+    deleted = PurgeService.purge_user(db, user_id)
+    stats_cache.invalidate()
+
+    return {"status": "success", "user_id": user_id, "deleted": deleted}
+
+
+@router.get("/queue", response_model=List[ReportTargetOut])
+def get_moderation_queue(
+    target_type: Optional[str] = Query(None, pattern="^(thread|comment|user)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    🗂️ Fila de moderação (Admin only)
+
+    - Um item por alvo com denúncias pendentes (total, denunciantes
+      distintos, categoria mais frequente, última denúncia)
+    - Ordenada por gravidade: denunciantes distintos x peso da categoria
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas administradores podem ver a fila de moderação",
+        )
+
+    logger.debug("Admin %s viewing moderation queue", current_user.id)
+
+    rows = ReportService.moderation_queue(db, target_type=target_type, skip=skip, limit=limit)
+    return [
+        ReportTargetOut(
+            target_type=target.target_type,
+            target_id=target.target_id,
+            report_count=target.report_count,
+            pending_count=target.pending_count,
+            reporter_count=target.reporter_count,
+            top_category=target.top_category,
+            last_reported_at=target.last_reported_at,
+            hidden_at=target.hidden_at,
+            severity=float(score),
+        )
+        for target, score in rows
+    ]
+
+
 @router.get("/my-reports", response_model=List[ReportOut])
 def get_my_reports(
     skip: int = Query(0, ge=0),
@@ -236,7 +469,7 @@ def get_my_reports(
     - Retorna denúncias criadas pelo usuário atual
     - Ordenado por data (mais recente primeiro)
     """
-    logger.info(f"📋 User {current_user.id} listing their reports")
+    logger.debug("User %s listing their reports", current_user.id)
 
     reports = (
         db.query(Report)
@@ -268,7 +501,7 @@ def get_reports_for_target(
             detail="Apenas administradores podem ver denúncias",
         )
 
-    logger.info(f"🎯 Admin {current_user.id} viewing reports for {target_type} {target_id}")
+    logger.debug("Admin %s viewing reports for %s %s", current_user.id, target_type, target_id)
 
     if target_type not in ["thread", "comment", "user"]:
         raise HTTPException(
@@ -291,6 +524,7 @@ def get_reports_for_target(
 
 @router.get("/stats", response_model=dict)
 def get_moderation_stats(
+    days: int = Query(30, ge=1, le=365, description="Dias na série diária"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -299,7 +533,9 @@ def get_moderation_stats(
 
     - Total de denúncias por status
     - Total de denúncias por tipo
-    - Denúncias pendentes
+    - Total de denúncias por categoria
+    - Série diária (total e por status) dos últimos `days` dias
+    - Tudo em uma query agregada, com cache curto
     """
     if not is_admin(current_user):
         raise HTTPException(
@@ -307,31 +543,6 @@ def get_moderation_stats(
             detail="Apenas administradores podem ver estatísticas",
         )
 
-    logger.info(f"📊 Admin {current_user.id} viewing moderation stats")
-
-    # Denúncias por status
-    status_counts = {}
-    for status_value in ["pending", "reviewed", "approved", "rejected"]:
-        count = db.query(Report).filter(Report.status == status_value).count()
-        status_counts[status_value] = count
-
-    # Denúncias por tipo
-    type_counts = {}
-    for type_value in ["thread", "comment", "user"]:
-        count = db.query(Report).filter(Report.target_type == type_value).count()
-        type_counts[type_value] = count
-
-    # Denúncias por categoria
-    category_counts = {}
-    for category in ["spam", "offensive", "harassment", "inappropriate", "fake", "other"]:
-        count = db.query(Report).filter(Report.category == category).count()
-        category_counts[category] = count
-
-    total_reports = db.query(Report).count()
-
-    return {
-        "total_reports": total_reports,
-        "by_status": status_counts,
-        "by_type": type_counts,
-        "by_category": category_counts,
-    }
+    logger.debug("Admin %s viewing moderation stats", current_user.id)
+
+    return ModerationStatsService.get_stats(db, days=days)
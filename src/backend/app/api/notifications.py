@@ -34,7 +34,7 @@ def list_notifications(
     - Opção para filtrar apenas não lidas
     - Suporta paginação
     """
-    logger.info(f"📬 User {current_user.id} listing notifications (unread_only={unread_only})")
+    logger.debug("User %s listing notifications (unread_only=%s)", current_user.id, unread_only)
 
     query = db.query(Notification).filter(Notification.user_id == current_user.id)
 
@@ -77,7 +77,7 @@ def mark_notification_as_read(
 
     - Apenas o dono da notificação pode marcá-la como lida
     """
-    logger.info(f"✅ User {current_user.id} marking notification {notification_id} as read")
+    logger.info("User %s marking notification %s as read", current_user.id, notification_id)
 
     success = NotificationService.mark_as_read(db, notification_id, current_user.id)
 
@@ -100,7 +100,7 @@ def mark_all_notifications_as_read(
 
     - Atualiza todas as notificações não lidas do usuário
     """
-    logger.info(f"✅ User {current_user.id} marking all notifications as read")
+    logger.info("User %s marking all notifications as read", current_user.id)
 
     count = NotificationService.mark_all_as_read(db, current_user.id)
 
@@ -122,7 +122,7 @@ def delete_notification(
 
     - Apenas o dono pode deletar
     """
-    logger.info(f"🗑️ User {current_user.id} deleting notification {notification_id}")
+    logger.info("User %s deleting notification %s", current_user.id, notification_id)
 
     notification = (
         db.query(Notification)
@@ -155,7 +155,7 @@ def get_notification_preferences(
 
     - Cria preferências padrão se não existirem
     """
-    logger.info(f"⚙️ User {current_user.id} getting notification preferences")
+    logger.debug("User %s getting notification preferences", current_user.id)
 
     prefs = NotificationService.get_or_create_preferences(db, current_user.id)
 
@@ -183,7 +183,7 @@ def update_notification_preferences(
     - Atualiza apenas os campos fornecidos
     - Cria preferências padrão se não existirem
     """
-    logger.info(f"⚙️ User {current_user.id} updating notification preferences")
+    logger.info("User %s updating notification preferences", current_user.id)
 
     prefs = NotificationService.get_or_create_preferences(db, current_user.id)
 
@@ -1,15 +1,18 @@
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session, selectinload
 
 from app.api.deps import get_db, get_current_user
+from app.core.pagination import decode_cursor, encode_cursor
 from app.models.poll import Poll, PollOption, PollVote
 from app.models.profile import Profile
 from app.models.user import User
 from app.schemas.poll import (
     PollCreate,
     PollOut,
+    PollFeedResponse,
     PollVoteRequest,
     PollCreatorOut,
     PollOptionOut,
@@ -18,45 +21,64 @@ from app.schemas.poll import (
 router = APIRouter(prefix="/api/polls", tags=["polls"])
 
 
-def _serialize_poll(poll: Poll, current_user: Optional[User], db: Session) -> PollOut:
-    profile = (
-        db.query(Profile).filter(Profile.user_id == poll.created_by).first()
-    )
-    creator = PollCreatorOut(
-        user_id=poll.created_by,
-        nickname=profile.nickname if profile else None,
-        full_name=profile.full_name if profile else None,
-        university=profile.university if profile else None,
-    )
+def _serialize_polls(polls: List[Poll], current_user: Optional[User], db: Session) -> List[PollOut]:
+    """Serializa uma página de enquetes: perfis dos criadores e votos do usuário em uma query cada"""
+    if not polls:
+        return []
+
+    creator_ids = {poll.created_by for poll in polls}
+    profiles = {
+        row.user_id: row
+        for row in db.execute(
+            select(Profile.user_id, Profile.nickname, Profile.full_name, Profile.university).where(
+                Profile.user_id.in_(creator_ids)
+            )
+        )
+    }
 
-    user_vote = None
+    user_votes = {}
     if current_user:
-        vote = (
-            db.query(PollVote)
-            .filter(
-                PollVote.poll_id == poll.id,
-                PollVote.user_id == current_user.id,
+        user_votes = dict(
+            db.execute(
+                select(PollVote.poll_id, PollOption.label)
+                .join(PollOption, PollOption.id == PollVote.option_id)
+                .where(
+                    PollVote.user_id == current_user.id,
+                    PollVote.poll_id.in_([poll.id for poll in polls]),
+                )
+            ).all()
+        )
+
+    serialized = []
+    for poll in polls:
+        profile = profiles.get(poll.created_by)
+        creator = PollCreatorOut(
+            user_id=poll.created_by,
+            nickname=profile.nickname if profile else None,
+            full_name=profile.full_name if profile else None,
+            university=profile.university if profile else None,
+        )
+        options = [
+            PollOptionOut(id=option.id, label=option.label, votes_count=option.votes_count)
+            for option in poll.options
+        ]
+        serialized.append(
+            PollOut(
+                id=poll.id,
+                title=poll.title,
+                description=poll.description,
+                audience=poll.audience,
+                created_at=poll.created_at,
+                creator=creator,
+                options=options,
+                user_vote=user_votes.get(poll.id),
             )
-            .first()
         )
-        if vote and vote.option:
-            user_vote = vote.option.label
-
-    options = [
-        PollOptionOut(id=option.id, label=option.label, votes_count=option.votes_count)
-        for option in poll.options
-    ]
-
-    return PollOut(
-        id=poll.id,
-        title=poll.title,
-        description=poll.description,
-        audience=poll.audience,
-        created_at=poll.created_at,
-        creator=creator,
-        options=options,
-        user_vote=user_vote,
-    )
+    return serialized
+
+
+def _serialize_poll(poll: Poll, current_user: Optional[User], db: Session) -> PollOut:
+    return _serialize_polls([poll], current_user, db)[0]
 
 
 @router.get("/", response_model=List[PollOut])
@@ -77,7 +99,55 @@ def list_polls(
     if audience:
         query = query.filter(Poll.audience == audience)
     polls = query.offset(skip).limit(limit).all()
-    return [_serialize_poll(poll, current_user, db) for poll in polls]
+    return _serialize_polls(polls, current_user, db)
+
+
+@router.get("/feed", response_model=PollFeedResponse)
+def poll_feed(
+    audience: Optional[str] = Query(None, pattern="^(geral|faculdade)$"),
+    university: Optional[str] = Query(None, max_length=100, description="Universidade do criador"),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    🗳️ Feed de enquetes (mais recentes primeiro)
+
+    - Filtrar por público alvo e pela universidade de quem criou
+    - Paginação por cursor sobre (created_at, id): envie o `next_cursor`
+    - Perfis dos criadores e votos do usuário em uma query cada por página
+    """
+    query = (
+        db.query(Poll)
+        .options(selectinload(Poll.options))
+        .order_by(Poll.created_at.desc(), Poll.id.desc())
+    )
+    if audience:
+        query = query.filter(Poll.audience == audience)
+    if university:
+        query = query.filter(
+            Poll.created_by.in_(select(Profile.user_id).where(Profile.university == university))
+        )
+    if cursor:
+        try:
+            created_at, poll_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.filter(
+            or_(
+                Poll.created_at < created_at,
+                and_(Poll.created_at == created_at, Poll.id < poll_id),
+            )
+        )
+
+    polls = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(polls) > limit:
+        polls = polls[:limit]
+        next_cursor = encode_cursor(polls[-1].created_at, polls[-1].id)
+
+    return PollFeedResponse(polls=_serialize_polls(polls, current_user, db), next_cursor=next_cursor)
 
 
 @router.post("/", response_model=PollOut, status_code=status.HTTP_201_CREATED)
@@ -19,6 +19,7 @@ from app.services.social_graph import (
 )
 from app.services.stats_badges import get_user_stats, get_user_badges
 from app.services.university_groups import UniversityGroupService
+from app.core.logging_config import SAMPLED
 
 # === LOGGING ===
 logger = logging.getLogger(__name__)
@@ -72,7 +73,7 @@ def get_profile_by_email(
     - Se for amigo: retorna perfil privado
     - Caso contrário: retorna 403 (perfil privado)
     """
-    logger.info(f"🔍 Buscando perfil por email: {email}")
+    logger.debug("Buscando perfil por email: %s", email)
 
     user = db.query(User).filter(User.email == email).first()
     if not user:
@@ -139,7 +140,7 @@ def get_my_profile(
     db: Session = Depends(get_db)
 ):
     """Retorna o perfil do usuário logado (privado)"""
-    logger.info(f"👤 Buscando perfil do usuário: {current_user.email}")
+    logger.debug("Buscando perfil do usuário: %s", current_user.email)
     
     profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
     if not profile:
@@ -163,11 +164,11 @@ def list_all_users(
     Lista todos os usuários com perfis públicos.
     Retorna informações básicas para descobrir o ID de outros usuários.
     """
-    logger.info(f"📋 Listando todos os perfis públicos...")
+    logger.debug("Listando todos os perfis públicos...")
     
     profiles = db.query(Profile).filter(Profile.is_public == True).all()
     
-    logger.info(f"📋 {len(profiles)} perfis públicos encontrados")
+    logger.info("%s perfis públicos encontrados", len(profiles), extra=SAMPLED)
     
     return [_to_public(profile, db, current_user.id) for profile in profiles]
 
@@ -184,28 +185,28 @@ def get_profile(
     - Se for amigo: retorna dados privados
     - Caso contrário: retorna apenas dados públicos
     """
-    logger.info(f"🔍 Buscando perfil do usuário: {user_id}")
+    logger.debug("Buscando perfil do usuário: %s", user_id)
     
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
     if not profile:
-        logger.warning(f"❌ Perfil não encontrado: {user_id}")
+        logger.warning("Perfil não encontrado: %s", user_id)
         raise HTTPException(status_code=404, detail="Perfil não encontrado")
 
     friendship_status = get_friend_status(db, current_user.id, user_id)
 
     if current_user.id == user_id:
-        logger.info(f"✅ Retornando perfil privado (seu perfil)")
+        logger.debug("Retornando perfil privado (seu perfil)")
         return _to_private(profile, db, current_user.id)
 
     if friendship_status == "friends":
-        logger.info(f"✅ Retornando perfil privado (amigos)")
+        logger.debug("Retornando perfil privado (amigos)")
         return _to_private(profile, db, current_user.id)
 
     if profile.is_public:
-        logger.info(f"✅ Retornando perfil público")
+        logger.debug("Retornando perfil público")
         return _to_public(profile, db, current_user.id)
 
-    logger.warning(f"❌ Perfil privado: {user_id}")
+    logger.warning("Perfil privado: %s", user_id)
     raise HTTPException(status_code=403, detail="Perfil privado")
 
 @router.put("/me", response_model=ProfilePrivateOut)
@@ -215,7 +216,7 @@ def update_my_profile(
     db: Session = Depends(get_db)
 ):
     """Atualiza o perfil do usuário logado"""
-    logger.info(f"✏️ Atualizando perfil: {current_user.email}")
+    logger.info("Atualizando perfil: %s", current_user.email)
     
     profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
     if not profile:
@@ -247,12 +248,12 @@ def update_my_profile(
                 old_university=old_university,
                 new_university=new_university
             )
-            logger.info(f"✅ Usuário {current_user.id} atualizado nos grupos: {old_university} -> {new_university}")
+            logger.info("Usuário %s atualizado nos grupos: %s -> %s", current_user.id, old_university, new_university)
         except Exception as e:
-            logger.error(f"❌ Erro ao atualizar grupos da universidade: {str(e)}")
+            logger.error("Erro ao atualizar grupos da universidade: %s", e)
             # Não falhar a atualização do perfil por causa disso
 
-    logger.info(f"✅ Perfil atualizado: {current_user.email}")
+    logger.info("Perfil atualizado: %s", current_user.email)
     
     return _to_private(profile, db, current_user.id)
 
@@ -316,11 +317,11 @@ async def upload_my_photo(
     db: Session = Depends(get_db),
 ):
     """Faz upload de foto de perfil do usuário logado"""
-    logger.info(f"📸 Upload de foto iniciado: {current_user.email}")
+    logger.info("Upload de foto iniciado: %s", current_user.email)
     
     # validações
     if file.content_type not in ALLOWED_MIMES:
-        logger.warning(f"❌ Tipo de arquivo inválido: {file.content_type}")
+        logger.warning("Tipo de arquivo inválido: %s", file.content_type)
         raise HTTPException(
             status_code=400,
             detail="Tipo de arquivo inválido. Use JPG ou PNG."
@@ -328,7 +329,7 @@ async def upload_my_photo(
     
     content = await file.read()
     if len(content) > MAX_BYTES:
-        logger.warning(f"❌ Arquivo muito grande: {len(content)} bytes")
+        logger.warning("Arquivo muito grande: %s bytes", len(content))
         raise HTTPException(
             status_code=400,
             detail="Arquivo muito grande (máx 2MB)."
@@ -361,6 +362,6 @@ async def upload_my_photo(
     db.commit()
     db.refresh(profile)
 
-    logger.info(f"✅ Foto salva: {public_url}")
+    logger.info("Foto salva: %s", public_url)
     
     return {"photo_url": public_url}
@@ -15,8 +15,11 @@ from app.schemas.student_directory import (
     FilterFacets,
     SuggestionsResponse,
     UniversityPageResponse,
+    StudentAutocompleteOut,
 )
 from app.services.student_directory import StudentDirectoryService
+from app.services.name_search import autocomplete
+from app.core.logging_config import SAMPLED
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +46,7 @@ def explore_students(
     # Ordenação
     order_by: str = Query(
         "random",
-        description="Ordenação: 'random', 'name', 'compatibility', 'recent'"
+        description="Ordenação: 'random', 'name', 'compatibility', 'recent', 'relevance'"
     ),
 
     # Paginação
@@ -72,6 +75,8 @@ def explore_students(
     - Suporta infinite scroll via offset/limit
     - Informações exibidas: foto, nome, universidade, curso, 3 tags principais
     - Status de conexão visível: "not_connected", "pending_sent", "pending_received", "connected"
+    - Busca por nome ignora acentos e tolera erros de digitação; com busca, a
+      ordem padrão é por relevância
     """
     try:
         filters = StudentFilters(
@@ -92,20 +97,50 @@ def explore_students(
         )
 
         logger.info(
-            f"User {current_user.id} explored students: "
-            f"{result.total} results, filters: {filters.dict(exclude_none=True)}"
+            "User %s explored students: "
+            "%s results, filters: %s",
+            current_user.id,
+            result.total,
+            filters.dict(exclude_none=True),
+            extra=SAMPLED,
         )
 
         return result
 
     except Exception as e:
-        logger.error(f"Error exploring students: {str(e)}", exc_info=True)
+        logger.error("Error exploring students: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar alunos: {str(e)}"
         )
 
 
+@router.get("/autocomplete", response_model=List[StudentAutocompleteOut])
+def autocomplete_students(
+    q: str = Query(..., min_length=1, max_length=100, description="Início do nome ou nickname"),
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    **RF054 - Autocomplete de nomes**
+
+    Perfis públicos em que alguma palavra do nome/nickname começa com `q`
+    (sem diferenciar acentos), mais relevantes primeiro.
+    """
+    profiles = autocomplete(db, q, exclude_user_id=current_user.id, limit=limit)
+    return [
+        StudentAutocompleteOut(
+            id=profile.user_id,
+            full_name=profile.full_name,
+            nickname=profile.nickname,
+            university=profile.university,
+            photo_url=profile.photo_url,
+        )
+        for profile in profiles
+    ]
+
+
 @router.get("/explore/facets", response_model=FilterFacets)
 def get_filter_facets(
     db: Session = Depends(get_db),
@@ -136,7 +171,7 @@ def get_filter_facets(
         return facets
 
     except Exception as e:
-        logger.error(f"Error getting filter facets: {str(e)}", exc_info=True)
+        logger.error("Error getting filter facets: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar filtros: {str(e)}"
@@ -153,7 +188,7 @@ def get_suggestions(
     **RF051 - Sugestões de conexão personalizadas**
 
     Retorna sugestões de alunos compatíveis baseadas em interesses comuns usando
-    Jaccard similarity coefficient.
+    Jaccard similarity coefficient, reforçadas por amigos em comum (amigos de amigos).
 
     **Pré-requisitos:**
     - Usuário deve ter pelo menos 3 interesses cadastrados
@@ -181,12 +216,12 @@ def get_suggestions(
             limit=limit
         )
 
-        logger.info(f"User {current_user.id} viewed suggestions: {result.total} suggestions")
+        logger.info("User %s viewed suggestions: %s suggestions", current_user.id, result.total, extra=SAMPLED)
 
         return result
 
     except Exception as e:
-        logger.error(f"Error getting suggestions: {str(e)}", exc_info=True)
+        logger.error("Error getting suggestions: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao gerar sugestões: {str(e)}"
@@ -228,14 +263,18 @@ def get_university_page(
         )
 
         logger.info(
-            f"User {current_user.id} viewed {university_name}: "
-            f"{result.total} students"
+            "User %s viewed %s: "
+            "%s students",
+            current_user.id,
+            university_name,
+            result.total,
+            extra=SAMPLED,
         )
 
         return result
 
     except Exception as e:
-        logger.error(f"Error getting university page: {str(e)}", exc_info=True)
+        logger.error("Error getting university page: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar universidade: {str(e)}"
@@ -19,6 +19,7 @@ from app.schemas.student_directory import (
     UniversityGroupOut
 )
 from app.services.student_directory_supabase import StudentDirectoryService
+from app.core.logging_config import SAMPLED
 
 logger = logging.getLogger(__name__)
 
@@ -100,14 +101,18 @@ def explore_students(
         )
 
         logger.info(
-            f"User {current_user.id} explored students: "
-            f"{result.total} results, filters: {filters.dict(exclude_none=True)}"
+            "User %s explored students: "
+            "%s results, filters: %s",
+            current_user.id,
+            result.total,
+            filters.dict(exclude_none=True),
+            extra=SAMPLED,
         )
 
         return result
 
     except Exception as e:
-        logger.error(f"Error exploring students: {str(e)}", exc_info=True)
+        logger.error("Error exploring students: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar alunos: {str(e)}"
@@ -146,7 +151,7 @@ def get_filter_facets(
         return facets
 
     except Exception as e:
-        logger.error(f"Error getting filter facets: {str(e)}", exc_info=True)
+        logger.error("Error getting filter facets: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar facets de filtros: {str(e)}"
@@ -188,13 +193,16 @@ def get_connection_suggestions(
         )
 
         logger.info(
-            f"User {current_user.id} got {suggestions.total} connection suggestions"
+            "User %s got %s connection suggestions",
+            current_user.id,
+            suggestions.total,
+            extra=SAMPLED,
         )
 
         return suggestions
 
     except Exception as e:
-        logger.error(f"Error getting suggestions: {str(e)}", exc_info=True)
+        logger.error("Error getting suggestions: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar sugestões de conexão: {str(e)}"
@@ -245,8 +253,12 @@ def get_university_page(
         )
 
         logger.info(
-            f"User {current_user.id} viewed university page: {university_slug}, "
-            f"{result.total} students"
+            "User %s viewed university page: %s, "
+            "%s students",
+            current_user.id,
+            university_slug,
+            result.total,
+            extra=SAMPLED,
         )
 
         return result
@@ -254,7 +266,7 @@ def get_university_page(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting university page: {str(e)}", exc_info=True)
+        logger.error("Error getting university page: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar página da universidade: {str(e)}"
@@ -311,7 +323,10 @@ def get_my_university_students(
         )
 
         logger.info(
-            f"User {current_user.id} viewed their university page: {profile.university.name}"
+            "User %s viewed their university page: %s",
+            current_user.id,
+            profile.university.name,
+            extra=SAMPLED,
         )
 
         return result
@@ -319,7 +334,7 @@ def get_my_university_students(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting my university: {str(e)}", exc_info=True)
+        logger.error("Error getting my university: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar alunos da sua universidade: {str(e)}"
@@ -376,7 +391,7 @@ def get_my_university_group(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting university group: {str(e)}", exc_info=True)
+        logger.error("Error getting university group: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao buscar grupo da universidade: {str(e)}"
@@ -402,12 +417,12 @@ def list_all_university_groups(
     try:
         groups = StudentDirectoryService.get_all_university_groups(db)
 
-        logger.info(f"User {current_user.id} listed {len(groups)} university groups")
+        logger.info("User %s listed %s university groups", current_user.id, len(groups), extra=SAMPLED)
 
         return groups
 
     except Exception as e:
-        logger.error(f"Error listing university groups: {str(e)}", exc_info=True)
+        logger.error("Error listing university groups: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao listar grupos de universidades: {str(e)}"
@@ -5,9 +5,13 @@ from typing import List, Optional
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
 from app.models.profile import Profile
+from app.models.report import Report
 from app.models.thread import Thread, Comment, ThreadVote, CommentVote
 from app.schemas.thread import ThreadCreate, ThreadOut, CommentCreate, CommentOut, VoteIn, AuthorOut
 from app.services.gamification import GamificationService
+from app.services.moderation_stats import stats_cache
+from app.services.purge_service import PurgeService
+from app.services.report_service import ReportService
 
 router = APIRouter(prefix="/api/threads", tags=["Threads"])
 
@@ -56,6 +60,10 @@ def list_threads(
 ):
     query = db.query(Thread)
 
+    # Threads ocultadas por denúncias só aparecem para admins
+    if not user.is_admin:
+        query = query.filter(Thread.is_hidden == False)
+
     if search:
         query = query.filter(Thread.title.ilike(f"%{search}%"))
 
@@ -75,17 +83,13 @@ def list_threads(
 # === Ver Thread por ID ===
 @router.get("/{thread_id}", response_model=ThreadOut)
 def get_thread(thread_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread não encontrada.")
+    thread = _get_visible_thread(db, thread_id, user)
     return enrich_thread(thread, db, user.id)
 
 # === Comentar em Thread ===
 @router.post("/{thread_id}/comments", response_model=CommentOut)
 def create_comment(thread_id: int, data: CommentCreate, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread não encontrada.")
+    thread = _get_visible_thread(db, thread_id, user)
 
     comment = Comment(
         thread_id=thread_id,
@@ -111,16 +115,12 @@ def create_comment(thread_id: int, data: CommentCreate, db: Session = Depends(ge
 # === Listar comentários de uma thread ===
 @router.get("/{thread_id}/comments", response_model=List[CommentOut])
 def list_comments(thread_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread não encontrada.")
+    thread = _get_visible_thread(db, thread_id, user)
 
-    comments = (
-        db.query(Comment)
-        .filter(Comment.thread_id == thread_id)
-        .order_by(Comment.created_at.desc())
-        .all()
-    )
+    query = db.query(Comment).filter(Comment.thread_id == thread_id)
+    if not user.is_admin:
+        query = query.filter(Comment.is_hidden == False)
+    comments = query.order_by(Comment.created_at.desc()).all()
 
     return [enrich_comment(c, db) for c in comments]
 
@@ -171,7 +171,26 @@ def report_thread(thread_id: int, db: Session = Depends(get_db), user: User = De
     if not thread:
         raise HTTPException(status_code=404, detail="Thread não encontrada.")
     thread.is_reported = True
+
+    # Conta no agregado da moderação (uma denúncia pendente por usuário)
+    already_reported = db.query(
+        db.query(Report)
+        .filter(
+            Report.reporter_id == user.id,
+            Report.target_type == "thread",
+            Report.target_id == thread_id,
+            Report.status == "pending",
+        )
+        .exists()
+    ).scalar()
+    if not already_reported:
+        ReportService.record_report(
+            db,
+            Report(reporter_id=user.id, target_type="thread", target_id=thread_id, category="other"),
+        )
+
     db.commit()
+    stats_cache.invalidate()
     return {"message": "Thread denunciada com sucesso."}
 
 # === Admin: listar denunciadas ===
@@ -185,16 +204,23 @@ def list_reported(db: Session = Depends(get_db), user: User = Depends(get_curren
 # === Admin: deletar thread ===
 @router.delete("/{thread_id}")
 def delete_thread(thread_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
+    owner_id = db.query(Thread.user_id).filter(Thread.id == thread_id).scalar()
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="Thread não encontrada.")
-    if thread.user_id != user.id and not user.is_admin:
+    if owner_id != user.id and not user.is_admin:
         raise HTTPException(status_code=403, detail="Sem permissão.")
-    db.delete(thread)
-    db.commit()
+    # Comentários e votos saem em lotes, sem carregar no ORM
+    PurgeService.purge_thread(db, thread_id)
     return {"message": "Thread deletada."}
 
 # === Helpers ===
+def _get_visible_thread(db: Session, thread_id: int, user: User) -> Thread:
+    """Thread pelo id; ocultadas por denúncias só existem para admins (404)"""
+    thread = db.query(Thread).filter(Thread.id == thread_id).first()
+    if not thread or (thread.is_hidden and not user.is_admin):
+        raise HTTPException(status_code=404, detail="Thread não encontrada.")
+    return thread
+
 def _build_author_out(db: Session, user_id: int) -> AuthorOut:
     user = db.query(User).filter(User.id == user_id).first()
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
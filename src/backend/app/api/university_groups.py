@@ -17,6 +17,7 @@ from app.schemas.university_group import (
     MyGroupOut,
 )
 from app.services.university_groups import UniversityGroupService
+from app.core.logging_config import SAMPLED
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +61,7 @@ def list_all_groups(
             )
         )
 
-    logger.info(f"Found {total} university groups, returning {len(result)}")
+    logger.info("Found %s university groups, returning %s", total, len(result), extra=SAMPLED)
     return result
 
 
@@ -78,7 +79,7 @@ def list_group_members(
     - Ordenado por data de entrada (mais recentes primeiro)
     - Suporta paginação
     """
-    logger.info(f"👥 Listing members of group {group_id}")
+    logger.debug("Listing members of group %s", group_id)
 
     # Verificar se o grupo existe
     group = db.query(UniversityGroup).filter(UniversityGroup.id == group_id).first()
@@ -113,7 +114,7 @@ def list_group_members(
             )
         )
 
-    logger.info(f"Found {total} members in group {group_id}, returning {len(result)}")
+    logger.info("Found %s members in group %s, returning %s", total, group_id, len(result), extra=SAMPLED)
     return result
 
 
@@ -129,13 +130,13 @@ def get_my_group(
     - Indica se o usuário já é membro
     - Se não tem universidade, retorna null
     """
-    logger.info(f"🎓 User {current_user.id} requesting their university group")
+    logger.debug("User %s requesting their university group", current_user.id)
 
     # Buscar perfil do usuário
     profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
 
     if not profile or not profile.university:
-        logger.info(f"User {current_user.id} has no university configured")
+        logger.info("User %s has no university configured", current_user.id)
         return MyGroupOut(group=None, is_member=False, joined_at=None)
 
     # Buscar ou criar o grupo
@@ -183,7 +184,7 @@ def join_my_group(
     - Cria o grupo se não existir
     - Retorna erro se o usuário não tem universidade configurada
     """
-    logger.info(f"✅ User {current_user.id} joining their university group")
+    logger.info("User %s joining their university group", current_user.id)
 
     # Buscar perfil
     profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
@@ -224,7 +225,7 @@ def get_group_stats(
     - Número de threads do grupo
     - Número de eventos do grupo (quando implementado)
     """
-    logger.info(f"📊 Getting stats for group {group_id}")
+    logger.debug("Getting stats for group %s", group_id)
 
     # Verificar se o grupo existe
     group = db.query(UniversityGroup).filter(UniversityGroup.id == group_id).first()
@@ -277,7 +278,7 @@ def get_group_by_university(
     - Retorna o grupo da universidade especificada
     - Cria o grupo se não existir
     """
-    logger.info(f"🔍 Searching group for university: {university_name}")
+    logger.debug("Searching group for university: %s", university_name)
 
     group = UniversityGroupService.ensure_group_exists(db, university_name)
     member_count = UniversityGroupService.get_group_members_count(db, group.id)
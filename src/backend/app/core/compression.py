@@ -0,0 +1,237 @@
+"""
+Compressão de respostas HTTP (gzip / brotli)
+
+Middleware ASGI que negocia o `Accept-Encoding` do cliente e comprime
+respostas acima de um tamanho mínimo. Respostas completas são comprimidas de
+uma vez; respostas em streaming são comprimidas chunk a chunk.
+"""
+import gzip
+import logging
+import zlib
+from typing import Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Tipos que valem a pena comprimir (imagens/vídeos já são comprimidos)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+NON_COMPRESSIBLE_TYPES = ("text/event-stream",)
+
+
+def available_encodings(requested: Iterable[str]) -> Tuple[str, ...]:
+    """Filtra os algoritmos configurados pelos que estão instalados"""
+    encodings = []
+    for name in requested:
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name == "br" and brotli is None:
+            logger.warning("Brotli requested but the 'brotli' package is not installed; skipping")
+            continue
+        if name not in ("br", "gzip"):
+            logger.warning("Unknown compression algorithm %r; skipping", name)
+            continue
+        encodings.append(name)
+    return tuple(encodings)
+
+
+def negotiate_encoding(accept_encoding: str, supported: Tuple[str, ...]) -> Optional[str]:
+    """
+    Escolhe o algoritmo a partir do header Accept-Encoding
+
+    Respeita `q=0` e `*`; em caso de empate vale a ordem de preferência do
+    servidor (`supported`).
+    """
+    if not accept_encoding or not supported:
+        return None
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    best = None
+    best_quality = 0.0
+    for encoding in supported:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if not content_type or content_type in NON_COMPRESSIBLE_TYPES:
+        return False
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+
+class _Compressor:
+    """Interface comum para compressão completa e incremental"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._stream = None
+
+    def compress_all(self, body: bytes) -> bytes:
+        if self.encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_chunk(self, chunk: bytes) -> bytes:
+        if self._stream is None:
+            if self.encoding == "br":
+                self._stream = brotli.Compressor(quality=self.brotli_quality)
+            else:
+                self._stream = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        if self.encoding == "br":
+            return self._stream.process(chunk) + self._stream.flush()
+        return self._stream.compress(chunk) + self._stream.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._stream is None:
+            return b""
+        if self.encoding == "br":
+            return self._stream.finish()
+        return self._stream.flush()
+
+
+class CompressionMiddleware:
+    """
+    Comprime respostas com brotli ou gzip
+
+    Args:
+        minimum_size: respostas menores que isso (em bytes) não são comprimidas
+        encodings: algoritmos em ordem de preferência ("br", "gzip")
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Iterable[str] = ("br", "gzip"),
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings(encodings)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            self.app,
+            self.minimum_size,
+            _Compressor(encoding, self.gzip_level, self.brotli_quality),
+        )
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, minimum_size: int, compressor: _Compressor) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressor = compressor
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Segurar o start até saber o tamanho do primeiro chunk
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self.send(self.start_message)
+                self.start_message = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None and not more_body:
+            # Resposta completa em um único chunk
+            if len(body) < self.minimum_size:
+                await self.send(self.start_message)
+                self.start_message = None
+                await self.send(message)
+                return
+
+            compressed = self.compressor.compress_all(body)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.compressor.encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await self.send(self.start_message)
+            self.start_message = None
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+
+        if self.start_message is not None:
+            # Início de uma resposta em streaming
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.compressor.encoding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+            self.start_message = None
+
+        chunk = self.compressor.compress_chunk(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -26,6 +26,35 @@ class Settings(BaseSettings):
     ADMIN_VERIFICATION_CODE: str = "ADMIN123456"
     ADMIN_MASTER_PASSWORD: str = "123456"
 
+    # === RESPONSE CONFIG ===
+    JSON_RESPONSE_ENGINE: str = "auto"  # 'auto', 'orjson' ou 'json'
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ALGORITHMS: str = "br,gzip"  # Ordem de preferência
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; respostas menores vão sem compressão
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # === LOGGING ===
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # 'json' ou 'text'
+    LOG_SAMPLE_RATE: float = 1.0  # Fração mantida dos logs INFO de alta frequência
+
+    # === PROFILING / METRICS ===
+    PROFILING_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = True
+    METRICS_ENABLED: bool = True  # Expõe /metrics (formato Prometheus)
+    SLOW_REQUEST_MS: int = 500
+    SLOW_REQUEST_QUERY_COUNT: int = 30  # Loga requisições com mais statements que isso
+    N_PLUS_ONE_THRESHOLD: int = 10  # Repetições da mesma query para reportar N+1
+
+    # === CACHE ===
+    STATS_CACHE_TTL_SECONDS: int = 30  # Estatísticas públicas (0 desliga o cache)
+    CALENDAR_FEED_CACHE_TTL_SECONDS: int = 3600  # Feeds .ics (a chave já inclui a versão)
+    CALENDAR_FEED_PAST_DAYS: int = 30  # Eventos passados mantidos nos feeds
+
+    # === MODERAÇÃO ===
+    REPORT_AUTO_HIDE_THRESHOLD: int = 5  # Denunciantes distintos para ocultar thread/comentário (0 desliga)
+
     @property
     def DATABASE_URL(self):
         return (
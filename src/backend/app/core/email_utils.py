@@ -1,8 +1,11 @@
+import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 def send_verification_email(to_email: str, code: str):
     """
     Envia um e-mail de verificação com um código de 6 dígitos.
@@ -52,6 +55,6 @@ def send_verification_email(to_email: str, code: str):
             server.starttls()
             server.login(sender_email, app_password)
             server.send_message(msg)
-            print(f"✅ E-mail de verificação enviado com sucesso para {to_email}")
+            logger.info("E-mail de verificação enviado com sucesso para %s", to_email)
     except Exception as e:
-        print(f"⚠️ Falha ao enviar e-mail para {to_email}: {e}")
+        logger.warning("Falha ao enviar e-mail para %s: %s", to_email, e)
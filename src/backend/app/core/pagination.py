@@ -0,0 +1,27 @@
+"""
+Paginação por cursor (keyset)
+
+O cursor é opaco para o cliente: codifica a chave de ordenação do último
+item da página, (created_at, id), em base64 url-safe. A próxima página
+continua estritamente depois dessa chave, então o custo não cresce com a
+profundidade como acontece com OFFSET.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, key: int) -> str:
+    raw = f"{created_at.isoformat()}|{key}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverso de `encode_cursor`; ValueError se o cursor for inválido"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, key = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(key)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Cursor de paginação inválido.") from exc
@@ -0,0 +1,296 @@
+"""
+Instrumentação de requisições: contagem de queries, tempo de banco e métricas
+
+- Listeners do SQLAlchemy (`before_cursor_execute` / `after_cursor_execute`)
+  atribuem cada statement à requisição corrente via ContextVar
+- `QueryProfilingMiddleware` expõe `Server-Timing`, alimenta o registro de
+  métricas e loga endpoints lentos com os piores statements e assinaturas N+1
+- `metrics_registry.render()` gera o formato texto do Prometheus (/metrics)
+"""
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "request_profile", default=None
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduz um statement à sua "assinatura"
+
+    Listas de parâmetros (`IN (?, ?, ?)`) e literais viram `?`, para que a
+    mesma query repetida com valores diferentes seja agrupada (detecção de N+1).
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    return _PARAM_LIST.sub("(?)", statement)
+
+
+class StatementStats:
+    __slots__ = ("count", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+
+class RequestProfile:
+    """Acumula os statements executados durante uma requisição"""
+
+    def __init__(self) -> None:
+        self.query_count = 0
+        self.db_time_ms = 0.0
+        self.statements: Dict[str, StatementStats] = {}
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.query_count += 1
+        self.db_time_ms += duration_ms
+        signature = normalize_statement(statement)
+        stats = self.statements.get(signature)
+        if stats is None:
+            stats = self.statements[signature] = StatementStats()
+        stats.count += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+
+    def worst_statements(self, limit: int = 3) -> List[Tuple[str, StatementStats]]:
+        return sorted(
+            self.statements.items(), key=lambda item: item[1].total_ms, reverse=True
+        )[:limit]
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, StatementStats]]:
+        """Statements executados `threshold`+ vezes na mesma requisição (N+1)"""
+        return sorted(
+            ((sig, stats) for sig, stats in self.statements.items() if stats.count >= threshold),
+            key=lambda item: item[1].count,
+            reverse=True,
+        )
+
+
+def get_current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+# === Listeners do SQLAlchemy ===
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get("query_start_time")
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    profile.record(statement, duration_ms)
+
+
+def install_query_listeners() -> None:
+    """Registra os listeners em todas as engines (idempotente)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# === Registro de métricas (formato Prometheus) ===
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _RouteMetrics:
+    __slots__ = ("requests", "duration_sum", "buckets", "queries", "db_time_sum")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.duration_sum = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.queries = 0
+        self.db_time_sum = 0.0
+
+
+class MetricsRegistry:
+    """Métricas agregadas por (método, rota, status) em memória do processo"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str, str], _RouteMetrics] = {}
+
+    def observe(
+        self, method: str, route: str, status: int, duration_s: float, profile: RequestProfile
+    ) -> None:
+        key = (method, route, str(status))
+        with self._lock:
+            metrics = self._routes.get(key)
+            if metrics is None:
+                metrics = self._routes[key] = _RouteMetrics()
+            metrics.requests += 1
+            metrics.duration_sum += duration_s
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration_s <= bound:
+                    metrics.buckets[i] += 1
+            metrics.queries += profile.query_count
+            metrics.db_time_sum += profile.db_time_ms / 1000
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            items = sorted(self._routes.items())
+            lines = [
+                "# HELP http_requests_total Total de requisições HTTP",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), m in items:
+                lines.append(
+                    f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {m.requests}'
+                )
+
+            lines += [
+                "# HELP http_request_duration_seconds Duração das requisições HTTP",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route, status), m in items:
+                labels = f'method="{method}",route="{route}",status="{status}"'
+                for bound, count in zip(DURATION_BUCKETS, m.buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {m.requests}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {m.duration_sum:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {m.requests}")
+
+            lines += [
+                "# HELP db_queries_total Statements SQL executados por rota",
+                "# TYPE db_queries_total counter",
+            ]
+            for (method, route, status), m in items:
+                lines.append(
+                    f'db_queries_total{{method="{method}",route="{route}",status="{status}"}} {m.queries}'
+                )
+
+            lines += [
+                "# HELP db_time_seconds_total Tempo gasto no banco por rota",
+                "# TYPE db_time_seconds_total counter",
+            ]
+            for (method, route, status), m in items:
+                lines.append(
+                    f'db_time_seconds_total{{method="{method}",route="{route}",status="{status}"}} {m.db_time_sum:.6f}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+def _route_template(scope: Scope) -> str:
+    """Usa o template da rota (/api/events/{event_id}) para não explodir a cardinalidade"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return "unmatched"
+    return scope.get("root_path", "") + path if path.startswith("/") else path
+
+
+class QueryProfilingMiddleware:
+    """
+    Perfila cada requisição HTTP
+
+    Args:
+        slow_request_ms: loga requisições mais lentas que isso
+        slow_query_count: loga requisições com mais statements que isso
+        n_plus_one_threshold: repetições da mesma assinatura para reportar N+1
+        server_timing: adiciona o header `Server-Timing`
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        slow_request_ms: float = 500,
+        slow_query_count: int = 30,
+        n_plus_one_threshold: int = 10,
+        server_timing: bool = True,
+        registry: MetricsRegistry = metrics_registry,
+    ) -> None:
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+        self.slow_query_count = slow_query_count
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.server_timing = server_timing
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={profile.db_time_ms:.2f};desc="{profile.query_count} queries", '
+                        f"app;dur={elapsed_ms:.2f}",
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            duration_s = time.perf_counter() - start
+            route = _route_template(scope)
+            self.registry.observe(scope["method"], route, status_code, duration_s, profile)
+            self._log_if_slow(scope["method"], route, duration_s * 1000, profile)
+
+    def _log_if_slow(self, method: str, route: str, elapsed_ms: float, profile: RequestProfile) -> None:
+        if elapsed_ms < self.slow_request_ms and profile.query_count <= self.slow_query_count:
+            return
+
+        worst = "; ".join(
+            "%.1fms x%d %s" % (stats.total_ms, stats.count, sig[:200])
+            for sig, stats in profile.worst_statements()
+        )
+        repeated = "; ".join(
+            "x%d %s" % (stats.count, sig[:200])
+            for sig, stats in profile.repeated_statements(self.n_plus_one_threshold)
+        )
+        logger.warning(
+            "Slow request %s %s: %.1fms total, %d queries, %.1fms in db | worst: %s | n+1: %s",
+            method,
+            route,
+            elapsed_ms,
+            profile.query_count,
+            profile.db_time_ms,
+            worst or "-",
+            repeated or "-",
+        )
@@ -0,0 +1,56 @@
+"""
+Classes de resposta JSON
+
+`ORJSONResponse` serializa com orjson (bem mais rápido que o `json` da stdlib
+para listas grandes, como o feed de threads e o leaderboard). Se o orjson não
+estiver instalado, cai para o `JSONResponse` padrão.
+
+Versões recentes do FastAPI já serializam rotas com `response_model` direto
+para bytes via pydantic, o que é mais rápido que orjson e só acontece com a
+classe de resposta padrão. No modo "auto" o orjson só é usado quando esse
+caminho rápido não existe (ver benchmarks/bench_serialization.py).
+"""
+import inspect
+import logging
+from typing import Any, Type
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class ORJSONResponse(JSONResponse):
+    """Resposta JSON serializada com orjson"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def fastapi_serializes_natively() -> bool:
+    """Indica se o FastAPI instalado serializa response_model direto via pydantic"""
+    return "dump_json" in inspect.signature(serialize_response).parameters
+
+
+def get_default_response_class(engine: str) -> Type[JSONResponse]:
+    """
+    Retorna a classe de resposta padrão para o app
+
+    Args:
+        engine: "auto", "orjson" ou "json"
+    """
+    if engine == "auto":
+        engine = "json" if fastapi_serializes_natively() else "orjson"
+
+    if engine == "orjson":
+        if orjson is not None:
+            return ORJSONResponse
+        logger.warning("JSON_RESPONSE_ENGINE=orjson but orjson is not installed; using json")
+    return JSONResponse
@@ -1,4 +1,7 @@
+import hashlib
+import hmac
 from datetime import datetime, timedelta
+from typing import Optional
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -17,3 +20,21 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def _calendar_signature(user_id: int) -> str:
+    message = f"calendar:{user_id}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()[:32]
+
+def create_calendar_token(user_id: int) -> str:
+    """Token fixo do feed .ics (apps de calendário não mandam Authorization)"""
+    return f"{user_id}.{_calendar_signature(user_id)}"
+
+def verify_calendar_token(token: str) -> Optional[int]:
+    """user_id do token do feed .ics, ou None se for inválido"""
+    user_id, _, signature = token.partition(".")
+    if not user_id.isdigit():
+        return None
+    if not hmac.compare_digest(signature, _calendar_signature(int(user_id))):
+        return None
+    return int(user_id)
@@ -0,0 +1,31 @@
+"""
+Normalização do semestre informado no perfil
+
+O campo `Profile.semester` é texto livre ("4º", "5o semestre", "6",
+"Coordenacao"...). Para filtrar mentores no banco, o número extraído fica
+persistido em `Profile.semester_number` (ver app/models/profile.py).
+"""
+import re
+from typing import Optional
+
+MAX_SEMESTER = 20  # Acima disso consideramos o valor inválido
+
+_SEMESTER_NUMBER = re.compile(r"(?<!\d)(\d{1,2})(?!\d)")
+
+
+def parse_semester(semester: Optional[str]) -> Optional[int]:
+    """
+    Extrai o número do semestre de um texto livre
+
+    Exemplos: "4º" -> 4, "10°" -> 10, "5o semestre" -> 5, "6" -> 6,
+    "Coordenacao" -> None
+    """
+    if not semester:
+        return None
+    match = _SEMESTER_NUMBER.search(semester)
+    if match is None:
+        return None
+    number = int(match.group(1))
+    if not 1 <= number <= MAX_SEMESTER:
+        return None
+    return number
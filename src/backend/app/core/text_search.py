@@ -0,0 +1,90 @@
+"""
+Normalização e similaridade por trigramas para busca de nomes
+
+`Profile.search_name` guarda nome + nickname sem acentos, em minúsculas e
+só com letras/dígitos ("Júlia Souza" -> "julia souza"), para que "julia"
+encontre "Júlia". No PostgreSQL a coluna tem índice GIN `gin_trgm_ops`
+(pg_trgm) e as funções `similarity`/`word_similarity` são as da extensão.
+No SQLite (testes) as mesmas funções são registradas em Python por
+`install_sqlite_functions`, com a mesma definição de trigramas do pg_trgm.
+"""
+import re
+import sqlite3
+import unicodedata
+from typing import List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Limiar padrão do operador `<%` (pg_trgm.word_similarity_threshold)
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(*parts: Optional[str]) -> str:
+    """
+    Junta as partes, remove acentos, passa para minúsculas e troca tudo que
+    não é letra/dígito por um espaço
+
+    Exemplo: ("Júlia Souza", "ju_souza") -> "julia souza ju souza"
+    """
+    text = " ".join(part for part in parts if part)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def _word_trigrams(word: str) -> List[str]:
+    padded = f"  {word} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def trigrams(text: str) -> List[str]:
+    """Trigramas na ordem do texto, palavra por palavra, como o pg_trgm"""
+    return [trigram for word in normalize_name(text).split() for trigram in _word_trigrams(word)]
+
+
+def similarity(a: Optional[str], b: Optional[str]) -> float:
+    """Equivalente a `similarity(a, b)` do pg_trgm"""
+    if not a or not b:
+        return 0.0
+    ta, tb = set(trigrams(a)), set(trigrams(b))
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def word_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """
+    Equivalente a `word_similarity(a, b)` do pg_trgm: maior similaridade
+    entre os trigramas de `a` e um trecho contínuo dos trigramas de `b`
+    """
+    if not a or not b:
+        return 0.0
+    ta: Set[str] = set(trigrams(a))
+    tb = trigrams(b)
+    if not ta or not tb:
+        return 0.0
+
+    best = 0.0
+    for start in range(len(tb)):
+        extent: Set[str] = set()
+        for trigram in tb[start:]:
+            extent.add(trigram)
+            score = len(ta & extent) / len(ta | extent)
+            if score > best:
+                best = score
+    return best
+
+
+def _register_sqlite_functions(dbapi_connection, connection_record) -> None:
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("similarity", 2, similarity, deterministic=True)
+        dbapi_connection.create_function("word_similarity", 2, word_similarity, deterministic=True)
+
+
+def install_sqlite_functions() -> None:
+    """Registra similarity/word_similarity em conexões SQLite (idempotente)"""
+    if not event.contains(Engine, "connect", _register_sqlite_functions):
+        event.listen(Engine, "connect", _register_sqlite_functions)
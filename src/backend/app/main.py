@@ -1,17 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
-import logging
 from app.models import user
+from app.core.config import settings
+from app.core.logging_config import RequestIdMiddleware, configure_logging
 
 # === CONFIGURAR LOGGING ===
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_SAMPLE_RATE)
 
 # === Imports ===
+from app.core.compression import CompressionMiddleware
+from app.core.profiling import QueryProfilingMiddleware, install_query_listeners, metrics_registry
+from app.core.responses import get_default_response_class
+from app.core.text_search import install_sqlite_functions
 from app.db.session import engine
+from app.services.mentor_availability import install_availability_listeners
 from app.api import (
     auth, profiles, interests, threads, student_directory,
     friendships, university_groups, gamification, moderation,
@@ -19,7 +23,11 @@ from app.api import (
 )
 
 # === Inicialização do app ===
-app = FastAPI(title="ISMART Conecta API", version="1.0.0")
+app = FastAPI(
+    title="ISMART Conecta API",
+    version="1.0.0",
+    default_response_class=get_default_response_class(settings.JSON_RESPONSE_ENGINE),
+)
 
 # === Inclusão de routers ===
 app.include_router(auth.router)
@@ -41,6 +49,22 @@ app.include_router(polls.router)
 # Não criar tabelas automaticamente - banco gerenciado externamente
 # user.Base.metadata.create_all(bind=engine)
 
+# === Read models mantidos por listeners da sessão ===
+install_availability_listeners()
+
+# === Funções de trigramas (pg_trgm) emuladas no SQLite ===
+install_sqlite_functions()
+
+# === Compressão (gzip/brotli) ===
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        encodings=settings.COMPRESSION_ALGORITHMS.split(","),
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 # === CORS ===
 origins = ["*"]
 app.add_middleware(
@@ -51,6 +75,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# === Profiling de queries / Server-Timing ===
+# Adicionado por último para ser o middleware mais externo
+if settings.PROFILING_ENABLED:
+    install_query_listeners()
+    app.add_middleware(
+        QueryProfilingMiddleware,
+        slow_request_ms=settings.SLOW_REQUEST_MS,
+        slow_query_count=settings.SLOW_REQUEST_QUERY_COUNT,
+        n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+        server_timing=settings.SERVER_TIMING_ENABLED,
+    )
+
+# === Correlation id (X-Request-ID) ===
+# Mais externo de todos, para que todo log da requisição carregue o id
+app.add_middleware(RequestIdMiddleware)
+
 # === Servir uploads locais ===
 import os
 os.makedirs("media/avatars", exist_ok=True)
@@ -60,3 +100,11 @@ app.mount("/media", StaticFiles(directory="media"), name="media")
 @app.get("/")
 def read_root():
     return {"message": "API ISMART Conecta - online 🚀"}
+
+
+if settings.PROFILING_ENABLED and settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(
+            metrics_registry.render(), media_type="text/plain; version=0.0.4"
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -26,6 +26,9 @@ class Event(Base):
 
     university = Column(String(100), nullable=True, index=True)  # Evento específico de universidade
     max_participants = Column(Integer, nullable=True)  # Limite de participantes (null = ilimitado)
+    # Vagas ocupadas (participantes 'confirmed'); só muda via UPDATE condicional
+    # em EventService, que nunca passa de max_participants
+    confirmed_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     created_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     is_cancelled = Column(Boolean, default=False, nullable=False)
@@ -42,17 +45,24 @@ class Event(Base):
 class EventParticipant(Base):
     """
     Participantes de eventos
-    Status: confirmed, maybe, declined, attended
+    Status: confirmed, maybe, declined, waitlisted
     """
 
     __tablename__ = "event_participants"
+    __table_args__ = (
+        # Fila de espera de um evento, em ordem de chegada
+        Index("ix_event_participants_waitlist", "event_id", "status", "waitlisted_at"),
+        # Listagem/exportação dos participantes em ordem de inscrição
+        Index("ix_event_participants_joined", "event_id", "joined_at", "user_id"),
+    )
 
     event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
 
     status = Column(String(20), default="confirmed", nullable=False)
-    # Status: 'confirmed', 'maybe', 'declined', 'attended'
+    # Status: 'confirmed', 'maybe', 'declined', 'waitlisted' (evento lotado)
 
+    waitlisted_at = Column(DateTime(timezone=False), nullable=True)  # Entrada na fila de espera
     attended = Column(Boolean, default=False, nullable=False)  # Marcado pelo criador
     joined_at = Column(DateTime(timezone=False), server_default=func.now())
     updated_at = Column(DateTime(timezone=False), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey, Float, insert, select, update
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -29,16 +29,70 @@ class Mentorship(Base):
     mentee = relationship("User", foreign_keys=[mentee_id])
 
 
+class MentorshipQueueState(Base):
+    """
+    Estado global da fila de espera (linha única, id=1)
+
+    `next_seq` é o próximo número de ordem a ser entregue; o UPDATE que o
+    incrementa trava a linha, então inserções concorrentes nunca repetem
+    um número.
+    """
+
+    __tablename__ = "mentorship_queue_state"
+
+    id = Column(Integer, primary_key=True)
+    next_seq = Column(Integer, nullable=False, default=1)
+
+
+def _next_queue_seq(context) -> int:
+    """Default de `MentorshipQueue.queue_seq`: reserva o próximo número da fila"""
+    conn = context.connection
+    state = MentorshipQueueState.__table__
+    seq = conn.execute(
+        update(state)
+        .where(state.c.id == 1)
+        .values(next_seq=state.c.next_seq + 1)
+        .returning(state.c.next_seq - 1)
+    ).scalar()
+    if seq is None:
+        # Banco sem a linha de estado (ex.: criado via create_all)
+        queue = MentorshipQueue.__table__
+        seq = conn.execute(select(func.coalesce(func.max(queue.c.queue_seq), 0) + 1)).scalar()
+        conn.execute(insert(state).values(id=1, next_seq=seq + 1))
+    return seq
+
+
 class MentorshipQueue(Base):
     """
     Fila de espera para mentorados sem mentor
+
+    A ordem é dada por `queue_seq` (estritamente crescente, indexado), e não
+    por `requested_at`, que pode empatar.
     """
 
     __tablename__ = "mentorship_queue"
 
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    queue_seq = Column(Integer, nullable=False, unique=True, index=True, default=_next_queue_seq)
     requested_at = Column(DateTime(timezone=False), server_default=func.now())
     priority_score = Column(Float, default=0.0, nullable=False)  # Prioridade na fila
 
     # Relacionamento
     user = relationship("User")
+
+
+class MentorAvailability(Base):
+    """
+    Read model dos mentores elegíveis por semestre e sua ocupação
+
+    Uma linha por perfil com semestre suficiente para mentorar, com a
+    contagem de mentorias ativas. Mantido pelos listeners de
+    app/services/mentor_availability.py; alimenta /available-mentors e
+    /stats sem varrer perfis e mentorias.
+    """
+
+    __tablename__ = "mentor_availability"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    active_mentees = Column(Integer, default=0, nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=False), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey, Text, Boolean, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -63,3 +63,46 @@ class NotificationPreference(Base):
 
     # Relacionamento
     user = relationship("User")
+
+
+class ScheduledNotification(Base):
+    """
+    Notificação agendada para `due_at` (hoje: lembretes de evento)
+
+    Gerada quando evento/RSVP muda e entregue em lote pelo worker de
+    app/services/event_reminders.py. A chave (usuário, tipo, referência) é
+    única e `sent_at` marca o que já saiu, então reagendar ou rodar workers
+    em paralelo nunca duplica a notificação.
+    """
+
+    __tablename__ = "scheduled_notifications"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "notification_type",
+            "reference_type",
+            "reference_id",
+            name="unique_scheduled_notification",
+        ),
+        # Só as pendentes interessam ao worker
+        Index(
+            "ix_scheduled_notifications_pending",
+            "due_at",
+            postgresql_where=text("sent_at IS NULL"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    notification_type = Column(String(50), nullable=False)
+
+    # Conteúdo já montado: a entrega é só uma cópia para `notifications`
+    title = Column(String(200), nullable=False)
+    content = Column(Text, nullable=False)
+    link = Column(String(500), nullable=True)
+    reference_id = Column(Integer, nullable=True)
+    reference_type = Column(String(50), nullable=True)
+
+    due_at = Column(DateTime(timezone=False), nullable=False)
+    sent_at = Column(DateTime(timezone=False), nullable=True)
+    created_at = Column(DateTime(timezone=False), server_default=func.now())
@@ -21,14 +21,16 @@ class Poll(Base):
     description = Column(Text, nullable=True)
     audience = Column(String(50), default="geral")
     created_at = Column(DateTime, default=datetime.utcnow)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_by = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
 
     creator = relationship("User")
     options = relationship(
-        "PollOption", back_populates="poll", cascade="all, delete-orphan"
+        "PollOption", back_populates="poll", cascade="all, delete-orphan", passive_deletes=True
     )
     votes = relationship(
-        "PollVote", back_populates="poll", cascade="all, delete-orphan"
+        "PollVote", back_populates="poll", cascade="all, delete-orphan", passive_deletes=True
     )
 
 
@@ -42,7 +44,7 @@ class PollOption(Base):
 
     poll = relationship("Poll", back_populates="options")
     votes = relationship(
-        "PollVote", back_populates="option", cascade="all, delete-orphan"
+        "PollVote", back_populates="option", cascade="all, delete-orphan", passive_deletes=True
     )
 
 
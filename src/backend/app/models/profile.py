@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func, Text, Index
+from sqlalchemy.orm import relationship, validates
 from app.db.base import Base
+from app.core.semester import parse_semester
+from app.core.text_search import normalize_name
 from app.schemas.interest import InterestOut
 
 class Profile(Base):
@@ -10,9 +12,11 @@ class Profile(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
     full_name = Column(String(100), nullable=False)
     nickname = Column(String(50))
+    search_name = Column(String(160))  # Derivado de full_name + nickname (ver validates)
     university = Column(String(100))
     course = Column(String(100))
     semester = Column(String(20))
+    semester_number = Column(Integer, index=True)  # Derivado de `semester` (ver validates)
     bio = Column(Text)
     photo_url = Column(String(255))
     linkedin = Column(String(255))
@@ -23,5 +27,26 @@ class Profile(Base):
     created_at = Column(DateTime(timezone=False), server_default=func.now())
     updated_at = Column(DateTime(timezone=False), server_default=func.now())
 
+    __table_args__ = (
+        Index(
+            "ix_profiles_search_name_trgm",
+            "search_name",
+            postgresql_using="gin",
+            postgresql_ops={"search_name": "gin_trgm_ops"},
+        ),
+    )
+
     user = relationship("User", back_populates="profile")
 
+    @validates("full_name", "nickname")
+    def _sync_search_name(self, key, value):
+        full_name = value if key == "full_name" else self.full_name
+        nickname = value if key == "nickname" else self.nickname
+        self.search_name = normalize_name(full_name, nickname)
+        return value
+
+    @validates("semester")
+    def _sync_semester_number(self, key, value):
+        self.semester_number = parse_semester(value)
+        return value
+
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -10,6 +10,10 @@ class Report(Base):
     """
 
     __tablename__ = "reports"
+    __table_args__ = (
+        # Denúncias de um alvo (agregado em ReportTarget)
+        Index("ix_reports_target", "target_type", "target_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     reporter_id = Column(
@@ -33,3 +37,24 @@ class Report(Base):
     # Relacionamentos
     reporter = relationship("User", foreign_keys=[reporter_id])
     reviewer = relationship("User", foreign_keys=[reviewed_by])
+
+
+class ReportTarget(Base):
+    """
+    Agregado das denúncias por alvo (thread, comentário ou usuário)
+
+    Mantido por upsert em ReportService a cada denúncia, na mesma transação;
+    alimenta a fila de moderação sem varrer `reports`. `hidden_at` marca
+    quando o alvo foi ocultado automaticamente.
+    """
+
+    __tablename__ = "report_targets"
+
+    target_type = Column(String(20), primary_key=True)
+    target_id = Column(Integer, primary_key=True)
+    report_count = Column(Integer, default=0, nullable=False)
+    pending_count = Column(Integer, default=0, nullable=False, index=True)
+    reporter_count = Column(Integer, default=0, nullable=False)  # Denunciantes distintos
+    top_category = Column(String(50), nullable=True)  # Categoria mais denunciada
+    last_reported_at = Column(DateTime(timezone=False), nullable=True)
+    hidden_at = Column(DateTime(timezone=False), nullable=True)
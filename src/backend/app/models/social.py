@@ -7,6 +7,8 @@ from sqlalchemy import (
     Text,
     String,
     UniqueConstraint,
+    CheckConstraint,
+    Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -15,19 +17,42 @@ from app.models.user import User
 
 
 class Friendship(Base):
+    """
+    Uma linha por par não ordenado de usuários
+
+    O par é guardado como (user_low_id, user_high_id) com low < high;
+    `requester_id` diz quem enviou o pedido. Use `Friendship.between`
+    para montar a linha a partir de (solicitante, alvo).
+    """
+
     __tablename__ = "friendships"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    friend_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_low_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_high_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    requester_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     status = Column(String(20), server_default="pending", nullable=False)
     created_at = Column(DateTime(timezone=False), server_default=func.now())
     updated_at = Column(DateTime(timezone=False), server_default=func.now(), onupdate=func.now())
 
-    __table_args__ = (UniqueConstraint("user_id", "friend_id", name="unique_friendship_pair"),)
+    __table_args__ = (
+        UniqueConstraint("user_low_id", "user_high_id", name="unique_friendship_pair"),
+        CheckConstraint("user_low_id < user_high_id", name="ck_friendship_canonical_pair"),
+        # Cobrem "amigos/pedidos de X" pelos dois lados do par
+        Index("ix_friendships_low_status", "user_low_id", "status", "user_high_id"),
+        Index("ix_friendships_high_status", "user_high_id", "status", "user_low_id"),
+    )
+
+    user_low = relationship("User", foreign_keys=[user_low_id], back_populates="friendships_low")
+    user_high = relationship("User", foreign_keys=[user_high_id], back_populates="friendships_high")
+
+    @classmethod
+    def between(cls, requester_id: int, target_id: int, status: str = "pending") -> "Friendship":
+        low, high = sorted((requester_id, target_id))
+        return cls(user_low_id=low, user_high_id=high, requester_id=requester_id, status=status)
 
-    user = relationship("User", foreign_keys=[user_id], back_populates="friendships")
-    friend = relationship("User", foreign_keys=[friend_id], back_populates="friends")
+    def other_user_id(self, user_id: int) -> int:
+        return self.user_high_id if self.user_low_id == user_id else self.user_low_id
 
 
 class Interest(Base):
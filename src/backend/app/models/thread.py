@@ -15,13 +15,15 @@ class Thread(Base):
     category = Column(String(50), nullable=False)  # 'geral' ou 'faculdade'
     tags = Column(String(200), default="")
     created_at = Column(DateTime, default=datetime.utcnow)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     university = Column(String(100))  # Copiado do perfil do usuário
     is_reported = Column(Boolean, default=False)
+    is_hidden = Column(Boolean, default=False, nullable=False)  # Ocultada por denúncias
 
     author = relationship("User", back_populates="threads", lazy="joined")
-    comments = relationship("Comment", back_populates="thread", cascade="all, delete-orphan")
-    votes = relationship("ThreadVote", back_populates="thread", cascade="all, delete-orphan")
+    # O banco apaga os filhos (ON DELETE CASCADE); o ORM não os carrega para excluir
+    comments = relationship("Comment", back_populates="thread", cascade="all, delete-orphan", passive_deletes=True)
+    votes = relationship("ThreadVote", back_populates="thread", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Comment(Base):
@@ -30,12 +32,13 @@ class Comment(Base):
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    thread_id = Column(Integer, ForeignKey("threads.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    thread_id = Column(Integer, ForeignKey("threads.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    is_hidden = Column(Boolean, default=False, nullable=False)  # Ocultado por denúncias
 
     thread = relationship("Thread", back_populates="comments")
     author = relationship("User")
-    votes = relationship("CommentVote", back_populates="comment", cascade="all, delete-orphan")
+    votes = relationship("CommentVote", back_populates="comment", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class ThreadVote(Base):
@@ -43,8 +46,8 @@ class ThreadVote(Base):
     __table_args__ = (UniqueConstraint('user_id', 'thread_id', name='unique_user_thread_vote'),)
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    thread_id = Column(Integer, ForeignKey("threads.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    thread_id = Column(Integer, ForeignKey("threads.id", ondelete="CASCADE"), index=True)
     value = Column(Integer)  # +1 ou -1
 
     thread = relationship("Thread", back_populates="votes")
@@ -55,8 +58,8 @@ class CommentVote(Base):
     __table_args__ = (UniqueConstraint('user_id', 'comment_id', name='unique_user_comment_vote'),)
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    comment_id = Column(Integer, ForeignKey("comments.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    comment_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), index=True)
     value = Column(Integer)  # +1 ou -1
 
     comment = relationship("Comment", back_populates="votes")
@@ -19,21 +19,23 @@ class User(Base):
 
     profile = relationship("Profile", back_populates="user", uselist=False)
     stats = relationship("UserStats", back_populates="user", uselist=False)
-    friendships = relationship(
+    friendships_low = relationship(
         "Friendship",
-        foreign_keys="[Friendship.user_id]",
-        back_populates="user",
-        cascade="all, delete-orphan"
+        foreign_keys="[Friendship.user_low_id]",
+        back_populates="user_low",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
-    friends = relationship(
+    friendships_high = relationship(
         "Friendship",
-        foreign_keys="[Friendship.friend_id]",
-        back_populates="friend",
-        cascade="all, delete-orphan"
+        foreign_keys="[Friendship.user_high_id]",
+        back_populates="user_high",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
-    badges = relationship("UserBadge", back_populates="user", cascade="all, delete-orphan")
-    interests = relationship("UserInterest", back_populates="user", cascade="all, delete-orphan")
-    threads = relationship("Thread", back_populates="author", cascade="all, delete-orphan")
+    badges = relationship("UserBadge", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    interests = relationship("UserInterest", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    threads = relationship("Thread", back_populates="author", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class UserStats(Base):
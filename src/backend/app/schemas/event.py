@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -54,6 +54,8 @@ class EventOut(BaseModel):
 
     # Stats (serão preenchidos se solicitado)
     participant_count: Optional[int] = 0
+    confirmed_count: Optional[int] = 0
+    maybe_count: Optional[int] = 0
     user_rsvp_status: Optional[str] = None
 
     class Config:
@@ -72,6 +74,7 @@ class EventStatsOut(BaseModel):
     confirmed: int
     maybe: int
     declined: int
+    waitlisted: int = 0
     attended: int
     total_rsvp: int
 
@@ -82,6 +85,14 @@ class ParticipantOut(BaseModel):
     user_id: int
     full_name: Optional[str] = None
     photo_url: Optional[str] = None
+    university: Optional[str] = None
     status: str
     attended: bool
     joined_at: datetime
+
+
+class ParticipantListResponse(BaseModel):
+    """Página de participantes de um evento"""
+
+    participants: List[ParticipantOut]
+    next_cursor: Optional[str] = None
@@ -47,3 +47,10 @@ class FriendListResponse(BaseModel):
     """Response for list of friends"""
     friends: List[FriendOut]
     total: int
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class FriendRequestListResponse(BaseModel):
+    """Response for a page of pending friend requests"""
+    requests: List[FriendRequestOut]
+    next_cursor: Optional[str] = None  # None on the last page
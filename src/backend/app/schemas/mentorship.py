@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -44,6 +44,7 @@ class MentorOut(BaseModel):
     photo_url: Optional[str] = None
     active_mentees: int
     available_slots: int
+    compatibility: Optional[float] = None  # Compatibilidade com quem está listando
 
 
 class QueuePositionOut(BaseModel):
@@ -52,3 +53,49 @@ class QueuePositionOut(BaseModel):
     position: int
     total_in_queue: int
     requested_at: datetime
+
+
+class QueueSnapshotEntry(BaseModel):
+    """Entrada da fila com a posição atual"""
+
+    user_id: int
+    full_name: Optional[str] = None
+    position: int
+    requested_at: Optional[datetime] = None
+
+
+class QueueSnapshotOut(BaseModel):
+    """Fila de espera completa, em ordem (admin)"""
+
+    total_in_queue: int
+    entries: List[QueueSnapshotEntry]
+
+
+class AssignmentOut(BaseModel):
+    """Par mentor-mentorado proposto pela atribuição em lote"""
+
+    mentee_id: int
+    mentor_id: int
+    score: float
+    compatibility: float
+
+
+class AssignmentSummary(BaseModel):
+    """Resumo de uma estratégia de atribuição"""
+
+    matched: int
+    total_score: float
+    average_compatibility: float
+
+
+class BatchAssignmentReport(BaseModel):
+    """Relatório da atribuição ótima da fila (com comparação ao guloso)"""
+
+    dry_run: bool
+    queue_size: int
+    skipped_already_matched: int
+    available_slots: int
+    optimal: AssignmentSummary
+    greedy: AssignmentSummary
+    assignments: List[AssignmentOut]
+    elapsed_ms: float
@@ -47,3 +47,8 @@ class PollOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PollFeedResponse(BaseModel):
+    polls: List[PollOut]
+    next_cursor: Optional[str] = None
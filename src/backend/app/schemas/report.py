@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -42,6 +42,67 @@ class ReportUpdate(BaseModel):
     admin_notes: Optional[str] = Field(None, max_length=1000)
 
 
+class ReportTargetOut(BaseModel):
+    """Schema for an aggregated report target (moderation queue)"""
+
+    target_type: str
+    target_id: int
+    report_count: int
+    pending_count: int
+    reporter_count: int
+    top_category: Optional[str] = None
+    last_reported_at: Optional[datetime] = None
+    hidden_at: Optional[datetime] = None
+    severity: float
+
+
+class BulkReportUpdate(BaseModel):
+    """Schema for updating many reports at once (admin only)"""
+
+    report_ids: List[int] = Field(..., min_length=1, max_length=500)
+    status: str = Field(..., pattern="^(pending|reviewed|approved|rejected)$")
+    admin_notes: Optional[str] = Field(None, max_length=1000)
+
+
+class BulkContentAction(BaseModel):
+    """Schema for hiding, unhiding or deleting many threads/comments (admin only)"""
+
+    target_type: str = Field(..., pattern="^(thread|comment)$")
+    ids: List[int] = Field(..., min_length=1, max_length=500)
+    action: str = Field(..., pattern="^(hide|unhide|delete)$")
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of a bulk action for one id"""
+
+    id: int
+    result: str
+
+
+class BulkActionResponse(BaseModel):
+    """Bulk moderation response with per-item results"""
+
+    status: str
+    processed: int
+    results: List[BulkItemResult]
+
+
+class UserBanRequest(BaseModel):
+    """Schema for banning a user (admin only)"""
+
+    delete_content: bool = False
+
+
+class UserBanResponse(BaseModel):
+    """Ban outcome: affected content and closed reports"""
+
+    status: str
+    user_id: int
+    threads: int
+    comments: int
+    reports_closed: int
+
+
 class ReportResponse(BaseModel):
     """Generic report operation response"""
 
@@ -38,11 +38,24 @@ class StudentCardOut(BaseModel):
         default=None,
         description="Score de compatibilidade baseado em interesses (0-100%)"
     )
+    mutual_friends_count: Optional[int] = Field(
+        default=None,
+        description="Quantidade de amigos em comum com o usuário logado"
+    )
 
     class Config:
         from_attributes = True
 
 
+class StudentAutocompleteOut(BaseModel):
+    """Item do autocomplete de nomes (RF054)"""
+    id: int  # user_id
+    full_name: str
+    nickname: Optional[str] = None
+    university: Optional[str] = None
+    photo_url: Optional[str] = None
+
+
 # === SCHEMAS DE FILTROS ===
 class StudentFilters(BaseModel):
     """Filtros para busca e descoberta de alunos (RF055 - Filtros combinados)"""
@@ -64,7 +77,7 @@ class StudentFilters(BaseModel):
     # Ordenação
     order_by: Optional[str] = Field(
         default="random",
-        description="Ordenação: 'random', 'name', 'compatibility', 'recent'"
+        description="Ordenação: 'random', 'name', 'compatibility', 'recent', 'relevance'"
     )
 
     # Paginação
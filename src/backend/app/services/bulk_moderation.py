@@ -0,0 +1,195 @@
+"""
+Ações de moderação em lote
+RF183-RF189: resolver denúncias, ocultar/excluir conteúdo e banir usuários
+
+Cada operação recebe N ids e roda como SQL set-based (`WHERE id IN (...)`)
+numa transação só, em vez de um request (e um objeto do ORM) por item. O
+retorno diz o que aconteceu com cada id ("updated", "hidden", "deleted",
+"not_found"...). Quem chama faz o commit.
+"""
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, bindparam, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.report import Report, ReportTarget
+from app.models.thread import Comment, CommentVote, Thread, ThreadVote
+from app.models.user import User
+
+CONTENT_MODELS = {"thread": Thread, "comment": Comment}
+
+_NO_SYNC = {"synchronize_session": False}
+
+# Recebe Report ou ReportTarget e devolve o filtro dos alvos
+TargetFilter = Callable[[type], object]
+
+
+def _results(ids: Iterable[int], found: Iterable[int], outcome: str) -> Dict[int, str]:
+    found = set(found)
+    return {item_id: outcome if item_id in found else "not_found" for item_id in dict.fromkeys(ids)}
+
+
+def _targets(target_type: str, ids) -> TargetFilter:
+    """Filtro 'alvo é um destes ids' (lista ou subquery)"""
+    return lambda model: and_(model.target_type == target_type, model.target_id.in_(ids))
+
+
+def _close_reports(db: Session, admin_id: int, *filters: TargetFilter) -> int:
+    """Aprova as denúncias pendentes dos alvos e zera os pendentes no agregado"""
+    closed = db.execute(
+        update(Report)
+        .where(Report.status == "pending", or_(*(f(Report) for f in filters)))
+        .values(status="approved", reviewed_by=admin_id, reviewed_at=datetime.utcnow()),
+        execution_options=_NO_SYNC,
+    ).rowcount
+    db.execute(
+        update(ReportTarget)
+        .where(or_(*(f(ReportTarget) for f in filters)))
+        .values(pending_count=0),
+        execution_options=_NO_SYNC,
+    )
+    return closed
+
+
+def _delete_comments_where(db: Session, condition) -> None:
+    """Exclui comentários (e votos deles) que atendem `condition`, sem carregá-los"""
+    comment_ids = select(Comment.id).where(condition)
+    db.execute(delete(CommentVote).where(CommentVote.comment_id.in_(comment_ids)), execution_options=_NO_SYNC)
+    db.execute(delete(Comment).where(condition), execution_options=_NO_SYNC)
+
+
+def _delete_threads_where(db: Session, condition) -> None:
+    """Exclui threads com comentários e votos, filhos antes dos pais"""
+    thread_ids = select(Thread.id).where(condition)
+    _delete_comments_where(db, Comment.thread_id.in_(thread_ids))
+    db.execute(delete(ThreadVote).where(ThreadVote.thread_id.in_(thread_ids)), execution_options=_NO_SYNC)
+    db.execute(delete(Thread).where(condition), execution_options=_NO_SYNC)
+
+
+class BulkModerationService:
+    """Operações de moderação set-based"""
+
+    @staticmethod
+    def resolve_reports(
+        db: Session,
+        admin_id: int,
+        report_ids: List[int],
+        status: str,
+        admin_notes: Optional[str] = None,
+    ) -> Dict[int, str]:
+        """Muda o status de N denúncias e ajusta os pendentes de cada alvo"""
+        rows = db.execute(
+            select(Report.id, Report.status, Report.target_type, Report.target_id).where(
+                Report.id.in_(report_ids)
+            )
+        ).all()
+        if not rows:
+            return _results(report_ids, [], "updated")
+
+        # Variação de pendentes por alvo
+        deltas: Dict[tuple, int] = {}
+        for row in rows:
+            delta = (status == "pending") - (row.status == "pending")
+            if delta:
+                key = (row.target_type, row.target_id)
+                deltas[key] = deltas.get(key, 0) + delta
+
+        values = {"status": status}
+        if admin_notes:
+            values["admin_notes"] = admin_notes
+        if status in ("reviewed", "approved", "rejected"):
+            values.update(reviewed_by=admin_id, reviewed_at=datetime.utcnow())
+        db.execute(
+            update(Report).where(Report.id.in_([row.id for row in rows])).values(**values),
+            execution_options=_NO_SYNC,
+        )
+
+        if deltas:
+            # Um UPDATE por alvo, enviados juntos (executemany)
+            targets = ReportTarget.__table__
+            db.connection().execute(
+                update(targets)
+                .where(
+                    targets.c.target_type == bindparam("b_type"),
+                    targets.c.target_id == bindparam("b_id"),
+                )
+                .values(pending_count=targets.c.pending_count + bindparam("b_delta")),
+                [
+                    {"b_type": target_type, "b_id": target_id, "b_delta": delta}
+                    for (target_type, target_id), delta in deltas.items()
+                ],
+            )
+
+        return _results(report_ids, [row.id for row in rows], "updated")
+
+    @staticmethod
+    def set_hidden(
+        db: Session, admin_id: int, target_type: str, ids: List[int], hidden: bool
+    ) -> Dict[int, str]:
+        """Oculta (aprovando as denúncias pendentes) ou reexibe N threads/comentários"""
+        model = CONTENT_MODELS[target_type]
+        found = db.execute(
+            update(model).where(model.id.in_(ids)).values(is_hidden=hidden).returning(model.id),
+            execution_options=_NO_SYNC,
+        ).scalars().all()
+        if hidden and found:
+            _close_reports(db, admin_id, _targets(target_type, found))
+        return _results(ids, found, "hidden" if hidden else "unhidden")
+
+    @staticmethod
+    def delete_content(db: Session, admin_id: int, target_type: str, ids: List[int]) -> Dict[int, str]:
+        """Exclui N threads/comentários com os dependentes e aprova as denúncias"""
+        model = CONTENT_MODELS[target_type]
+        found = db.execute(select(model.id).where(model.id.in_(ids))).scalars().all()
+        if not found:
+            return _results(ids, [], "deleted")
+
+        filters = [_targets(target_type, found)]
+        if target_type == "thread":
+            filters.append(_targets("comment", select(Comment.id).where(Comment.thread_id.in_(found))))
+        _close_reports(db, admin_id, *filters)
+
+        if target_type == "thread":
+            _delete_threads_where(db, Thread.id.in_(found))
+        else:
+            _delete_comments_where(db, Comment.id.in_(found))
+        return _results(ids, found, "deleted")
+
+    @staticmethod
+    def ban_user(db: Session, admin_id: int, user_id: int, delete_content: bool = False) -> Optional[Dict[str, int]]:
+        """
+        Desativa o usuário e oculta (ou exclui) todas as threads e comentários
+        dele, aprovando as denúncias pendentes contra ele e o conteúdo
+
+        Returns:
+            contagens por tipo, ou None se o usuário não existe
+        """
+        banned = db.execute(
+            update(User).where(User.id == user_id).values(is_active=False),
+            execution_options=_NO_SYNC,
+        ).rowcount
+        if not banned:
+            return None
+
+        threads = select(Thread.id).where(Thread.user_id == user_id)
+        comments = select(Comment.id).where(Comment.user_id == user_id)
+        thread_count = db.scalar(select(func.count()).select_from(threads.subquery()))
+        comment_count = db.scalar(select(func.count()).select_from(comments.subquery()))
+
+        reports_closed = _close_reports(
+            db,
+            admin_id,
+            _targets("user", [user_id]),
+            _targets("thread", threads),
+            _targets("comment", comments),
+        )
+
+        if delete_content:
+            _delete_comments_where(db, Comment.user_id == user_id)
+            _delete_threads_where(db, Thread.user_id == user_id)
+        else:
+            db.execute(update(Thread).where(Thread.user_id == user_id).values(is_hidden=True), execution_options=_NO_SYNC)
+            db.execute(update(Comment).where(Comment.user_id == user_id).values(is_hidden=True), execution_options=_NO_SYNC)
+
+        return {"threads": thread_count, "comments": comment_count, "reports_closed": reports_closed}
@@ -0,0 +1,201 @@
+"""
+Feeds iCalendar (.ics) de eventos
+RF079-RF096: eventos do usuário e da universidade em apps de calendário
+
+Apps de calendário consultam o feed a cada poucos minutos, então servir
+precisa ser barato:
+
+- a versão do feed sai de uma query agregada (quantidade de eventos e
+  maior `updated_at` dos eventos e dos RSVPs do usuário); ela vira o ETag,
+  e um `If-None-Match` igual responde 304 sem montar nada
+- o corpo fica em cache por (feed, versão); quando a versão muda, só os
+  eventos com `updated_at` novo são renderizados de novo, os demais VEVENTs
+  vêm do cache por (evento, updated_at, status)
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.event import Event, EventParticipant
+
+PRODID = "-//Conecta ISMART//Eventos//PT-BR"
+UID_DOMAIN = "conecta-ismart"
+ACTIVE_RSVP = ("confirmed", "maybe", "waitlisted")
+
+feed_cache = TTLCache(ttl=settings.CALENDAR_FEED_CACHE_TTL_SECONDS, maxsize=1024)
+vevent_cache = TTLCache(ttl=settings.CALENDAR_FEED_CACHE_TTL_SECONDS, maxsize=8192)
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Quebra linhas com mais de 75 octetos (RFC 5545, 3.1)"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # Não corta um caractere UTF-8 ao meio
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74  # Linhas de continuação começam com espaço
+    return "\r\n ".join(parts)
+
+
+def _format_dt(value: datetime) -> str:
+    # Datas são gravadas em UTC sem timezone (datetime.utcnow)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def render_vevent(event: Event, status: str = "CONFIRMED") -> str:
+    """VEVENT do evento; `status` é CONFIRMED, TENTATIVE ou CANCELLED"""
+    stamp = event.updated_at or event.created_at or event.start_datetime
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.id}@{UID_DOMAIN}",
+        f"DTSTAMP:{_format_dt(stamp)}",
+        f"LAST-MODIFIED:{_format_dt(stamp)}",
+        f"DTSTART:{_format_dt(event.start_datetime)}",
+        f"DTEND:{_format_dt(event.end_datetime)}",
+        f"SUMMARY:{_escape(event.title)}",
+        f"STATUS:{status}",
+        f"CATEGORIES:{_escape(event.event_type)}",
+    ]
+    if event.description:
+        lines.append(f"DESCRIPTION:{_escape(event.description)}")
+    if event.location:
+        lines.append(f"LOCATION:{_escape(event.location)}")
+    if event.is_online and event.online_link:
+        lines.append(f"URL:{event.online_link}")
+    lines.append("END:VEVENT")
+    return "\r\n".join(_fold(line) for line in lines)
+
+
+def _cached_vevent(event: Event, status: str) -> str:
+    key = (event.id, event.updated_at, status)
+    return vevent_cache.get_or_set(key, lambda: render_vevent(event, status))
+
+
+def _calendar(name: str, vevents: Iterable[str]) -> str:
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        _fold(f"X-WR-CALNAME:{_escape(name)}"),
+    ]
+    return "\r\n".join([*header, *vevents, "END:VCALENDAR"]) + "\r\n"
+
+
+def _event_status(event: Event, rsvp_status: Optional[str]) -> str:
+    if event.is_cancelled:
+        return "CANCELLED"
+    if rsvp_status in ("maybe", "waitlisted"):
+        return "TENTATIVE"
+    return "CONFIRMED"
+
+
+def _window_start() -> datetime:
+    return datetime.utcnow() - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS)
+
+
+def _user_event_filter(user_id: int):
+    """Eventos criados pelo usuário ou com RSVP ativo dele, na janela do feed"""
+    rsvp = select(EventParticipant.event_id).where(
+        EventParticipant.user_id == user_id,
+        EventParticipant.status.in_(ACTIVE_RSVP),
+    )
+    return (
+        or_(Event.created_by == user_id, Event.id.in_(rsvp)),
+        Event.start_datetime >= _window_start(),
+    )
+
+
+def _university_event_filter(university: str):
+    return Event.university == university, Event.start_datetime >= _window_start()
+
+
+def feed_etag(feed_key: Tuple, version: str) -> str:
+    digest = hashlib.sha1(repr((feed_key, version)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+class CalendarFeedService:
+    """Versão e corpo dos feeds .ics (por usuário e por universidade)"""
+
+    @staticmethod
+    def user_feed_version(db: Session, user_id: int) -> str:
+        """Muda quando um evento do feed é editado ou um RSVP do usuário muda"""
+        last_rsvp = (
+            select(func.max(EventParticipant.updated_at))
+            .where(EventParticipant.user_id == user_id)
+            .scalar_subquery()
+        )
+        count, last_event, last_rsvp = db.execute(
+            select(func.count(Event.id), func.max(Event.updated_at), last_rsvp).where(
+                *_user_event_filter(user_id)
+            )
+        ).one()
+        return f"{count}|{last_event}|{last_rsvp}"
+
+    @staticmethod
+    def university_feed_version(db: Session, university: str) -> str:
+        """Muda quando um evento da universidade é criado ou editado"""
+        count, last_event = db.execute(
+            select(func.count(Event.id), func.max(Event.updated_at)).where(
+                *_university_event_filter(university)
+            )
+        ).one()
+        return f"{count}|{last_event}"
+
+    @staticmethod
+    def build_user_feed(db: Session, user_id: int) -> str:
+        rsvp = (
+            select(EventParticipant.status)
+            .where(
+                EventParticipant.event_id == Event.id,
+                EventParticipant.user_id == user_id,
+            )
+            .scalar_subquery()
+        )
+        rows = db.execute(
+            select(Event, rsvp)
+            .where(*_user_event_filter(user_id))
+            .order_by(Event.start_datetime, Event.id)
+        ).all()
+        vevents = [_cached_vevent(event, _event_status(event, status)) for event, status in rows]
+        return _calendar("Meus eventos - Conecta ISMART", vevents)
+
+    @staticmethod
+    def build_university_feed(db: Session, university: str) -> str:
+        events: List[Event] = (
+            db.execute(
+                select(Event)
+                .where(*_university_event_filter(university))
+                .order_by(Event.start_datetime, Event.id)
+            )
+            .scalars()
+            .all()
+        )
+        vevents = [_cached_vevent(event, _event_status(event, None)) for event in events]
+        return _calendar(f"Eventos {university} - Conecta ISMART", vevents)
+
+    @staticmethod
+    def cached_body(feed_key: Tuple, version: str, build: Callable[[], str]) -> str:
+        """Corpo do feed para a versão, do cache ou montado com `build`"""
+        return feed_cache.get_or_set((feed_key, version), build)
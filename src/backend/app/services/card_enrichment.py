@@ -0,0 +1,130 @@
+"""
+Enriquecimento em lote dos cards do diretório de alunos
+RF047/RF053: cards com top interesses, status de amizade e compatibilidade
+
+Em vez de três ou quatro queries por card, uma página de N cards custa
+no máximo três queries, qualquer que seja N:
+
+1. Top interesses de todos os cards, com `ROW_NUMBER() OVER (PARTITION BY
+   dono ORDER BY interest_id)` filtrado em `<= k`
+2. Status de amizade da página inteira (depende do schema, ver `statuses`)
+3. Compatibilidade (Jaccard) calculada no banco: por card, total de
+   interesses e quantos estão entre os do usuário logado
+
+O schema local (`user_interests`) e o do Supabase (`profile_interests`)
+diferem só nas colunas, então os dois `StudentDirectoryService` usam o
+mesmo `CardEnricher` configurado com as suas.
+"""
+from dataclasses import dataclass, field
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# (db, viewer_id, card_ids) -> {card_id: status no vocabulário do diretório}
+StatusLoader = Callable[[Session, Any, List[Any]], Dict[Any, str]]
+
+TOP_INTERESTS = 3  # Interesses exibidos em cada card
+
+
+@dataclass
+class CardExtras:
+    """Dados de um card que não vêm da linha do perfil"""
+
+    interests: List[str] = field(default_factory=list)
+    friendship_status: str = "not_connected"
+    compatibility_score: Optional[float] = None
+
+
+class CardEnricher:
+    """
+    Carrega os extras de uma página de cards em queries set-based
+
+    - link_owner / link_interest: colunas da tabela de associação
+      dono <-> interesse
+    - interest_id / interest_name: colunas da tabela de interesses
+    - statuses: função que resolve o status de amizade da página
+    """
+
+    def __init__(self, link_owner, link_interest, interest_id, interest_name, statuses: StatusLoader):
+        self.link_owner = link_owner
+        self.link_interest = link_interest
+        self.interest_id = interest_id
+        self.interest_name = interest_name
+        self.statuses = statuses
+
+    def top_interests(self, db: Session, owner_ids: List[Any], k: int = TOP_INTERESTS) -> Dict[Any, List[str]]:
+        """{dono: até k nomes de interesses}, em uma query com ROW_NUMBER"""
+        if not owner_ids:
+            return {}
+        ranked = (
+            select(
+                self.link_owner.label("owner_id"),
+                self.interest_name.label("name"),
+                func.row_number()
+                .over(partition_by=self.link_owner, order_by=self.link_interest)
+                .label("rank"),
+            )
+            .where(self.interest_id == self.link_interest, self.link_owner.in_(owner_ids))
+            .subquery()
+        )
+        rows = db.execute(
+            select(ranked.c.owner_id, ranked.c.name)
+            .where(ranked.c.rank <= k)
+            .order_by(ranked.c.owner_id, ranked.c.rank)
+        ).all()
+
+        result: Dict[Any, List[str]] = {}
+        for owner_id, name in rows:
+            result.setdefault(owner_id, []).append(name)
+        return result
+
+    def compatibility_scores(self, db: Session, viewer_id: Any, owner_ids: List[Any]) -> Dict[Any, float]:
+        """
+        {dono: Jaccard * 100 com os interesses do usuário}, em uma query
+
+        |A ∩ B| sai de um LEFT JOIN com os interesses do usuário, e
+        |A ∪ B| = |A| + |B| - |A ∩ B|. Cards sem interesses ficam com 0.
+        """
+        if not owner_ids:
+            return {}
+        mine = select(self.link_interest.label("interest_id")).where(self.link_owner == viewer_id).subquery()
+        mine_total = select(func.count()).select_from(mine).scalar_subquery()
+        rows = db.execute(
+            select(
+                self.link_owner,
+                func.count(),
+                func.count(mine.c.interest_id),
+                mine_total,
+            )
+            .outerjoin(mine, mine.c.interest_id == self.link_interest)
+            .where(self.link_owner.in_(owner_ids))
+            .group_by(self.link_owner)
+        ).all()
+
+        scores = {owner_id: 0.0 for owner_id in owner_ids}
+        for owner_id, total, common, viewer_total in rows:
+            union = total + viewer_total - common
+            if viewer_total and union:
+                scores[owner_id] = round((common / union) * 100, 1)
+        return scores
+
+    def enrich(
+        self,
+        db: Session,
+        viewer_id: Any,
+        owner_ids: Iterable[Any],
+        with_compatibility: bool = False,
+    ) -> Dict[Any, CardExtras]:
+        """Extras de todos os cards da página: 2 queries, ou 3 com compatibilidade"""
+        owner_ids = list(owner_ids)
+        interests = self.top_interests(db, owner_ids)
+        statuses = self.statuses(db, viewer_id, owner_ids)
+        scores = self.compatibility_scores(db, viewer_id, owner_ids) if with_compatibility else {}
+        return {
+            owner_id: CardExtras(
+                interests=interests.get(owner_id, []),
+                friendship_status=statuses.get(owner_id, "not_connected"),
+                compatibility_score=scores.get(owner_id),
+            )
+            for owner_id in owner_ids
+        }
@@ -0,0 +1,207 @@
+"""
+Agendamento e entrega dos lembretes de evento
+RF169-RF182: lembretes 24h e 1h antes do evento
+
+Os lembretes são gravados em `scheduled_notifications` quando o evento é
+editado/cancelado ou um RSVP muda, já com o horário (`due_at`) e o texto.
+O worker (`dispatch_due`, ou `python -m app.services.event_reminders`)
+trava as linhas vencidas com `FOR UPDATE SKIP LOCKED`, cria as notificações
+em um INSERT só e marca `sent_at` na mesma transação. Vários workers podem
+rodar juntos: cada linha é entregue por exatamente um deles.
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.event import Event, EventParticipant
+from app.models.notification import Notification, NotificationPreference, ScheduledNotification
+from app.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+REMINDER_HOURS = (24, 1)  # Antecedência dos lembretes
+REMINDER_GRACE = timedelta(minutes=30)  # Atraso tolerado antes de descartar
+DISPATCH_BATCH = 500  # Linhas travadas por transação do worker
+
+
+class EventReminderService:
+    """Mantém e entrega os lembretes agendados de eventos"""
+
+    @staticmethod
+    def _clear_pending(db: Session, event_id: int, user_id: Optional[int] = None) -> None:
+        """Remove lembretes ainda não enviados do evento (ou de um participante)"""
+        query = delete(ScheduledNotification).where(
+            ScheduledNotification.reference_type == "event",
+            ScheduledNotification.reference_id == event_id,
+            ScheduledNotification.sent_at.is_(None),
+        )
+        if user_id is not None:
+            query = query.where(ScheduledNotification.user_id == user_id)
+        db.execute(query, execution_options={"synchronize_session": False})
+
+    @staticmethod
+    def _schedule(db: Session, event: Event, user_ids: Iterable[int], now: datetime) -> int:
+        """Grava os lembretes futuros dos usuários, pulando os já enviados"""
+        user_ids = list(user_ids)
+        if not user_ids or event.is_cancelled or event.start_datetime <= now:
+            return 0
+
+        sent = set(
+            db.query(ScheduledNotification.user_id, ScheduledNotification.notification_type)
+            .filter(
+                ScheduledNotification.reference_type == "event",
+                ScheduledNotification.reference_id == event.id,
+                ScheduledNotification.user_id.in_(user_ids),
+                ScheduledNotification.sent_at.isnot(None),
+            )
+            .all()
+        )
+
+        rows = []
+        for hours in REMINDER_HOURS:
+            due_at = event.start_datetime - timedelta(hours=hours)
+            if due_at + REMINDER_GRACE < now:
+                continue  # RSVP tardio: esse lembrete já não faz sentido
+            fields = NotificationService.event_reminder_fields(event.id, event.title, hours)
+            rows.extend(
+                {**fields, "user_id": user_id, "due_at": due_at}
+                for user_id in user_ids
+                if (user_id, fields["notification_type"]) not in sent
+            )
+
+        if rows:
+            db.execute(insert(ScheduledNotification), rows)
+        return len(rows)
+
+    @staticmethod
+    def schedule_event(db: Session, event: Event) -> int:
+        """
+        Reagenda os lembretes de todos os confirmados (evento criado/editado/
+        cancelado). Não faz commit.
+        """
+        now = datetime.utcnow()
+        EventReminderService._clear_pending(db, event.id)
+        user_ids = [
+            user_id
+            for (user_id,) in db.query(EventParticipant.user_id).filter(
+                EventParticipant.event_id == event.id,
+                EventParticipant.status == "confirmed",
+            )
+        ]
+        return EventReminderService._schedule(db, event, user_ids, now)
+
+    @staticmethod
+    def schedule_participants(db: Session, event: Event, user_ids: List[int], confirmed: bool) -> int:
+        """
+        Atualiza os lembretes de participantes após RSVP: só quem está
+        confirmado recebe. Não faz commit.
+        """
+        for user_id in user_ids:
+            EventReminderService._clear_pending(db, event.id, user_id)
+        if not confirmed:
+            return 0
+        return EventReminderService._schedule(db, event, user_ids, datetime.utcnow())
+
+    @staticmethod
+    def dispatch_due(db: Session, now: Optional[datetime] = None, batch_size: int = DISPATCH_BATCH) -> int:
+        """
+        Entrega os lembretes vencidos, em lotes de `batch_size`
+
+        Cada lote é uma transação: trava as linhas (pulando as que outro
+        worker já pegou), insere as notificações de quem não desativou
+        lembretes e marca `sent_at`. Lembretes atrasados mais que
+        REMINDER_GRACE são marcados sem entregar.
+
+        Returns:
+            número de notificações criadas
+        """
+        now = now or datetime.utcnow()
+        delivered = 0
+
+        while True:
+            due = (
+                db.query(ScheduledNotification)
+                .filter(
+                    ScheduledNotification.sent_at.is_(None),
+                    ScheduledNotification.due_at <= now,
+                )
+                .order_by(ScheduledNotification.due_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not due:
+                break
+
+            muted = {
+                user_id
+                for (user_id,) in db.query(NotificationPreference.user_id).filter(
+                    NotificationPreference.user_id.in_({row.user_id for row in due}),
+                    NotificationPreference.event_reminder == False,
+                )
+            }
+            notifications = [
+                {
+                    "user_id": row.user_id,
+                    "notification_type": row.notification_type,
+                    "title": row.title,
+                    "content": row.content,
+                    "link": row.link,
+                    "reference_id": row.reference_id,
+                    "reference_type": row.reference_type,
+                    "is_read": False,
+                }
+                for row in due
+                if row.user_id not in muted and row.due_at + REMINDER_GRACE >= now
+            ]
+            if notifications:
+                db.execute(insert(Notification), notifications)
+
+            db.execute(
+                update(ScheduledNotification)
+                .where(ScheduledNotification.id.in_([row.id for row in due]))
+                .values(sent_at=now),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+            delivered += len(notifications)
+
+            if len(due) < batch_size:
+                break
+
+        if delivered:
+            logger.info("Delivered %s scheduled event reminders", delivered)
+
+        return delivered
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Entrega os lembretes de evento vencidos")
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=0,
+        help="Segundos entre execuções; 0 roda uma vez (cron)",
+    )
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    while True:
+        db = SessionLocal()
+        try:
+            EventReminderService.dispatch_due(db)
+        finally:
+            db.close()
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,17 @@ Serviço de Eventos
 RF079-RF096: Gerenciamento completo de eventos
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, case, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
 import logging
-from typing import Optional, List, Dict
-from datetime import datetime, timedelta
+from typing import Iterable, Optional, List, Dict, Tuple
+from datetime import datetime
 
+from app.core.pagination import decode_cursor, encode_cursor
 from app.models.event import Event, EventParticipant
-from app.services.notification_service import NotificationService
+from app.models.profile import Profile
+from app.services.event_reminders import EventReminderService
 from app.services.gamification import GamificationService
 
 logger = logging.getLogger(__name__)
@@ -56,19 +60,8 @@ class EventService:
         if existing and existing.status != "declined":
             return False, "Você já está participando deste evento"
 
-        # Verificar limite de participantes
-        if event.max_participants:
-            confirmed_count = (
-                db.query(EventParticipant)
-                .filter(
-                    EventParticipant.event_id == event_id,
-                    EventParticipant.status == "confirmed",
-                )
-                .count()
-            )
-
-            if confirmed_count >= event.max_participants:
-                return False, "Evento lotado"
+        # O limite de participantes não bloqueia: quem confirma em evento
+        # lotado entra na fila de espera (ver `rsvp_event`)
 
         # Verificar se o evento já passou
         if event.start_datetime < datetime.utcnow():
@@ -86,6 +79,12 @@ class EventService:
         """
         RSVP para um evento
 
+        Confirmar ocupa uma vaga via `_reserve_seat`; sem vaga, o participante
+        fica como 'waitlisted'. Quem deixa de estar confirmado libera a vaga
+        e a fila de espera é promovida na mesma transação. A troca de status
+        é condicional ao status lido, então envios repetidos simultâneos não
+        reservam/liberam a mesma vaga duas vezes.
+
         Args:
             status: 'confirmed', 'maybe', 'declined'
         """
@@ -111,29 +110,164 @@ class EventService:
             elif status != "declined":
                 raise ValueError(reason)
 
-        if existing:
-            # Atualizar status
-            existing.status = status
-            existing.updated_at = datetime.utcnow()
-            db.commit()
+        now = datetime.utcnow()
+        while True:
+            previous = existing.status if existing else None
+            new_status = status
+            reserved = False
+            if status == "confirmed" and previous != "confirmed":
+                reserved = EventService._reserve_seat(db, event_id)
+                if not reserved:
+                    new_status = "waitlisted"
+
+            if existing is None:
+                # Criar novo registro (PK evento+usuário barra o duplo envio)
+                participant = EventParticipant(
+                    event_id=event_id,
+                    user_id=user_id,
+                    status=new_status,
+                    waitlisted_at=now if new_status == "waitlisted" else None,
+                )
+                db.add(participant)
+                try:
+                    db.flush()
+                except IntegrityError:
+                    # Outro request criou o registro: desfaz (inclusive a vaga)
+                    # e refaz a partir do status gravado
+                    db.rollback()
+                    return EventService.rsvp_event(db, event_id, user_id, status)
+                break
+
+            # Atualizar status só se ninguém mudou desde a leitura; assim a
+            # vaga é reservada/liberada uma vez por transição
+            values = {"status": new_status, "updated_at": now}
+            if new_status != "waitlisted":
+                values["waitlisted_at"] = None
+            elif previous != "waitlisted":
+                values["waitlisted_at"] = now  # Quem já estava na fila mantém a posição
+            changed = (
+                db.query(EventParticipant)
+                .filter(
+                    EventParticipant.event_id == event_id,
+                    EventParticipant.user_id == user_id,
+                    EventParticipant.status == previous,
+                )
+                .update(values, synchronize_session="fetch")
+            )
+            if changed:
+                participant = existing
+                break
+            # Outro request mudou o status antes: devolve a vaga e recomeça
+            if reserved:
+                EventService._release_seat(db, event_id)
             db.refresh(existing)
-            return existing
 
-        # Criar novo registro
-        participant = EventParticipant(
-            event_id=event_id,
-            user_id=user_id,
-            status=status,
-        )
+        if new_status != previous:
+            EventReminderService.schedule_participants(
+                db, db.get(Event, event_id), [user_id], new_status == "confirmed"
+            )
+
+        if previous == "confirmed" and new_status != "confirmed":
+            EventService._release_seat(db, event_id)
+            db.flush()
+            EventService.promote_waitlist(db, event_id)
 
-        db.add(participant)
         db.commit()
         db.refresh(participant)
 
-        logger.info(f"User {user_id} RSVP'd to event {event_id} with status {status}")
+        logger.info("User %s RSVP'd to event %s with status %s", user_id, event_id, new_status)
 
         return participant
 
+    @staticmethod
+    def _reserve_seat(db: Session, event_id: int) -> bool:
+        """
+        Ocupa uma vaga do evento, se houver; True se conseguiu
+
+        `UPDATE events SET confirmed_count = confirmed_count + 1 WHERE ...
+        confirmed_count < max_participants RETURNING`: a condição é avaliada
+        com a linha travada, então RSVPs simultâneos nunca passam do limite
+        e não há COUNT por tentativa.
+        """
+        seat = db.execute(
+            update(Event)
+            .where(
+                Event.id == event_id,
+                or_(
+                    Event.max_participants.is_(None),
+                    Event.confirmed_count < Event.max_participants,
+                ),
+            )
+            # Mudança de lotação não é edição do evento (feeds .ics usam updated_at)
+            .values(confirmed_count=Event.confirmed_count + 1, updated_at=Event.updated_at)
+            .returning(Event.confirmed_count)
+            .execution_options(synchronize_session="fetch")
+        ).first()
+        return seat is not None
+
+    @staticmethod
+    def _release_seat(db: Session, event_id: int) -> None:
+        """Devolve uma vaga do evento"""
+        db.execute(
+            update(Event)
+            .where(Event.id == event_id, Event.confirmed_count > 0)
+            .values(confirmed_count=Event.confirmed_count - 1, updated_at=Event.updated_at)
+            .execution_options(synchronize_session="fetch")
+        )
+
+    @staticmethod
+    def promote_waitlist(db: Session, event_id: int) -> List[int]:
+        """
+        Confirma a fila de espera, em ordem de chegada, enquanto houver vagas
+
+        A vaga é reservada antes e o status só muda se o participante ainda
+        estiver 'waitlisted'; se outra transação já o tirou da fila, a vaga
+        é devolvida e a promoção segue para o próximo. Não faz commit.
+
+        Returns:
+            ids dos usuários promovidos
+        """
+        promoted = []
+        while True:
+            next_in_line = (
+                db.query(EventParticipant.user_id)
+                .filter(
+                    EventParticipant.event_id == event_id,
+                    EventParticipant.status == "waitlisted",
+                )
+                .order_by(EventParticipant.waitlisted_at, EventParticipant.user_id)
+                .first()
+            )
+            if next_in_line is None or not EventService._reserve_seat(db, event_id):
+                break
+
+            changed = (
+                db.query(EventParticipant)
+                .filter(
+                    EventParticipant.event_id == event_id,
+                    EventParticipant.user_id == next_in_line.user_id,
+                    EventParticipant.status == "waitlisted",
+                )
+                .update(
+                    {
+                        "status": "confirmed",
+                        "waitlisted_at": None,
+                        "updated_at": datetime.utcnow(),
+                    },
+                    synchronize_session="fetch",
+                )
+            )
+            if changed:
+                promoted.append(next_in_line.user_id)
+            else:
+                EventService._release_seat(db, event_id)
+
+        if promoted:
+            EventReminderService.schedule_participants(db, db.get(Event, event_id), promoted, True)
+            logger.info("Promoted %s users from waitlist of event %s", len(promoted), event_id)
+
+        return promoted
+
     @staticmethod
     def mark_attendance(
         db: Session, event_id: int, user_id: int, creator_id: int
@@ -180,97 +314,147 @@ class EventService:
             description=f"Participação no evento: {event.title}",
         )
 
-        logger.info(f"User {user_id} attendance marked for event {event_id}")
+        logger.info("User %s attendance marked for event %s", user_id, event_id)
 
         return True
 
     @staticmethod
-    def send_event_reminders(db: Session, hours_before: int = 24):
+    def send_event_reminders(db: Session) -> int:
         """
-        Envia lembretes de eventos que começam em X horas
+        Entrega os lembretes de evento vencidos
 
-        Args:
-            hours_before: 24 para lembrete de 24h, 1 para lembrete de 1h
+        Os lembretes são agendados ao editar o evento e a cada RSVP; ver
+        `EventReminderService`. Pode rodar de vários workers/cron ao mesmo
+        tempo sem duplicar.
         """
-        # Calcular janela de tempo
-        now = datetime.utcnow()
-        target_time_start = now + timedelta(hours=hours_before - 0.5)
-        target_time_end = now + timedelta(hours=hours_before + 0.5)
-
-        # Buscar eventos nessa janela
-        events = (
-            db.query(Event)
-            .filter(
-                Event.start_datetime >= target_time_start,
-                Event.start_datetime <= target_time_end,
-                Event.is_cancelled == False,
-            )
-            .all()
-        )
+        return EventReminderService.dispatch_due(db)
 
-        reminder_count = 0
+    @staticmethod
+    def get_events_stats(
+        db: Session, event_ids: Iterable[int], viewer_id: Optional[int] = None
+    ) -> Dict[int, Dict]:
+        """
+        Estatísticas de vários eventos + RSVP do usuário, em uma query
 
-        for event in events:
-            # Buscar participantes confirmados
-            participants = (
-                db.query(EventParticipant)
-                .filter(
-                    EventParticipant.event_id == event.id,
-                    EventParticipant.status == "confirmed",
-                )
-                .all()
-            )
+        Um único GROUP BY event_id em `event_participants` conta cada status,
+        as presenças e o total, e pega o status do `viewer_id` (se houver).
+        Eventos sem participantes voltam com tudo zerado.
+        """
+        event_ids = list(event_ids)
+        result = {
+            event_id: {
+                "confirmed": 0,
+                "maybe": 0,
+                "declined": 0,
+                "waitlisted": 0,
+                "attended": 0,
+                "total_rsvp": 0,
+                "viewer_status": None,
+            }
+            for event_id in event_ids
+        }
+        if not event_ids:
+            return result
 
-            for participant in participants:
-                NotificationService.notify_event_reminder(
-                    db=db,
-                    user_id=participant.user_id,
-                    event_id=event.id,
-                    event_title=event.title,
-                    hours_before=hours_before,
-                )
-                reminder_count += 1
+        def count_status(status: str):
+            return func.count(case((EventParticipant.status == status, 1)))
 
-        logger.info(
-            f"Sent {reminder_count} event reminders ({hours_before}h before)"
+        rows = (
+            db.query(
+                EventParticipant.event_id,
+                count_status("confirmed"),
+                count_status("maybe"),
+                count_status("declined"),
+                count_status("waitlisted"),
+                func.count(case((EventParticipant.attended == True, 1))),
+                func.count(),
+                func.max(case((EventParticipant.user_id == viewer_id, EventParticipant.status))),
+            )
+            .filter(EventParticipant.event_id.in_(event_ids))
+            .group_by(EventParticipant.event_id)
+            .all()
         )
 
-        return reminder_count
+        for event_id, confirmed, maybe, declined, waitlisted, attended, total, viewer_status in rows:
+            result[event_id] = {
+                "confirmed": confirmed,
+                "maybe": maybe,
+                "declined": declined,
+                "waitlisted": waitlisted,
+                "attended": attended,
+                "total_rsvp": total,
+                "viewer_status": viewer_status,
+            }
+        return result
 
     @staticmethod
-    def get_event_stats(db: Session, event_id: int) -> Dict:
+    def participants_query(
+        event_id: int, status: Optional[str] = None, university: Optional[str] = None
+    ):
         """
-        Retorna estatísticas de um evento
+        SELECT dos participantes do evento com o perfil (LEFT JOIN), em ordem
+        de inscrição. Base da listagem paginada e da exportação.
         """
-        # Contar participantes por status
-        stats = (
-            db.query(
-                EventParticipant.status, func.count(EventParticipant.user_id)
+        query = (
+            select(
+                EventParticipant.user_id,
+                Profile.full_name,
+                Profile.photo_url,
+                Profile.university,
+                EventParticipant.status,
+                EventParticipant.attended,
+                EventParticipant.joined_at,
             )
-            .filter(EventParticipant.event_id == event_id)
-            .group_by(EventParticipant.status)
-            .all()
+            .outerjoin(Profile, Profile.user_id == EventParticipant.user_id)
+            .where(EventParticipant.event_id == event_id)
         )
+        if status:
+            query = query.where(EventParticipant.status == status)
+        if university:
+            query = query.where(Profile.university == university)
+        return query.order_by(EventParticipant.joined_at, EventParticipant.user_id)
 
-        status_counts = {status: count for status, count in stats}
+    @staticmethod
+    def list_participants(
+        db: Session,
+        event_id: int,
+        status: Optional[str] = None,
+        university: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Uma página de participantes (com perfil) em uma query
 
-        # Contar presenças marcadas
-        attended_count = (
-            db.query(EventParticipant)
-            .filter(
-                EventParticipant.event_id == event_id,
-                EventParticipant.attended == True,
+        Paginação por cursor sobre (joined_at, user_id); ValueError se o
+        cursor for inválido. Retorna as linhas e o cursor da próxima página
+        (None na última).
+        """
+        query = EventService.participants_query(event_id, status, university)
+        if cursor:
+            joined_at, user_id = decode_cursor(cursor)
+            query = query.where(
+                or_(
+                    EventParticipant.joined_at > joined_at,
+                    and_(EventParticipant.joined_at == joined_at, EventParticipant.user_id > user_id),
+                )
             )
-            .count()
-        )
 
-        return {
-            "confirmed": status_counts.get("confirmed", 0),
-            "maybe": status_counts.get("maybe", 0),
-            "declined": status_counts.get("declined", 0),
-            "attended": attended_count,
-            "total_rsvp": sum(status_counts.values()),
-        }
+        rows = db.execute(query.limit(limit + 1)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].joined_at, rows[-1].user_id)
+        return rows, next_cursor
+
+    @staticmethod
+    def get_event_stats(db: Session, event_id: int) -> Dict:
+        """
+        Retorna estatísticas de um evento
+        """
+        stats = EventService.get_events_stats(db, [event_id])[event_id]
+        stats.pop("viewer_status")
+        return stats
 
     @staticmethod
     def get_upcoming_events(
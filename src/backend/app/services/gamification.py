@@ -112,7 +112,7 @@ class GamificationService:
         """
         # Verificar se o tipo de ação é válido
         if action_type not in GamificationService.POINTS:
-            logger.warning(f"Invalid action type: {action_type}")
+            logger.warning("Invalid action type: %s", action_type)
             return {
                 "points_awarded": 0,
                 "total_points": 0,
@@ -155,8 +155,13 @@ class GamificationService:
 
         if level_up:
             logger.info(
-                f"User {user_id} leveled up! {old_level} → {new_level} "
-                f"({old_points} → {stats.points} points)"
+                "User %s leveled up! %s → %s "
+                "(%s → %s points)",
+                user_id,
+                old_level,
+                new_level,
+                old_points,
+                stats.points,
             )
 
         return {
@@ -341,5 +346,5 @@ class GamificationService:
             description="Bônus por completar 100% do perfil",
         )
 
-        logger.info(f"User {user_id} completed profile and received bonus!")
+        logger.info("User %s completed profile and received bonus!", user_id)
         return True
@@ -0,0 +1,224 @@
+"""
+Read model de disponibilidade de mentores
+RF068-RF072: Listagem de mentores disponíveis e estatísticas de mentoria
+
+A tabela `mentor_availability` guarda, para cada perfil com semestre
+suficiente, quantas mentorias ativas ele tem. Ela é recalculada por usuário
+num listener `after_flush` da sessão sempre que uma mentoria é criada,
+finalizada ou removida, ou quando o semestre de um perfil muda. Assim:
+
+- /available-mentors pagina direto sobre o read model, ordenando por
+  compatibilidade com quem está vendo (Jaccard calculado no banco)
+- /stats sai de uma query só, com cache em memória (TTL curto), já que é
+  público
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, event, func, insert, inspect, literal, select
+from sqlalchemy.engine import Connection
+import logging
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.mentorship import MentorAvailability, Mentorship, MentorshipQueue
+from app.models.profile import Profile
+from app.models.social import UserInterest
+from app.services.mentor_matching import UNIVERSITY_BONUS, _chunks
+from app.services.mentorship_service import MentorshipService, queue_cache
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = "mentorship_stats"
+
+stats_cache = TTLCache(ttl=settings.STATS_CACHE_TTL_SECONDS, maxsize=16)
+
+
+def _availability_select(user_ids: Optional[List[int]] = None):
+    """SELECT (user_id, active_mentees) dos perfis elegíveis por semestre"""
+    active = select(Mentorship.mentor_id, func.count(Mentorship.id).label("active")).where(
+        Mentorship.status == "active"
+    )
+    query = select(Profile.user_id).where(
+        Profile.semester_number >= MentorshipService.MIN_SEMESTER_FOR_MENTOR
+    )
+    if user_ids is not None:
+        active = active.where(Mentorship.mentor_id.in_(user_ids))
+        query = query.where(Profile.user_id.in_(user_ids))
+
+    active = active.group_by(Mentorship.mentor_id).subquery()
+    return query.add_columns(func.coalesce(active.c.active, 0)).outerjoin(
+        active, active.c.mentor_id == Profile.user_id
+    )
+
+
+class MentorAvailabilityService:
+    """Manutenção e leitura do read model de mentores"""
+
+    @staticmethod
+    def refresh(conn: Connection, user_ids: Iterable[int]) -> None:
+        """Recalcula as linhas dos usuários informados (na transação corrente)"""
+        for chunk in _chunks(sorted(set(user_ids))):
+            conn.execute(delete(MentorAvailability).where(MentorAvailability.user_id.in_(chunk)))
+            conn.execute(
+                insert(MentorAvailability).from_select(
+                    ["user_id", "active_mentees"], _availability_select(chunk)
+                )
+            )
+
+    @staticmethod
+    def rebuild(conn: Connection) -> int:
+        """Reconstrói o read model inteiro a partir de perfis e mentorias"""
+        conn.execute(delete(MentorAvailability))
+        conn.execute(
+            insert(MentorAvailability).from_select(
+                ["user_id", "active_mentees"], _availability_select()
+            )
+        )
+        stats_cache.invalidate()
+        return conn.execute(select(func.count()).select_from(MentorAvailability)).scalar()
+
+    @staticmethod
+    def list_available(
+        db: Session, viewer_id: int, skip: int = 0, limit: int = 20
+    ) -> List[Tuple[Profile, int, float]]:
+        """
+        Mentores com vaga, do mais para o menos compatível com o usuário
+
+        Usa o mesmo critério do matching: Jaccard dos interesses + bônus
+        para a mesma universidade; empates por user_id.
+
+        Returns:
+            Lista de (profile, active_mentees, compatibility)
+        """
+        max_mentees = MentorshipService.MAX_MENTEES_PER_MENTOR
+        viewer_interests = [
+            interest_id
+            for (interest_id,) in db.query(UserInterest.interest_id).filter(
+                UserInterest.user_id == viewer_id
+            )
+        ]
+        viewer_university = (
+            db.query(Profile.university).filter(Profile.user_id == viewer_id).scalar()
+        )
+
+        query = (
+            db.query(Profile, MentorAvailability.active_mentees)
+            .join(MentorAvailability, MentorAvailability.user_id == Profile.user_id)
+            .filter(
+                MentorAvailability.active_mentees < max_mentees,
+                Profile.user_id != viewer_id,
+            )
+        )
+
+        if viewer_interests:
+            n = len(viewer_interests)
+            totals = (
+                select(UserInterest.user_id, func.count().label("total"))
+                .join(MentorAvailability, MentorAvailability.user_id == UserInterest.user_id)
+                .where(MentorAvailability.active_mentees < max_mentees)
+                .group_by(UserInterest.user_id)
+                .subquery()
+            )
+            shared = (
+                select(UserInterest.user_id, func.count().label("shared"))
+                .where(UserInterest.interest_id.in_(viewer_interests))
+                .group_by(UserInterest.user_id)
+                .subquery()
+            )
+            common = func.coalesce(shared.c.shared, 0)
+            compatibility = case(
+                (totals.c.total > 0, func.round(common * 100.0 / (totals.c.total + n - common), 2)),
+                else_=0.0,
+            )
+            query = (
+                query.outerjoin(totals, totals.c.user_id == Profile.user_id)
+                .outerjoin(shared, shared.c.user_id == Profile.user_id)
+            )
+        else:
+            compatibility = literal(0.0)
+
+        bonus = case(
+            (Profile.university.is_not_distinct_from(viewer_university), UNIVERSITY_BONUS),
+            else_=0,
+        )
+
+        rows = (
+            query.add_columns(compatibility.label("compatibility"))
+            .order_by((compatibility + bonus).desc(), Profile.user_id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return [(profile, active, float(compat or 0)) for profile, active, compat in rows]
+
+    @staticmethod
+    def get_stats(db: Session) -> Dict[str, int]:
+        """Mentorias ativas, tamanho da fila e mentores com vaga (cacheado)"""
+
+        def compute() -> Dict[str, int]:
+            row = db.query(
+                select(func.count(Mentorship.id))
+                .where(Mentorship.status == "active")
+                .scalar_subquery(),
+                select(func.count()).select_from(MentorshipQueue).scalar_subquery(),
+                select(func.count())
+                .select_from(MentorAvailability)
+                .where(MentorAvailability.active_mentees < MentorshipService.MAX_MENTEES_PER_MENTOR)
+                .scalar_subquery(),
+            ).one()
+            return {
+                "active_mentorships": row[0],
+                "in_queue": row[1],
+                "available_mentors": row[2],
+            }
+
+        return stats_cache.get_or_set(STATS_CACHE_KEY, compute)
+
+
+# === Listeners da sessão ===
+def _affected_mentors(session: Session) -> Tuple[Set[int], bool]:
+    """Usuários cujo read model mudou no flush + se as estatísticas mudaram"""
+    user_ids: Set[int] = set()
+    touched = False
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Mentorship):
+            state = inspect(obj)
+            history = state.attrs.mentor_id.history
+            if obj in session.dirty and not (history.has_changes() or state.attrs.status.history.has_changes()):
+                continue
+            user_ids.update(i for i in chain([obj.mentor_id], history.deleted or ()) if i is not None)
+            touched = True
+        elif isinstance(obj, Profile):
+            if obj in session.dirty and not inspect(obj).attrs.semester_number.history.has_changes():
+                continue
+            if obj.user_id is not None:
+                user_ids.add(obj.user_id)
+            touched = True
+        elif isinstance(obj, MentorshipQueue):
+            touched = True
+    return user_ids, touched
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    user_ids, touched = _affected_mentors(session)
+    if user_ids:
+        MentorAvailabilityService.refresh(session.connection(), user_ids)
+    if touched:
+        stats_cache.invalidate()
+        queue_cache.invalidate()
+
+
+def _after_bulk(context) -> None:
+    # query.delete()/update() não passam pelo flush (ex.: remoção da fila)
+    if context.mapper.class_ in (Mentorship, MentorshipQueue, Profile):
+        stats_cache.invalidate()
+        queue_cache.invalidate()
+
+
+def install_availability_listeners() -> None:
+    """Registra a manutenção do read model em todas as sessões (idempotente)"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_bulk_delete", _after_bulk)
+        event.listen(Session, "after_bulk_update", _after_bulk)
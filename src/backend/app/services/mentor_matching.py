@@ -0,0 +1,669 @@
+"""
+Motor de matching de mentoria
+RF068-RF072: Seleção do melhor mentor em uma única passada
+
+Em vez de consultar perfil, contagem de mentorados e interesses de cada
+candidato separadamente, o motor carrega um snapshot dos mentores elegíveis
+com poucas queries:
+
+1. Perfis elegíveis + contagem de mentorados ativos, filtrados no banco
+   (`Profile.semester_number` indexado, LEFT JOIN com GROUP BY)
+2. Interesses de todos os envolvidos, convertidos em bitsets (int do Python)
+
+A compatibilidade (Jaccard) vira `popcount(a & b) / popcount(a | b)`, então
+pontuar a fila inteira contra todos os mentores acontece em memória.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+import logging
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.models.mentorship import Mentorship, MentorshipQueue
+from app.models.profile import Profile
+from app.models.social import UserInterest
+from app.services.notification_service import NotificationService
+
+try:
+    import numpy as np
+    from scipy.optimize import linear_sum_assignment
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+    linear_sum_assignment = csr_matrix = min_weight_full_bipartite_matching = None
+
+logger = logging.getLogger(__name__)
+
+UNIVERSITY_BONUS = 10  # Bônus de score para mentor da mesma universidade
+_IN_CHUNK = 5000  # Tamanho máximo das listas em cláusulas IN
+_SCORE_BLOCK = 512  # Mentorados pontuados por vez (limita a matriz em memória)
+# Bônus de ordem na fila por mentorado (de _FIFO_BONUS para o 1º até
+# _FIFO_BONUS / n para o último). Cada um fica abaixo do passo mínimo do
+# score (0.01), então só desempata escolhas de score igual; a soma sobre a
+# fila cresce com n e não é limitada.
+_FIFO_BONUS = 0.005
+
+
+def active_mentees_subquery():
+    """Subquery (mentor_id, active) com a contagem de mentorias ativas"""
+    return (
+        select(Mentorship.mentor_id, func.count(Mentorship.id).label("active"))
+        .where(Mentorship.status == "active")
+        .group_by(Mentorship.mentor_id)
+        .subquery()
+    )
+
+
+def eligible_mentors_query(db: Session, min_semester: int, max_mentees: int, *columns):
+    """
+    Query dos perfis elegíveis a mentor, com vagas livres
+
+    Retorna as colunas pedidas seguidas da contagem de mentorados ativos.
+    Tudo é resolvido no banco: índice em `semester_number` + LEFT JOIN com
+    a contagem agrupada.
+    """
+    active_counts = active_mentees_subquery()
+    active = func.coalesce(active_counts.c.active, 0)
+    return (
+        db.query(*columns, active.label("active_mentees"))
+        .select_from(Profile)
+        .outerjoin(active_counts, active_counts.c.mentor_id == Profile.user_id)
+        .filter(Profile.semester_number >= min_semester, active < max_mentees)
+    )
+
+
+def _chunks(values: List[int], size: int = _IN_CHUNK) -> Iterable[List[int]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def load_interest_bits(db: Session, user_ids: Iterable[int]) -> Dict[int, int]:
+    """Retorna {user_id: bitset dos interest_ids} para os usuários informados"""
+    bits: Dict[int, int] = {}
+    ids = sorted(set(user_ids))
+    for chunk in _chunks(ids):
+        rows = (
+            db.query(UserInterest.user_id, UserInterest.interest_id)
+            .filter(UserInterest.user_id.in_(chunk))
+            .all()
+        )
+        for user_id, interest_id in rows:
+            bits[user_id] = bits.get(user_id, 0) | (1 << interest_id)
+    return bits
+
+
+def jaccard_score(a: int, b: int) -> float:
+    """Similaridade de Jaccard entre dois bitsets, na escala 0-100"""
+    if not a or not b:
+        return 0.0
+    return round((a & b).bit_count() / (a | b).bit_count() * 100, 2)
+
+
+@dataclass
+class MentorCandidate:
+    user_id: int
+    university: Optional[str]
+    semester: int
+    active_mentees: int
+    interests: int = 0
+
+    def score_for(self, mentee_university: Optional[str], mentee_interests: int) -> Tuple[float, float]:
+        """Retorna (score total, compatibilidade) para um mentorado"""
+        compatibility = jaccard_score(self.interests, mentee_interests)
+        bonus = UNIVERSITY_BONUS if self.university == mentee_university else 0
+        return compatibility + bonus, compatibility
+
+
+@dataclass
+class QueuedMentee:
+    user_id: int
+    university: Optional[str]
+    interests: int
+
+
+@dataclass
+class MatchResult:
+    mentee_id: int
+    mentor_id: int
+    score: float
+    compatibility: float
+
+
+class MentorPool:
+    """
+    Snapshot dos mentores elegíveis e da capacidade restante de cada um
+
+    Args:
+        candidates: mentores elegíveis, em ordem de user_id
+        max_mentees: limite de mentorados ativos por mentor
+    """
+
+    def __init__(self, candidates: List[MentorCandidate], max_mentees: int):
+        self.candidates = candidates
+        self.max_mentees = max_mentees
+        self._by_id = {c.user_id: c for c in candidates}
+
+    @classmethod
+    def load(cls, db: Session, min_semester: int, max_mentees: int) -> "MentorPool":
+        rows = (
+            eligible_mentors_query(
+                db, min_semester, max_mentees, Profile.user_id, Profile.university, Profile.semester_number
+            )
+            .order_by(Profile.user_id)
+            .all()
+        )
+        candidates = [
+            MentorCandidate(user_id, university, semester_num, active)
+            for user_id, university, semester_num, active in rows
+        ]
+
+        interests = load_interest_bits(db, (c.user_id for c in candidates))
+        for candidate in candidates:
+            candidate.interests = interests.get(candidate.user_id, 0)
+
+        return cls(candidates, max_mentees)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._by_id
+
+    def has_capacity(self, candidate: MentorCandidate) -> bool:
+        return candidate.active_mentees < self.max_mentees
+
+    def best_for(
+        self,
+        mentee_id: int,
+        mentee_university: Optional[str],
+        mentee_interests: int,
+    ) -> Optional[MatchResult]:
+        """Melhor mentor com vaga para o mentorado (empates: menor user_id)"""
+        best: Optional[MatchResult] = None
+        for candidate in self.candidates:
+            if candidate.user_id == mentee_id or not self.has_capacity(candidate):
+                continue
+            score, compatibility = candidate.score_for(mentee_university, mentee_interests)
+            if best is None or score > best.score:
+                best = MatchResult(mentee_id, candidate.user_id, score, compatibility)
+        return best
+
+    def reserve(self, mentor_id: int) -> None:
+        self._by_id[mentor_id].active_mentees += 1
+
+    def copy(self) -> "MentorPool":
+        """Cópia independente (para comparar estratégias sem alterar o original)"""
+        return MentorPool([replace(c) for c in self.candidates], self.max_mentees)
+
+
+def _score_block(mentors: List[MentorCandidate], mentees: List[QueuedMentee]):
+    """
+    Matriz mentorado x mentor com o score total (compatibilidade + bônus)
+
+    A interseção de interesses de todos os pares sai de um único produto de
+    matrizes sobre os bits de interesse. O próprio mentorado recebe -inf.
+    """
+    all_bits = 0
+    for person in (*mentors, *mentees):
+        all_bits |= person.interests
+    positions = [b for b in range(all_bits.bit_length()) if all_bits >> b & 1]
+
+    def to_matrix(people):
+        return np.array(
+            [[p.interests >> b & 1 for b in positions] for p in people], dtype=np.float32
+        ).reshape(len(people), len(positions))
+
+    mentee_bits, mentor_bits = to_matrix(mentees), to_matrix(mentors)
+    inter = mentee_bits @ mentor_bits.T
+    sizes_e = mentee_bits.sum(axis=1)[:, None]
+    sizes_m = mentor_bits.sum(axis=1)[None, :]
+    union = sizes_e + sizes_m - inter
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(
+            (sizes_e > 0) & (sizes_m > 0), np.round(inter / union * 100, 2), 0.0
+        )
+
+    codes: Dict[Optional[str], int] = {}
+    mentee_uni = np.array([codes.setdefault(e.university, len(codes)) for e in mentees])
+    mentor_uni = np.array([codes.setdefault(m.university, len(codes)) for m in mentors])
+    scores += (mentee_uni[:, None] == mentor_uni[None, :]) * UNIVERSITY_BONUS
+
+    mentor_index = {m.user_id: j for j, m in enumerate(mentors)}
+    for i, mentee in enumerate(mentees):
+        j = mentor_index.get(mentee.user_id)
+        if j is not None:
+            scores[i, j] = -np.inf
+    return scores
+
+
+def _score_blocks(mentors: List[MentorCandidate], mentees: List[QueuedMentee]):
+    """Gera (offset, bloco de scores) em fatias para limitar a memória"""
+    for start in range(0, len(mentees), _SCORE_BLOCK):
+        yield start, _score_block(mentors, mentees[start:start + _SCORE_BLOCK])
+
+
+def _match(mentor: MentorCandidate, mentee: QueuedMentee) -> MatchResult:
+    score, compatibility = mentor.score_for(mentee.university, mentee.interests)
+    return MatchResult(mentee.user_id, mentor.user_id, score, compatibility)
+
+
+def greedy_assignment(pool: MentorPool, mentees: List[QueuedMentee]) -> List[MatchResult]:
+    """Em ordem FIFO, cada mentorado fica com o melhor mentor ainda com vaga"""
+    if np is None or not mentees:
+        matches = []
+        for mentee in mentees:
+            match = pool.best_for(mentee.user_id, mentee.university, mentee.interests)
+            if match is None:
+                continue
+            pool.reserve(match.mentor_id)
+            matches.append(match)
+        return matches
+
+    mentors = [c for c in pool.candidates if pool.has_capacity(c)]
+    if not mentors:
+        return []
+    free = np.array([pool.max_mentees - m.active_mentees for m in mentors])
+
+    matches = []
+    for start, block in _score_blocks(mentors, mentees):
+        for offset, row in enumerate(block):
+            row = np.where(free > 0, row, -np.inf)
+            j = int(np.argmax(row))  # Empate: menor user_id (mentores ordenados)
+            if row[j] == -np.inf:
+                continue
+            free[j] -= 1
+            pool.reserve(mentors[j].user_id)
+            matches.append(_match(mentors[j], mentees[start + offset]))
+    return matches
+
+
+# === Atribuição ótima (Hungarian / linear_sum_assignment) ===
+def _hungarian(cost: List[List[float]]) -> List[Tuple[int, int]]:
+    """
+    Atribuição de custo mínimo em Python puro (O(n²·m), n <= m)
+
+    Usado apenas quando o scipy não está instalado.
+    """
+    n, m = len(cost), len(cost[0])
+    INF = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)  # p[j] = linha atribuída à coluna j (1-indexado)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [INF] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0, delta, j1 = p[j0], INF, 0
+            row = cost[i0 - 1]
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j], way[j] = cur, j0
+                    if minv[j] < delta:
+                        delta, j1 = minv[j], j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    return [(p[j] - 1, j - 1) for j in range(1, m + 1) if p[j]]
+
+
+def solve_assignment(cost: List[List[float]]) -> List[Tuple[int, int]]:
+    """
+    Resolve a atribuição de custo mínimo para uma matriz densa retangular
+
+    Usa `scipy.optimize.linear_sum_assignment` quando disponível.
+
+    Returns:
+        Pares (linha, coluna) atribuídos
+    """
+    if len(cost) == 0 or len(cost[0]) == 0:
+        return []
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(cost)
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    if len(cost) <= len(cost[0]):
+        return _hungarian(cost)
+    transposed = [list(col) for col in zip(*cost)]
+    return [(i, j) for j, i in _hungarian(transposed)]
+
+
+def _optimal_dense(pool: MentorPool, mentees: List[QueuedMentee]) -> List[MatchResult]:
+    """Matriz densa mentorado x vaga (fallback sem numpy/scipy)"""
+    n = len(mentees)
+    mentors = [c for c in pool.candidates if pool.has_capacity(c)]
+    slot_mentor = [
+        m for m in mentors for _ in range(min(pool.max_mentees - m.active_mentees, n))
+    ]
+    if not slot_mentor:
+        return []
+
+    forbidden = float(10 ** 9)
+    fifo_step = _FIFO_BONUS / n
+    cost = [
+        [
+            forbidden if m.user_id == mentee.user_id
+            else -(m.score_for(mentee.university, mentee.interests)[0] + (n - i) * fifo_step)
+            for m in slot_mentor
+        ]
+        for i, mentee in enumerate(mentees)
+    ]
+
+    matches = []
+    for row, col in sorted(solve_assignment(cost)):
+        if cost[row][col] >= forbidden:
+            continue
+        pool.reserve(slot_mentor[col].user_id)
+        matches.append(_match(slot_mentor[col], mentees[row]))
+    return matches
+
+
+def optimal_assignment(
+    pool: MentorPool, mentees: List[QueuedMentee], candidates_per_mentee: int = 50
+) -> List[MatchResult]:
+    """
+    Maximiza o score total da fila inteira
+
+    Cada mentor vira uma coluna por vaga livre (até MAX_MENTEES_PER_MENTOR),
+    então a capacidade é respeitada por construção. Um bônus ínfimo por
+    mentorado, pela posição na fila (abaixo do passo mínimo do score),
+    desempata a favor de quem chegou antes quando não há vagas para todos.
+
+    Para escalar, cada mentorado só considera os `candidates_per_mentee`
+    mentores de maior score, e o grafo esparso resultante vai para
+    `min_weight_full_bipartite_matching`. O resultado é exato sempre que a
+    fila não for maior que `candidates_per_mentee` (nenhum mentorado precisa
+    descer além desse ponto da própria lista).
+    """
+    if not mentees:
+        return []
+    if np is None or min_weight_full_bipartite_matching is None:
+        return _optimal_dense(pool, mentees)
+
+    n = len(mentees)
+    mentors = [c for c in pool.candidates if pool.has_capacity(c)]
+    if not mentors:
+        return []
+    k = min(candidates_per_mentee, len(mentors))
+
+    top_mentors = np.empty((n, k), dtype=np.int64)
+    top_scores = np.empty((n, k), dtype=np.float64)
+    for start, block in _score_blocks(mentors, mentees):
+        idx = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_mentors[start:start + len(block)] = idx
+        top_scores[start:start + len(block)] = np.take_along_axis(block, idx, axis=1)
+
+    # Colunas: vagas dos mentores que aparecem em algum top-k
+    used = np.unique(top_mentors)
+    free = np.array([min(pool.max_mentees - mentors[j].active_mentees, n) for j in used])
+    first_slot = np.zeros(len(mentors), dtype=np.int64)
+    first_slot[used] = np.concatenate(([0], np.cumsum(free)[:-1]))
+    slots_of = np.zeros(len(mentors), dtype=np.int64)
+    slots_of[used] = free
+    n_slots = int(free.sum())
+
+    # Custos positivos: vaga real = BASE - score; "sem mentor" = bem mais caro,
+    # para que o solver maximize primeiro o número de matches
+    base = UNIVERSITY_BONUS + 100 + 1
+    fifo = (n - np.arange(n)) * (_FIFO_BONUS / n)
+    rows, cols, costs = [], [], []
+    for r in range(k):
+        mentor_col = top_mentors[:, r]
+        valid = np.isfinite(top_scores[:, r])
+        edge_cost = base - (top_scores[:, r] + fifo)
+        for s in range(pool.max_mentees):
+            has_slot = valid & (slots_of[mentor_col] > s)
+            rows.append(np.nonzero(has_slot)[0])
+            cols.append(first_slot[mentor_col[has_slot]] + s)
+            costs.append(edge_cost[has_slot])
+    rows.append(np.arange(n))
+    cols.append(n_slots + np.arange(n))
+    costs.append(np.full(n, base * 1000.0))
+
+    graph = csr_matrix(
+        (np.concatenate(costs), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n, n_slots + n),
+    )
+    _, assigned = min_weight_full_bipartite_matching(graph)
+
+    slot_owner = np.repeat(used, free)
+    matches = []
+    for i, col in enumerate(assigned.tolist()):
+        if col < 0 or col >= n_slots:
+            continue
+        mentor = mentors[int(slot_owner[col])]
+        pool.reserve(mentor.user_id)
+        matches.append(_match(mentor, mentees[i]))
+    return matches
+
+
+class MentorMatchingService:
+    """Matching de mentores em lote"""
+
+    @staticmethod
+    def find_best_mentor(
+        db: Session, mentee_id: int, min_semester: int, max_mentees: int
+    ) -> Optional[MatchResult]:
+        mentee_profile = db.query(Profile).filter(Profile.user_id == mentee_id).first()
+        if not mentee_profile:
+            return None
+
+        pool = MentorPool.load(db, min_semester, max_mentees)
+        mentee_interests = load_interest_bits(db, [mentee_id]).get(mentee_id, 0)
+        return pool.best_for(mentee_id, mentee_profile.university, mentee_interests)
+
+    @staticmethod
+    def load_queue(db: Session, limit: Optional[int]) -> List[MentorshipQueue]:
+        query = db.query(MentorshipQueue).order_by(MentorshipQueue.queue_seq.asc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def load_queued_mentees(
+        db: Session, queue_entries: List[MentorshipQueue]
+    ) -> Tuple[List[QueuedMentee], Set[int]]:
+        """
+        Carrega universidade e interesses dos mentorados da fila (em lote)
+
+        Returns:
+            (mentorados em ordem FIFO, mentorados que já têm mentor ativo)
+        """
+        mentee_ids = [entry.user_id for entry in queue_entries]
+        universities: Dict[int, Optional[str]] = {}
+        already_matched: Set[int] = set()
+
+        for chunk in _chunks(mentee_ids):
+            universities.update(
+                db.query(Profile.user_id, Profile.university)
+                .filter(Profile.user_id.in_(chunk))
+                .all()
+            )
+            already_matched.update(
+                mentee_id
+                for (mentee_id,) in db.query(Mentorship.mentee_id)
+                .filter(Mentorship.mentee_id.in_(chunk), Mentorship.status == "active")
+                .all()
+            )
+
+        interests = load_interest_bits(db, mentee_ids)
+        mentees = [
+            QueuedMentee(mentee_id, universities[mentee_id], interests.get(mentee_id, 0))
+            for mentee_id in mentee_ids
+            if mentee_id in universities and mentee_id not in already_matched
+        ]
+        return mentees, already_matched
+
+    @staticmethod
+    def match_queue(
+        db: Session,
+        queue_entries: List[MentorshipQueue],
+        min_semester: int,
+        max_mentees: int,
+        mode: str = "greedy",
+    ) -> Tuple[List[MatchResult], Set[int]]:
+        """
+        Pontua a fila contra o pool de mentores, respeitando a capacidade
+
+        Args:
+            mode: "greedy" (FIFO, cada um pega o melhor disponível) ou
+                "optimal" (maximiza o score total da fila inteira)
+
+        Returns:
+            (matches, mentees que já têm mentor ativo)
+        """
+        if not queue_entries:
+            return [], set()
+
+        pool = MentorPool.load(db, min_semester, max_mentees)
+        mentees, already_matched = MentorMatchingService.load_queued_mentees(db, queue_entries)
+
+        if mode == "optimal":
+            return optimal_assignment(pool, mentees), already_matched
+        return greedy_assignment(pool, mentees), already_matched
+
+    @staticmethod
+    def apply_matches(db: Session, matches: List[MatchResult], dequeue: Iterable[int] = ()) -> None:
+        """
+        Cria as mentorias e remove os mentorados da fila em uma única transação;
+        as notificações só são enviadas depois do commit
+        """
+        if not matches:
+            to_remove = list(dequeue)
+            if to_remove:
+                db.query(MentorshipQueue).filter(
+                    MentorshipQueue.user_id.in_(to_remove)
+                ).delete(synchronize_session=False)
+                db.commit()
+            return
+
+        try:
+            db.add_all([
+                Mentorship(
+                    mentor_id=match.mentor_id,
+                    mentee_id=match.mentee_id,
+                    status="active",
+                    compatibility_score=match.compatibility,
+                )
+                for match in matches
+            ])
+            to_remove = list({match.mentee_id for match in matches} | set(dequeue))
+            for chunk in _chunks(to_remove):
+                db.query(MentorshipQueue).filter(
+                    MentorshipQueue.user_id.in_(chunk)
+                ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        names = dict(
+            db.query(Profile.user_id, Profile.full_name)
+            .filter(Profile.user_id.in_([match.mentee_id for match in matches]))
+            .all()
+        )
+        for match in matches:
+            if match.mentee_id in names:
+                NotificationService.notify_new_mentee(
+                    db=db,
+                    mentor_id=match.mentor_id,
+                    mentee_name=names[match.mentee_id],
+                    mentee_id=match.mentee_id,
+                )
+
+    @staticmethod
+    def process_queue(
+        db: Session,
+        min_semester: int,
+        max_mentees: int,
+        limit: Optional[int] = 10,
+        mode: str = "greedy",
+    ) -> int:
+        """
+        Processa a fila de espera em lote
+
+        Returns:
+            Número de matches realizados
+        """
+        queue_entries = MentorMatchingService.load_queue(db, limit)
+        matches, already_matched = MentorMatchingService.match_queue(
+            db, queue_entries, min_semester, max_mentees, mode=mode
+        )
+        MentorMatchingService.apply_matches(db, matches, dequeue=already_matched)
+
+        logger.info(
+            "Processed %s queue entries, made %s matches",
+            len(queue_entries),
+            len(matches),
+        )
+        return len(matches)
+
+    @staticmethod
+    def batch_assign(
+        db: Session,
+        min_semester: int,
+        max_mentees: int,
+        limit: Optional[int] = None,
+        dry_run: bool = True,
+    ) -> Dict:
+        """
+        Atribuição ótima da fila inteira, com relatório comparando ao guloso
+
+        Args:
+            dry_run: apenas calcula e retorna o relatório, sem gravar nada
+        """
+        start = time.perf_counter()
+        queue_entries = MentorMatchingService.load_queue(db, limit)
+        pool = MentorPool.load(db, min_semester, max_mentees)
+        mentees, already_matched = MentorMatchingService.load_queued_mentees(db, queue_entries)
+        available_slots = sum(
+            max_mentees - c.active_mentees for c in pool.candidates if pool.has_capacity(c)
+        )
+
+        greedy = greedy_assignment(pool.copy(), mentees)
+        optimal = optimal_assignment(pool.copy(), mentees)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if not dry_run:
+            MentorMatchingService.apply_matches(db, optimal, dequeue=already_matched)
+            logger.info(
+                "Batch assignment: %s queue entries, made %s matches (greedy would make %s)",
+                len(queue_entries),
+                len(optimal),
+                len(greedy),
+            )
+
+        return {
+            "dry_run": dry_run,
+            "queue_size": len(queue_entries),
+            "skipped_already_matched": len(already_matched),
+            "available_slots": available_slots,
+            "optimal": _summarize(optimal),
+            "greedy": _summarize(greedy),
+            "assignments": [asdict(match) for match in optimal],
+            "elapsed_ms": round(elapsed_ms, 2),
+        }
+
+
+def _summarize(matches: List[MatchResult]) -> Dict:
+    total = sum(match.score for match in matches)
+    compatibility = sum(match.compatibility for match in matches)
+    return {
+        "matched": len(matches),
+        "total_score": round(total, 2),
+        "average_compatibility": round(compatibility / len(matches), 2) if matches else 0.0,
+    }
@@ -3,18 +3,27 @@ Serviço de Mentoria
 RF068-RF078: Auto-matching de mentores e mentorados
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select
+from sqlalchemy.orm import aliased
 import logging
 from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.models.mentorship import Mentorship, MentorshipQueue
 from app.models.profile import Profile
 from app.models.social import UserInterest, Interest
 from app.services.notification_service import NotificationService
+from app.services.mentor_matching import MentorMatchingService
 
 logger = logging.getLogger(__name__)
 
+QUEUE_LENGTH_KEY = "mentorship_queue_length"
+
+# Tamanho da fila (invalidado pelos listeners de app/services/mentor_availability.py)
+queue_cache = TTLCache(ttl=settings.STATS_CACHE_TTL_SECONDS, maxsize=1)
+
 
 class MentorshipService:
     """Serviço para gerenciamento de mentorias"""
@@ -38,10 +47,9 @@ class MentorshipService:
         if not profile.semester:
             return False, "Semestre não configurado no perfil"
 
-        # Extrair número do semestre (ex: "4º" -> 4, "10º" -> 10)
-        try:
-            semester_num = int(profile.semester.replace("º", "").replace("°", "").strip())
-        except ValueError:
+        # Número extraído do texto (ex: "4º" -> 4), mantido pelo model
+        semester_num = profile.semester_number
+        if semester_num is None:
             return False, "Formato de semestre inválido"
 
         if semester_num < MentorshipService.MIN_SEMESTER_FOR_MENTOR:
@@ -118,65 +126,25 @@ class MentorshipService:
         3. Maior compatibilidade de interesses
         4. Mesma universidade (preferencial)
         """
-        # Buscar perfil do mentee
-        mentee_profile = db.query(Profile).filter(Profile.user_id == mentee_id).first()
-
-        if not mentee_profile:
-            return None
-
-        # Buscar mentores elegíveis (4º semestre+)
-        # Nota: Aqui fazemos uma query simplificada, assumindo semestres como "1º", "2º", etc.
-        potential_mentors = (
-            db.query(Profile)
-            .filter(
-                Profile.user_id != mentee_id,
-                Profile.semester.isnot(None),
-            )
-            .all()
+        best = MentorMatchingService.find_best_mentor(
+            db,
+            mentee_id,
+            min_semester=MentorshipService.MIN_SEMESTER_FOR_MENTOR,
+            max_mentees=MentorshipService.MAX_MENTEES_PER_MENTOR,
         )
 
-        eligible_mentors = []
-
-        for mentor_profile in potential_mentors:
-            # Verificar elegibilidade
-            is_eligible, _ = MentorshipService.is_eligible_mentor(
-                db, mentor_profile.user_id
-            )
-
-            if not is_eligible:
-                continue
-
-            # Calcular compatibilidade
-            compatibility = MentorshipService.calculate_compatibility(
-                db, mentor_profile.user_id, mentee_id
-            )
-
-            # Bônus se mesma universidade
-            university_bonus = 10 if mentor_profile.university == mentee_profile.university else 0
-
-            total_score = compatibility + university_bonus
-
-            eligible_mentors.append(
-                {
-                    "mentor_id": mentor_profile.user_id,
-                    "score": total_score,
-                    "compatibility": compatibility,
-                }
-            )
-
-        if not eligible_mentors:
+        if best is None:
             return None
 
-        # Ordenar por score e pegar o melhor
-        eligible_mentors.sort(key=lambda x: x["score"], reverse=True)
-        best_mentor = eligible_mentors[0]
-
         logger.info(
-            f"Best mentor for user {mentee_id}: {best_mentor['mentor_id']} "
-            f"(score: {best_mentor['score']}, compatibility: {best_mentor['compatibility']}%)"
+            "Best mentor for user %s: %s (score: %s, compatibility: %s%%)",
+            mentee_id,
+            best.mentor_id,
+            best.score,
+            best.compatibility,
         )
 
-        return best_mentor["mentor_id"]
+        return best.mentor_id
 
     @staticmethod
     def create_mentorship(
@@ -241,8 +209,11 @@ class MentorshipService:
             )
 
         logger.info(
-            f"Created mentorship: mentor={mentor_id}, mentee={mentee_id}, "
-            f"compatibility={compatibility}%"
+            "Created mentorship: mentor=%s, mentee=%s, "
+            "compatibility=%s%%",
+            mentor_id,
+            mentee_id,
+            compatibility,
         )
 
         return mentorship
@@ -340,44 +311,103 @@ class MentorshipService:
         mentorship.completed_at = datetime.utcnow()
         db.commit()
 
-        logger.info(f"Mentorship {mentorship_id} completed by user {user_id}")
+        logger.info("Mentorship %s completed by user %s", mentorship_id, user_id)
 
         return True
 
     @staticmethod
-    def process_queue(db: Session, limit: int = 10) -> int:
+    def get_queue_length(db: Session) -> int:
+        """Total de pessoas na fila (cacheado)"""
+        return queue_cache.get_or_set(
+            QUEUE_LENGTH_KEY,
+            lambda: db.query(func.count()).select_from(MentorshipQueue).scalar(),
+        )
+
+    @staticmethod
+    def get_queue_position(db: Session, user_id: int) -> Optional[Tuple[int, MentorshipQueue]]:
         """
-        Processa fila de espera tentando fazer matching
+        Posição do usuário na fila (1 = próximo)
 
-        Chamado periodicamente (ex: cronjob)
+        Conta as entradas com `queue_seq` menor via range scan no índice
+        único, na mesma query que busca a entrada do usuário.
 
         Returns:
-            Número de matches realizados
+            (position, queue_entry) ou None se não estiver na fila
         """
-        # Buscar primeiros da fila
-        queue_entries = (
-            db.query(MentorshipQueue)
-            .order_by(MentorshipQueue.requested_at.asc())
-            .limit(limit)
+        ahead = aliased(MentorshipQueue)
+        row = (
+            db.query(
+                MentorshipQueue,
+                select(func.count())
+                .select_from(ahead)
+                .where(ahead.queue_seq < MentorshipQueue.queue_seq)
+                .correlate(MentorshipQueue)
+                .scalar_subquery(),
+            )
+            .filter(MentorshipQueue.user_id == user_id)
+            .first()
+        )
+        if row is None:
+            return None
+        entry, ahead_count = row
+        return ahead_count + 1, entry
+
+    @staticmethod
+    def get_queue_snapshot(db: Session) -> List[Dict]:
+        """Posição de todos na fila, numa única passada ordenada pelo índice"""
+        rows = (
+            db.query(
+                MentorshipQueue.user_id,
+                Profile.full_name,
+                MentorshipQueue.requested_at,
+                func.row_number().over(order_by=MentorshipQueue.queue_seq).label("position"),
+            )
+            .outerjoin(Profile, Profile.user_id == MentorshipQueue.user_id)
+            .order_by(MentorshipQueue.queue_seq)
             .all()
         )
+        return [
+            {
+                "user_id": user_id,
+                "full_name": full_name,
+                "requested_at": requested_at,
+                "position": position,
+            }
+            for user_id, full_name, requested_at, position in rows
+        ]
 
-        matches_made = 0
+    @staticmethod
+    def process_queue(db: Session, limit: int = 10) -> int:
+        """
+        Processa fila de espera tentando fazer matching
 
-        for entry in queue_entries:
-            # Tentar encontrar mentor
-            best_mentor_id = MentorshipService.find_best_mentor(db, entry.user_id)
+        Chamado periodicamente (ex: cronjob)
 
-            if best_mentor_id:
-                try:
-                    MentorshipService.create_mentorship(
-                        db, best_mentor_id, entry.user_id
-                    )
-                    matches_made += 1
-                except ValueError as e:
-                    logger.warning(f"Failed to create mentorship: {e}")
-                    continue
+        Returns:
+            Número de matches realizados
+        """
+        return MentorMatchingService.process_queue(
+            db,
+            min_semester=MentorshipService.MIN_SEMESTER_FOR_MENTOR,
+            max_mentees=MentorshipService.MAX_MENTEES_PER_MENTOR,
+            limit=limit,
+        )
 
-        logger.info(f"Processed {len(queue_entries)} queue entries, made {matches_made} matches")
+    @staticmethod
+    def assign_queue_batch(
+        db: Session, limit: Optional[int] = None, dry_run: bool = True
+    ) -> Dict:
+        """
+        Atribuição global ótima da fila de espera
 
-        return matches_made
+        Resolve a atribuição com capacidade (cada mentor com até
+        MAX_MENTEES_PER_MENTOR vagas) maximizando o score total, em vez de
+        atender um a um em ordem de chegada como process_queue.
+        """
+        return MentorMatchingService.batch_assign(
+            db,
+            min_semester=MentorshipService.MIN_SEMESTER_FOR_MENTOR,
+            max_mentees=MentorshipService.MAX_MENTEES_PER_MENTOR,
+            limit=limit,
+            dry_run=dry_run,
+        )
@@ -0,0 +1,85 @@
+"""
+Estatísticas de moderação
+RF183-RF189: painel de denúncias para administradores
+
+Todas as contagens (por status, tipo e categoria) e a série diária saem de
+uma única query: `GROUP BY date(created_at)` com um `COUNT(*) FILTER
+(WHERE ...)` por valor. Os totais são a soma dos dias, feita em Python, e o
+resultado fica num cache curto (invalidado por quem cria/atualiza denúncias
+neste processo).
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.report import Report
+
+REPORT_STATUSES = ("pending", "reviewed", "approved", "rejected")
+REPORT_TARGET_TYPES = ("thread", "comment", "user")
+REPORT_CATEGORIES = ("spam", "offensive", "harassment", "inappropriate", "fake", "other")
+
+stats_cache = TTLCache(ttl=settings.STATS_CACHE_TTL_SECONDS, maxsize=32)
+
+_BREAKDOWNS = (
+    ("by_status", Report.status, REPORT_STATUSES),
+    ("by_type", Report.target_type, REPORT_TARGET_TYPES),
+    ("by_category", Report.category, REPORT_CATEGORIES),
+)
+
+
+def _as_date(value) -> date:
+    # PostgreSQL devolve date; SQLite, texto 'YYYY-MM-DD'
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+class ModerationStatsService:
+    """Agregações de denúncias para o painel de moderação"""
+
+    @staticmethod
+    def get_stats(db: Session, days: int = 30) -> Dict:
+        """
+        Totais por status/tipo/categoria e série diária dos últimos `days`
+        dias (dias sem denúncia entram zerados), em uma query (cacheado)
+        """
+
+        def compute() -> Dict:
+            day = func.date(Report.created_at).label("day")
+            columns = [func.count()]
+            for _, column, values in _BREAKDOWNS:
+                columns.extend(func.count().filter(column == value) for value in values)
+            rows = db.execute(select(day, *columns).group_by(day)).all()
+
+            totals = {name: dict.fromkeys(values, 0) for name, _, values in _BREAKDOWNS}
+            total_reports = 0
+            per_day: Dict[date, Dict] = {}
+            for row in rows:
+                counts = iter(row[2:])
+                day_stats = {"total": row[1]}
+                total_reports += row[1]
+                for name, _, values in _BREAKDOWNS:
+                    day_stats[name] = {value: next(counts) for value in values}
+                    for value, count in day_stats[name].items():
+                        totals[name][value] += count
+                if row.day is not None:
+                    per_day[_as_date(row.day)] = day_stats
+
+            today = datetime.utcnow().date()
+            daily: List[Dict] = []
+            for offset in range(days - 1, -1, -1):
+                current = today - timedelta(days=offset)
+                day_stats = per_day.get(current, {"total": 0, "by_status": dict.fromkeys(REPORT_STATUSES, 0)})
+                daily.append(
+                    {
+                        "date": current.isoformat(),
+                        "total": day_stats["total"],
+                        "by_status": day_stats["by_status"],
+                    }
+                )
+
+            return {"total_reports": total_reports, **totals, "daily": daily}
+
+        return stats_cache.get_or_set(("moderation_stats", days), compute)
@@ -0,0 +1,62 @@
+"""
+Busca de alunos por nome (RF054) sobre `Profile.search_name`
+
+- name_match: trecho em qualquer posição (LIKE) ou nome parecido
+  (`word_similarity`, tolera erros de digitação); ambos usam o índice
+  trigram no PostgreSQL
+- name_prefix: autocomplete, prefixo de qualquer palavra do nome
+- name_rank: relevância para ordenar os resultados
+"""
+from sqlalchemy import func, literal, or_
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.core.text_search import WORD_SIMILARITY_THRESHOLD, normalize_name
+from app.models.profile import Profile
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def name_match(db: Session, term: str):
+    """Filtro de busca por nome, sem diferenciar acentos e maiúsculas"""
+    normalized = normalize_name(term)
+    substring = Profile.search_name.like(f"%{_escape_like(normalized)}%", escape="\\")
+    if db.get_bind().dialect.name == "postgresql":
+        # `<%` é o operador indexável equivalente a word_similarity >= limiar
+        fuzzy = literal(normalized).op("<%")(Profile.search_name)
+    else:
+        fuzzy = func.word_similarity(normalized, Profile.search_name) >= WORD_SIMILARITY_THRESHOLD
+    return or_(substring, fuzzy)
+
+
+def name_prefix(term: str):
+    """Filtro de autocomplete: alguma palavra do nome começa com o termo"""
+    normalized = _escape_like(normalize_name(term))
+    return or_(
+        Profile.search_name.like(f"{normalized}%", escape="\\"),
+        Profile.search_name.like(f"% {normalized}%", escape="\\"),
+    )
+
+
+def name_rank(term: str):
+    """Relevância (0-1) do perfil para o termo; ordenar de forma decrescente"""
+    return func.word_similarity(normalize_name(term), Profile.search_name)
+
+
+def autocomplete(db: Session, term: str, exclude_user_id: int, limit: int = 10) -> List[Profile]:
+    """Perfis públicos cujo nome começa com o termo, mais relevantes primeiro"""
+    if not normalize_name(term):
+        return []
+    return (
+        db.query(Profile)
+        .filter(
+            Profile.user_id != exclude_user_id,
+            Profile.is_public == True,
+            name_prefix(term),
+        )
+        .order_by(name_rank(term).desc(), Profile.full_name)
+        .limit(limit)
+        .all()
+    )
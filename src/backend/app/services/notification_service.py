@@ -45,7 +45,7 @@ class NotificationService:
             db.add(prefs)
             db.commit()
             db.refresh(prefs)
-            logger.info(f"Created notification preferences for user {user_id}")
+            logger.info("Created notification preferences for user %s", user_id)
 
         return prefs
 
@@ -84,13 +84,15 @@ class NotificationService:
         """
         # Verificar se o tipo é válido
         if notification_type not in NotificationService.NOTIFICATION_TYPES:
-            logger.warning(f"Invalid notification type: {notification_type}")
+            logger.warning("Invalid notification type: %s", notification_type)
             return None
 
         # Verificar se o usuário tem esse tipo de notificação ativado
         if not NotificationService.is_notification_enabled(db, user_id, notification_type):
             logger.debug(
-                f"User {user_id} has {notification_type} notifications disabled"
+                "User %s has %s notifications disabled",
+                user_id,
+                notification_type,
             )
             return None
 
@@ -111,7 +113,10 @@ class NotificationService:
         db.refresh(notification)
 
         logger.info(
-            f"Created notification for user {user_id}: {notification_type} - {title}"
+            "Created notification for user %s: %s - %s",
+            user_id,
+            notification_type,
+            title,
         )
 
         return notification
@@ -193,6 +198,26 @@ class NotificationService:
             reference_type="user",
         )
 
+    @staticmethod
+    def event_reminder_fields(event_id: int, event_title: str, hours_before: int) -> Dict:
+        """
+        Campos da notificação de lembrete de evento (24h ou 1h antes)
+        """
+        notification_type = (
+            "event_reminder_24h" if hours_before == 24 else "event_reminder_1h"
+        )
+        time_str = "24 horas" if hours_before == 24 else "1 hora"
+
+        return {
+            "notification_type": notification_type,
+            # "Lembrete: " + 190 cabe no String(200) do título
+            "title": f"Lembrete: {event_title[:190]}",
+            "content": f"O evento começa em {time_str}",
+            "link": f"/events/{event_id}",
+            "reference_id": event_id,
+            "reference_type": "event",
+        }
+
     @staticmethod
     def notify_event_reminder(
         db: Session,
@@ -204,20 +229,10 @@ class NotificationService:
         """
         Lembrete de evento (24h ou 1h antes)
         """
-        notification_type = (
-            "event_reminder_24h" if hours_before == 24 else "event_reminder_1h"
-        )
-        time_str = "24 horas" if hours_before == 24 else "1 hora"
-
         NotificationService.create_notification(
             db=db,
             user_id=user_id,
-            notification_type=notification_type,
-            title=f"Lembrete: {event_title}",
-            content=f"O evento começa em {time_str}",
-            link=f"/events/{event_id}",
-            reference_id=event_id,
-            reference_type="event",
+            **NotificationService.event_reminder_fields(event_id, event_title, hours_before),
         )
 
     @staticmethod
@@ -350,6 +365,6 @@ class NotificationService:
 
         db.commit()
 
-        logger.info(f"Deleted {count} old notifications (older than {days} days)")
+        logger.info("Deleted %s old notifications (older than %s days)", count, days)
 
         return count
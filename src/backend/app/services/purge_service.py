@@ -0,0 +1,201 @@
+"""
+Exclusão de threads e contas sem carregar o grafo no ORM
+
+Uma thread popular (ou um usuário antigo) arrasta milhares de comentários e
+votos. Em vez de `db.delete()` com cascade do ORM (que carrega cada filho e
+apaga linha a linha), o purge roda `DELETE ... WHERE id IN (SELECT id ...
+LIMIT n)` tabela por tabela, filhos antes dos pais, com commit a cada lote:
+nenhuma transação trava muitas linhas, e um purge interrompido continua de
+onde parou se for chamado de novo. O que sobra depois dos lotes (perfil,
+estatísticas, amizades...) sai pelo ON DELETE CASCADE do banco ao apagar a
+linha do pai.
+"""
+import logging
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from sqlalchemy import bindparam, delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.event import Event, EventParticipant
+from app.models.mentorship import Mentorship
+from app.models.notification import Notification, ScheduledNotification
+from app.models.poll import Poll, PollOption, PollVote
+from app.models.thread import Comment, CommentVote, Thread, ThreadVote
+from app.models.user import User
+from app.services.event_service import EventService
+from app.services.mentor_availability import MentorAvailabilityService
+from app.services.mentor_availability import stats_cache as mentor_stats_cache
+from app.services.mentorship_service import queue_cache
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH = 1000  # Linhas apagadas por transação
+
+_NO_SYNC = {"synchronize_session": False}
+
+
+def _delete_in_batches(db: Session, model, condition, batch_size: int) -> int:
+    """Apaga as linhas de `model` que atendem `condition`, um lote por commit"""
+    total = 0
+    while True:
+        batch = select(model.id).where(condition).limit(batch_size)
+        deleted = db.execute(delete(model).where(model.id.in_(batch)), execution_options=_NO_SYNC).rowcount
+        db.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+def _run(db: Session, steps: List[Tuple[str, type, object]], batch_size: int) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for name, model, condition in steps:
+        counts[name] = counts.get(name, 0) + _delete_in_batches(db, model, condition, batch_size)
+    return counts
+
+
+def _thread_steps(thread_filter) -> List[Tuple[str, type, object]]:
+    """Grafo das threads que atendem `thread_filter`, filhos primeiro"""
+    thread_ids = select(Thread.id).where(thread_filter)
+    comment_ids = select(Comment.id).where(Comment.thread_id.in_(thread_ids))
+    return [
+        ("comment_votes", CommentVote, CommentVote.comment_id.in_(comment_ids)),
+        ("comments", Comment, Comment.thread_id.in_(thread_ids)),
+        ("thread_votes", ThreadVote, ThreadVote.thread_id.in_(thread_ids)),
+        ("threads", Thread, thread_filter),
+    ]
+
+
+def _delete_poll_votes(db: Session, user_id: int, batch_size: int) -> int:
+    """
+    Apaga os votos do usuário em lotes, tirando cada lote da contagem das
+    opções na mesma transação (um purge refeito não desconta duas vezes)
+    """
+    options = PollOption.__table__
+    total = 0
+    while True:
+        batch = db.execute(
+            select(PollVote.id, PollVote.option_id).where(PollVote.user_id == user_id).limit(batch_size)
+        ).all()
+        if not batch:
+            return total
+        per_option = Counter(row.option_id for row in batch)
+        db.connection().execute(
+            update(options)
+            .where(options.c.id == bindparam("b_id"))
+            .values(votes_count=options.c.votes_count - bindparam("b_votes")),
+            [{"b_id": option_id, "b_votes": votes} for option_id, votes in per_option.items()],
+        )
+        db.execute(delete(PollVote).where(PollVote.id.in_([row.id for row in batch])), execution_options=_NO_SYNC)
+        db.commit()
+        total += len(batch)
+
+
+def _leave_events(db: Session, user_id: int) -> None:
+    """
+    Tira o usuário dos eventos alheios em que está confirmado, devolvendo a
+    vaga e promovendo a fila de espera (um evento por transação). Os
+    eventos dele saem pelo cascade, mas os lembretes pendentes dos outros
+    participantes não têm FK para o evento e são apagados aqui.
+    """
+    event_ids = db.scalars(
+        select(EventParticipant.event_id)
+        .join(Event, Event.id == EventParticipant.event_id)
+        .where(
+            EventParticipant.user_id == user_id,
+            EventParticipant.status == "confirmed",
+            Event.created_by != user_id,
+        )
+    ).all()
+    for event_id in event_ids:
+        left = db.execute(
+            delete(EventParticipant).where(
+                EventParticipant.event_id == event_id,
+                EventParticipant.user_id == user_id,
+                EventParticipant.status == "confirmed",
+            ),
+            execution_options=_NO_SYNC,
+        ).rowcount
+        if left:
+            EventService._release_seat(db, event_id)
+            EventService.promote_waitlist(db, event_id)
+        db.commit()
+
+    db.execute(
+        delete(ScheduledNotification).where(
+            ScheduledNotification.reference_type == "event",
+            ScheduledNotification.reference_id.in_(select(Event.id).where(Event.created_by == user_id)),
+            ScheduledNotification.sent_at.is_(None),
+        ),
+        execution_options=_NO_SYNC,
+    )
+    db.commit()
+
+
+def _end_mentorships(db: Session, user_id: int) -> None:
+    """Remove as mentorias do usuário e recalcula os mentores afetados"""
+    mentor_ids = db.scalars(
+        select(Mentorship.mentor_id).where(Mentorship.mentee_id == user_id, Mentorship.mentor_id != user_id)
+    ).all()
+    db.execute(
+        delete(Mentorship).where(or_(Mentorship.mentee_id == user_id, Mentorship.mentor_id == user_id)),
+        execution_options=_NO_SYNC,
+    )
+    if mentor_ids:
+        MentorAvailabilityService.refresh(db.connection(), mentor_ids)
+    db.commit()
+    mentor_stats_cache.invalidate()
+    queue_cache.invalidate()
+
+
+class PurgeService:
+    """Exclusão em lotes de threads e usuários com tudo que depende deles"""
+
+    @staticmethod
+    def purge_thread(db: Session, thread_id: int, batch_size: int = PURGE_BATCH) -> Dict[str, int]:
+        """
+        Exclui a thread com comentários e votos. Faz commit a cada lote.
+
+        Returns:
+            linhas apagadas por tabela
+        """
+        return _run(db, _thread_steps(Thread.id == thread_id), batch_size)
+
+    @staticmethod
+    def purge_user(db: Session, user_id: int, batch_size: int = PURGE_BATCH) -> Dict[str, int]:
+        """
+        Exclui a conta e o conteúdo dela: threads (com comentários e votos de
+        terceiros), comentários, votos, enquetes e notificações. Antes, sai
+        dos eventos confirmados (liberando a vaga e promovendo a fila) e das
+        mentorias (recalculando os mentores). Faz commit a cada lote; a conta
+        é desativada antes, para não ganhar conteúdo novo durante o purge.
+
+        Returns:
+            linhas apagadas por tabela
+        """
+        db.execute(update(User).where(User.id == user_id).values(is_active=False), execution_options=_NO_SYNC)
+        db.commit()
+
+        counts = {"poll_votes": _delete_poll_votes(db, user_id, batch_size)}
+        _leave_events(db, user_id)
+        _end_mentorships(db, user_id)
+
+        poll_ids = select(Poll.id).where(Poll.created_by == user_id)
+        own_comments = select(Comment.id).where(Comment.user_id == user_id)
+        steps = _thread_steps(Thread.user_id == user_id) + [
+            ("comment_votes", CommentVote, CommentVote.comment_id.in_(own_comments)),
+            ("comment_votes", CommentVote, CommentVote.user_id == user_id),
+            ("comments", Comment, Comment.user_id == user_id),
+            ("thread_votes", ThreadVote, ThreadVote.user_id == user_id),
+            ("poll_votes", PollVote, PollVote.poll_id.in_(poll_ids)),
+            ("poll_options", PollOption, PollOption.poll_id.in_(poll_ids)),
+            ("polls", Poll, Poll.created_by == user_id),
+            ("notifications", Notification, Notification.user_id == user_id),
+        ]
+        for name, deleted in _run(db, steps, batch_size).items():
+            counts[name] = counts.get(name, 0) + deleted
+
+        counts["users"] = db.execute(delete(User).where(User.id == user_id), execution_options=_NO_SYNC).rowcount
+        db.commit()
+        logger.info("Purged user %s: %s", user_id, counts)
+        return counts
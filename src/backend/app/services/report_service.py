@@ -0,0 +1,137 @@
+"""
+Denúncias e fila de moderação
+RF183-RF189: Reportar threads, comentários e usuários
+
+Cada denúncia atualiza, na mesma transação, o agregado do alvo em
+`report_targets` com um upsert (INSERT ... ON CONFLICT DO UPDATE): total,
+pendentes, denunciantes distintos, categoria mais frequente e data da última
+denúncia. Quando os denunciantes distintos chegam a
+`REPORT_AUTO_HIDE_THRESHOLD`, a thread/comentário é ocultada no mesmo
+commit. A fila dos admins lê só o agregado, ordenada por gravidade.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import case, distinct, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.report import Report, ReportTarget
+from app.models.thread import Comment, Thread
+
+# Peso da categoria mais denunciada na gravidade do alvo
+CATEGORY_WEIGHTS = {
+    "harassment": 3.0,
+    "offensive": 2.0,
+    "inappropriate": 2.0,
+    "fake": 1.5,
+    "spam": 1.0,
+    "other": 1.0,
+}
+
+HIDEABLE_TARGETS = {"thread": Thread, "comment": Comment}
+
+# Gravidade: denunciantes distintos x peso da categoria mais frequente
+severity = ReportTarget.reporter_count * case(
+    *((ReportTarget.top_category == category, weight) for category, weight in CATEGORY_WEIGHTS.items()),
+    else_=1.0,
+)
+
+
+def _insert(db: Session):
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+
+class ReportService:
+    """Registro de denúncias e manutenção do agregado por alvo"""
+
+    @staticmethod
+    def record_report(db: Session, report: Report) -> ReportTarget:
+        """
+        Adiciona a denúncia e atualiza o agregado do alvo (upsert), ocultando
+        o conteúdo se o limite de denunciantes for atingido. Não faz commit.
+        """
+        db.add(report)
+        db.flush()
+
+        same_target = (
+            Report.target_type == report.target_type,
+            Report.target_id == report.target_id,
+        )
+        reporters = select(func.count(distinct(Report.reporter_id))).where(*same_target).scalar_subquery()
+        top_category = (
+            select(Report.category)
+            .where(*same_target)
+            .group_by(Report.category)
+            .order_by(func.count().desc(), func.max(Report.id).desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        now = datetime.utcnow()
+
+        insert = _insert(db)(ReportTarget).values(
+            target_type=report.target_type,
+            target_id=report.target_id,
+            report_count=1,
+            pending_count=1,
+            reporter_count=reporters,
+            top_category=top_category,
+            last_reported_at=now,
+        )
+        target = db.execute(
+            insert.on_conflict_do_update(
+                index_elements=[ReportTarget.target_type, ReportTarget.target_id],
+                set_={
+                    "report_count": ReportTarget.report_count + 1,
+                    "pending_count": ReportTarget.pending_count + 1,
+                    "reporter_count": reporters,
+                    "top_category": top_category,
+                    "last_reported_at": now,
+                },
+            ).returning(ReportTarget),
+            execution_options={"populate_existing": True},
+        ).scalar_one()
+
+        threshold = settings.REPORT_AUTO_HIDE_THRESHOLD
+        model = HIDEABLE_TARGETS.get(report.target_type)
+        if model is not None and threshold and target.hidden_at is None and target.reporter_count >= threshold:
+            db.execute(update(model).where(model.id == report.target_id).values(is_hidden=True))
+            target.hidden_at = now
+            db.flush()
+
+        return target
+
+    @staticmethod
+    def set_status(db: Session, report: Report, status: str) -> None:
+        """Muda o status da denúncia e ajusta os pendentes do alvo. Não faz commit."""
+        delta = (status == "pending") - (report.status == "pending")
+        report.status = status
+        if delta:
+            db.execute(
+                update(ReportTarget)
+                .where(
+                    ReportTarget.target_type == report.target_type,
+                    ReportTarget.target_id == report.target_id,
+                )
+                .values(pending_count=ReportTarget.pending_count + delta),
+                execution_options={"synchronize_session": False},
+            )
+
+    @staticmethod
+    def moderation_queue(
+        db: Session,
+        target_type: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50,
+    ) -> List[tuple]:
+        """Alvos com denúncias pendentes, mais graves primeiro: [(agregado, gravidade)]"""
+        query = db.query(ReportTarget, severity.label("severity")).filter(ReportTarget.pending_count > 0)
+        if target_type:
+            query = query.filter(ReportTarget.target_type == target_type)
+        return (
+            query.order_by(severity.desc(), ReportTarget.last_reported_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
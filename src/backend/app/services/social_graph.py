@@ -1,126 +1,320 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import select, union_all, func, or_, and_
+from sqlalchemy.engine import Row
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.profile import Profile
 from app.models.social import Friendship
+from app.services.name_search import name_match, name_prefix as name_prefix_filter, name_rank
 
+# Chave em `db.info` onde fica o cache de adjacência da sessão (= requisição)
+_ADJACENCY_KEY = "friend_adjacency"
 
-def get_friend_status(db: Session, viewer_id: int, owner_id: int) -> str:
-    if viewer_id == owner_id:
-        return "self"
+# Limites do gerador de amigos-de-amigos: quantos amigos do usuário são
+# expandidos (os mais recentes) e quantos candidatos voltam no máximo
+FOF_MAX_FRIENDS = 200
+FOF_MAX_CANDIDATES = 100
 
-    outgoing = (
-        db.query(Friendship)
-        .filter(
-            Friendship.user_id == viewer_id,
-            Friendship.friend_id == owner_id,
-        )
-        .first()
+
+def canonical_pair(user_id: int, other_id: int) -> Tuple[int, int]:
+    """Par (low, high) com que a amizade entre os dois usuários é guardada"""
+    return (user_id, other_id) if user_id < other_id else (other_id, user_id)
+
+
+def pair_filter(user_id: int, other_id: int):
+    """Filtro da linha única do par, independente de quem pediu"""
+    low, high = canonical_pair(user_id, other_id)
+    return (Friendship.user_low_id == low, Friendship.user_high_id == high)
+
+
+def friendship_edges(user_id: int, status: Optional[str] = None):
+    """
+    Arestas do usuário como subquery (other_id, requester_id, status, created_at)
+
+    Cada lado do par é lido pelo seu índice composto (low/high + status),
+    e o UNION ALL junta as duas faixas sem duplicar linhas.
+    """
+    columns = (Friendship.requester_id, Friendship.status, Friendship.created_at)
+    low_side = select(Friendship.user_high_id.label("other_id"), *columns).where(
+        Friendship.user_low_id == user_id
     )
-    if outgoing:
-        if outgoing.status == "accepted":
-            return "friends"
-        if outgoing.status == "pending":
-            return "pending"
+    high_side = select(Friendship.user_low_id.label("other_id"), *columns).where(
+        Friendship.user_high_id == user_id
+    )
+    if status is not None:
+        low_side = low_side.where(Friendship.status == status)
+        high_side = high_side.where(Friendship.status == status)
+    return union_all(low_side, high_side).subquery("friendship_edges")
 
-    incoming = (
-        db.query(Friendship)
-        .filter(
-            Friendship.user_id == owner_id,
-            Friendship.friend_id == viewer_id,
-        )
-        .first()
+
+def _second_hop(first_hop, candidate_ids: Optional[Iterable[int]] = None):
+    """
+    Amigos dos usuários em `first_hop` (coluna other_id), como subquery
+    (candidate_id, via_id). Com `candidate_ids`, só as arestas até eles.
+    """
+    low_side = (
+        select(Friendship.user_high_id.label("candidate_id"), first_hop.c.other_id.label("via_id"))
+        .join(first_hop, Friendship.user_low_id == first_hop.c.other_id)
+        .where(Friendship.status == "accepted")
     )
-    if incoming:
-        if incoming.status == "accepted":
+    high_side = (
+        select(Friendship.user_low_id.label("candidate_id"), first_hop.c.other_id.label("via_id"))
+        .join(first_hop, Friendship.user_high_id == first_hop.c.other_id)
+        .where(Friendship.status == "accepted")
+    )
+    if candidate_ids is not None:
+        candidate_ids = list(candidate_ids)
+        low_side = low_side.where(Friendship.user_high_id.in_(candidate_ids))
+        high_side = high_side.where(Friendship.user_low_id.in_(candidate_ids))
+    return union_all(low_side, high_side).subquery("second_hop")
+
+
+def mutual_friend_counts(db: Session, user_id: int, candidate_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Amigos em comum entre o usuário e cada candidato, em uma query
+
+    Candidatos sem amigos em comum não aparecem no dicionário.
+    """
+    candidate_ids = list(candidate_ids)
+    if not candidate_ids:
+        return {}
+
+    hops = _second_hop(friendship_edges(user_id, "accepted"), candidate_ids)
+    rows = db.execute(
+        select(hops.c.candidate_id, func.count()).group_by(hops.c.candidate_id)
+    ).all()
+    return dict(rows)
+
+
+def friends_of_friends(
+    db: Session,
+    user_id: int,
+    max_friends: int = FOF_MAX_FRIENDS,
+    limit: int = FOF_MAX_CANDIDATES,
+) -> Dict[int, int]:
+    """
+    Candidatos a 2 saltos do usuário -> número de amigos em comum
+
+    Só os `max_friends` amigos mais recentes são expandidos, então o custo
+    não cresce com o grau de quem tem muitos amigos. Exclui o próprio
+    usuário e quem já tem relação com ele (amigo ou pedido pendente).
+    Ordenado por amigos em comum, do maior para o menor.
+    """
+    accepted = friendship_edges(user_id, "accepted")
+    first_hop = (
+        select(accepted.c.other_id)
+        .order_by(accepted.c.created_at.desc())
+        .limit(max_friends)
+        .subquery("first_hop")
+    )
+    hops = _second_hop(first_hop)
+    related = friendship_edges(user_id)
+    mutual = func.count().label("mutual")
+    rows = db.execute(
+        select(hops.c.candidate_id, mutual)
+        .where(
+            hops.c.candidate_id != user_id,
+            hops.c.candidate_id.not_in(select(related.c.other_id)),
+        )
+        .group_by(hops.c.candidate_id)
+        .order_by(mutual.desc(), hops.c.candidate_id)
+        .limit(limit)
+    ).all()
+    return dict(rows)
+
+
+def list_friend_profiles(
+    db: Session,
+    user_id: int,
+    status: str = "accepted",
+    direction: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    name_prefix: Optional[str] = None,
+    search: Optional[str] = None,
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Arestas do usuário já com o perfil do outro lado, em uma query
+
+    - direction: None (todas), "sent" (pedidos do usuário) ou "received"
+    - cursor: continua depois do último item da página anterior
+    - name_prefix: prefixo de alguma palavra do nome/nickname
+    - search: busca por nome (sem acentos, tolera erros), ordenada por relevância
+      e sem cursor
+
+    Retorna as linhas (other_id, created_at, full_name, nickname, university,
+    course, semester, photo_url), ordenadas da mais recente para a mais
+    antiga, e o cursor da próxima página (None na última).
+    """
+    edges = friendship_edges(user_id, status)
+    stmt = select(
+        edges.c.other_id,
+        edges.c.created_at,
+        Profile.full_name,
+        Profile.nickname,
+        Profile.university,
+        Profile.course,
+        Profile.semester,
+        Profile.photo_url,
+    ).join(Profile, Profile.user_id == edges.c.other_id)
+
+    if direction == "sent":
+        stmt = stmt.where(edges.c.requester_id == user_id)
+    elif direction == "received":
+        stmt = stmt.where(edges.c.requester_id != user_id)
+
+    if name_prefix:
+        stmt = stmt.where(name_prefix_filter(name_prefix))
+    if search:
+        # Busca volta os mais relevantes primeiro, sem paginação por cursor
+        stmt = stmt.where(name_match(db, search))
+        return db.execute(
+            stmt.order_by(name_rank(search).desc(), edges.c.created_at.desc()).limit(limit)
+        ).all(), None
+
+    if cursor:
+        created_at, other_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                edges.c.created_at < created_at,
+                and_(edges.c.created_at == created_at, edges.c.other_id < other_id),
+            )
+        )
+
+    rows = db.execute(
+        stmt.order_by(edges.c.created_at.desc(), edges.c.other_id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].other_id)
+    return rows, next_cursor
+
+
+def get_pair(db: Session, user_id: int, other_id: int) -> Optional[Friendship]:
+    return db.query(Friendship).filter(*pair_filter(user_id, other_id)).first()
+
+
+@dataclass
+class FriendAdjacency:
+    """
+    Vizinhança de um usuário no grafo de amizades
+
+    - accepted: amigos
+    - pending_out: pedidos enviados, aguardando resposta
+    - pending_in: pedidos recebidos
+    """
+
+    user_id: int
+    accepted: Set[int] = field(default_factory=set)
+    pending_out: Set[int] = field(default_factory=set)
+    pending_in: Set[int] = field(default_factory=set)
+
+    def status(self, other_id: int) -> str:
+        """Status no vocabulário de perfis/amizades: self, friends, pending, incoming, none"""
+        if other_id == self.user_id:
+            return "self"
+        if other_id in self.accepted:
             return "friends"
-        if incoming.status == "pending":
+        if other_id in self.pending_out:
+            return "pending"
+        if other_id in self.pending_in:
             return "incoming"
+        return "none"
+
+    def directory_status(self, other_id: int) -> str:
+        """Status no vocabulário do diretório: connected, pending_sent, pending_received, not_connected"""
+        if other_id in self.accepted:
+            return "connected"
+        if other_id in self.pending_out:
+            return "pending_sent"
+        if other_id in self.pending_in:
+            return "pending_received"
+        return "not_connected"
+
+
+def get_adjacency(db: Session, user_id: int) -> FriendAdjacency:
+    """
+    Adjacência do usuário, carregada com uma query e guardada na sessão
+
+    Como a sessão vive uma requisição, todos os cards de uma página
+    consultam o status em O(1) depois da primeira chamada.
+    """
+    cache = db.info.setdefault(_ADJACENCY_KEY, {})
+    adjacency = cache.get(user_id)
+    if adjacency is not None:
+        return adjacency
+
+    adjacency = FriendAdjacency(user_id)
+    edges = friendship_edges(user_id)
+    rows = db.execute(select(edges.c.other_id, edges.c.requester_id, edges.c.status)).all()
+    for other_id, requester_id, status in rows:
+        if status == "accepted":
+            adjacency.accepted.add(other_id)
+        elif status == "pending":
+            (adjacency.pending_out if requester_id == user_id else adjacency.pending_in).add(other_id)
 
-    return "none"
+    cache[user_id] = adjacency
+    return adjacency
+
+
+def invalidate_adjacency(db: Session, *user_ids: int) -> None:
+    """Descarta a adjacência em cache dos usuários informados"""
+    cache = db.info.get(_ADJACENCY_KEY)
+    if cache:
+        for user_id in user_ids:
+            cache.pop(user_id, None)
+
+
+def get_friend_status(db: Session, viewer_id: int, owner_id: int) -> str:
+    return get_adjacency(db, viewer_id).status(owner_id)
 
 
 def create_friendship(db: Session, requester_id: int, target_id: int) -> str:
-    existing = (
-        db.query(Friendship)
-        .filter(
-            Friendship.user_id == requester_id,
-            Friendship.friend_id == target_id,
-        )
-        .first()
-    )
+    existing = get_pair(db, requester_id, target_id)
     if existing:
+        # Pedido cruzado: o alvo já tinha pedido, então vira amizade
+        if existing.status == "pending" and existing.requester_id == target_id:
+            existing.status = "accepted"
+            db.commit()
+            invalidate_adjacency(db, requester_id, target_id)
+            return "friends"
         return existing.status
 
-    reverse = (
-        db.query(Friendship)
-        .filter(
-            Friendship.user_id == target_id,
-            Friendship.friend_id == requester_id,
-        )
-        .first()
-    )
-    if reverse and reverse.status == "pending":
-        reverse.status = "accepted"
-        db.add(reverse)
-        db.add(
-            Friendship(
-                user_id=requester_id,
-                friend_id=target_id,
-                status="accepted",
-            )
-        )
-        db.commit()
-        return "friends"
-
-    db.add(
-        Friendship(
-            user_id=requester_id,
-            friend_id=target_id,
-            status="pending",
-        )
-    )
+    db.add(Friendship.between(requester_id, target_id))
     db.commit()
+    invalidate_adjacency(db, requester_id, target_id)
     return "pending"
 
 
 def respond_friendship(db: Session, requester_id: int, target_id: int, accept: bool) -> str:
-    outgoing = (
-        db.query(Friendship)
-        .filter(
-            Friendship.user_id == requester_id,
-            Friendship.friend_id == target_id,
-        )
-        .first()
-    )
-    if not outgoing:
+    friendship = get_pair(db, requester_id, target_id)
+    if not friendship or (friendship.status == "pending" and friendship.requester_id != requester_id):
         raise ValueError("Pedido de amizade não encontrado.")
 
     if accept:
-        outgoing.status = "accepted"
-        reverse = (
-            db.query(Friendship)
-            .filter(
-                Friendship.user_id == target_id,
-                Friendship.friend_id == requester_id,
-            )
-            .first()
-        )
-        if reverse:
-            reverse.status = "accepted"
-        else:
-            db.add(
-                Friendship(
-                    user_id=target_id,
-                    friend_id=requester_id,
-                    status="accepted",
-                )
-            )
+        friendship.status = "accepted"
         db.commit()
+        invalidate_adjacency(db, requester_id, target_id)
         return "friends"
     else:
-        db.delete(outgoing)
-        db.query(Friendship).filter(
-            Friendship.user_id == target_id,
-            Friendship.friend_id == requester_id,
-        ).delete(synchronize_session=False)
+        db.delete(friendship)
         db.commit()
+        invalidate_adjacency(db, requester_id, target_id)
         return "none"
+
+
+def remove_friendship(db: Session, user_id: int, other_id: int) -> int:
+    """Remove a amizade (ou pedido pendente) do par; retorna linhas removidas"""
+    deleted = (
+        db.query(Friendship)
+        .filter(*pair_filter(user_id, other_id))
+        .delete(synchronize_session=False)
+    )
+    if deleted:
+        db.commit()
+        invalidate_adjacency(db, user_id, other_id)
+    return deleted
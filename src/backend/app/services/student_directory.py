@@ -3,13 +3,16 @@ Serviços para o diretório de alunos (Módulo 4: Descoberta e Agrupamento)
 ADAPTADO PARA O NOVO SCHEMA LOCAL
 """
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_, and_
-from typing import List, Optional
+from sqlalchemy import func
+from typing import Dict, List, Optional
 import logging
 
 from app.models.user import User
 from app.models.profile import Profile
-from app.models.social import Friendship, Interest, UserInterest
+from app.models.social import Interest, UserInterest
+from app.services.card_enrichment import CardEnricher
+from app.services.name_search import name_match, name_rank
+from app.services.social_graph import get_adjacency, friends_of_friends, mutual_friend_counts
 from app.schemas.student_directory import (
     StudentCardOut,
     StudentFilters,
@@ -22,6 +25,29 @@ from app.schemas.student_directory import (
 
 logger = logging.getLogger(__name__)
 
+# Peso de cada amigo em comum no ranking de sugestões (em pontos do score
+# de interesses, 0-100), até o teto de amigos considerados
+MUTUAL_FRIEND_WEIGHT = 10.0
+MUTUAL_FRIEND_CAP = 5
+
+# Candidatos por interesses em comum avaliados por sugestão (os que mais
+# compartilham), somados aos amigos de amigos
+SUGGESTION_INTEREST_CANDIDATES = 200
+
+
+def _directory_statuses(db: Session, user_id: int, other_ids: List[int]) -> Dict[int, str]:
+    adjacency = get_adjacency(db, user_id)
+    return {other_id: adjacency.directory_status(other_id) for other_id in other_ids}
+
+
+card_enricher = CardEnricher(
+    link_owner=UserInterest.user_id,
+    link_interest=UserInterest.interest_id,
+    interest_id=Interest.id,
+    interest_name=Interest.name,
+    statuses=_directory_statuses,
+)
+
 
 class StudentDirectoryService:
     """Serviço para descoberta e exploração de alunos"""
@@ -46,12 +72,11 @@ class StudentDirectoryService:
             Profile.is_public == True  # Apenas perfis públicos
         )
 
-        # RF054 - Busca por nome (mínimo 2 caracteres)
+        # RF054 - Busca por nome (mínimo 2 caracteres, sem diferenciar acentos)
+        search_term = None
         if filters.search_name and len(filters.search_name) >= 2:
-            search_pattern = f"%{filters.search_name.lower()}%"
-            query = query.filter(
-                func.lower(Profile.full_name).like(search_pattern)
-            )
+            search_term = filters.search_name
+            query = query.filter(name_match(db, search_term))
 
         # RF048 - Filtro por universidade (OR - múltipla seleção)
         if filters.universities:
@@ -80,8 +105,10 @@ class StudentDirectoryService:
         # Total de resultados (antes da paginação)
         total = query.count()
 
-        # Ordenação
-        if filters.order_by == "name":
+        # Ordenação (com busca por nome, o padrão é relevância)
+        if search_term and filters.order_by in ("random", "relevance"):
+            query = query.order_by(name_rank(search_term).desc(), Profile.full_name)
+        elif filters.order_by == "name":
             query = query.order_by(Profile.full_name)
         elif filters.order_by == "recent":
             query = query.order_by(Profile.created_at.desc())
@@ -94,27 +121,18 @@ class StudentDirectoryService:
         # Paginação
         profiles = query.offset(filters.offset).limit(filters.limit).all()
 
+        # Interesses, status de amizade, compatibilidade (se filtrou por
+        # interesses) e amigos em comum da página inteira, em lote
+        user_ids = [p.user_id for p in profiles]
+        extras = card_enricher.enrich(
+            db, current_user_id, user_ids, with_compatibility=bool(filters.interests)
+        )
+        mutual_counts = mutual_friend_counts(db, current_user_id, user_ids)
+
         # Converter para StudentCardOut
         students = []
         for profile in profiles:
-            # Buscar os 3 principais interesses
-            user_interests = db.query(Interest.name).join(UserInterest).filter(
-                UserInterest.user_id == profile.user_id
-            ).limit(3).all()
-            interests_list = [interest.name for interest in user_interests]
-
-            # Verificar status de amizade
-            friendship_status = StudentDirectoryService._get_friendship_status(
-                db, current_user_id, profile.user_id
-            )
-
-            # Calcular score de compatibilidade (se filtrou por interesses)
-            compatibility_score = None
-            if filters.interests:
-                compatibility_score = StudentDirectoryService._calculate_compatibility(
-                    db, current_user_id, profile.user_id
-                )
-
+            card = extras[profile.user_id]
             students.append(StudentCardOut(
                 id=profile.user_id,
                 full_name=profile.full_name,
@@ -123,9 +141,10 @@ class StudentDirectoryService:
                 course=profile.course,
                 entry_year=None,  # Não existe no novo schema
                 photo_url=profile.photo_url,
-                interests=interests_list,
-                friendship_status=friendship_status,
-                compatibility_score=compatibility_score
+                interests=card.interests,
+                friendship_status=card.friendship_status,
+                compatibility_score=card.compatibility_score,
+                mutual_friends_count=mutual_counts.get(profile.user_id, 0)
             ))
 
         has_more = (filters.offset + filters.limit) < total
@@ -151,24 +170,7 @@ class StudentDirectoryService:
         - 'pending_received': Solicitação recebida (pode aceitar)
         - 'not_connected': Não são amigos
         """
-        # Verificar se existe friendship
-        friendship = db.query(Friendship).filter(
-            or_(
-                and_(Friendship.user_id == user_id, Friendship.friend_id == other_user_id),
-                and_(Friendship.user_id == other_user_id, Friendship.friend_id == user_id)
-            )
-        ).first()
-
-        if not friendship:
-            return "not_connected"
-
-        if friendship.status == "accepted":
-            return "connected"
-
-        if friendship.user_id == user_id:
-            return "pending_sent"
-        else:
-            return "pending_received"
+        return get_adjacency(db, user_id).directory_status(other_user_id)
 
     @staticmethod
     def _calculate_compatibility(
@@ -320,18 +322,14 @@ class StudentDirectoryService:
         # Paginação (ordem aleatória por padrão)
         profiles = query.order_by(func.random()).offset(offset).limit(limit).all()
 
+        user_ids = [p.user_id for p in profiles]
+        extras = card_enricher.enrich(db, current_user_id, user_ids)
+        mutual_counts = mutual_friend_counts(db, current_user_id, user_ids)
+
         # Converter para StudentCardOut
         students = []
         for profile in profiles:
-            user_interests = db.query(Interest.name).join(UserInterest).filter(
-                UserInterest.user_id == profile.user_id
-            ).limit(3).all()
-            interests_list = [interest.name for interest in user_interests]
-
-            friendship_status = StudentDirectoryService._get_friendship_status(
-                db, current_user_id, profile.user_id
-            )
-
+            card = extras[profile.user_id]
             students.append(StudentCardOut(
                 id=profile.user_id,
                 full_name=profile.full_name,
@@ -340,9 +338,10 @@ class StudentDirectoryService:
                 course=profile.course,
                 entry_year=None,  # Não existe no novo schema
                 photo_url=profile.photo_url,
-                interests=interests_list,
-                friendship_status=friendship_status,
-                compatibility_score=None
+                interests=card.interests,
+                friendship_status=card.friendship_status,
+                compatibility_score=None,
+                mutual_friends_count=mutual_counts.get(profile.user_id, 0)
             ))
 
         # Buscar cursos disponíveis nesta universidade
@@ -369,6 +368,18 @@ class StudentDirectoryService:
             has_more=(offset + limit) < total
         )
 
+    @staticmethod
+    def _suggestion_reason(common_interests: int, mutual_friends: int) -> str:
+        """Texto do motivo da sugestão a partir dos sinais que a geraram"""
+        if mutual_friends and common_interests:
+            return (
+                f"Vocês têm {mutual_friends} amigo(s) em comum "
+                f"e compartilham {common_interests} interesse(s)"
+            )
+        if mutual_friends:
+            return f"Vocês têm {mutual_friends} amigo(s) em comum"
+        return f"Vocês compartilham {common_interests} interesse(s) em comum"
+
     @staticmethod
     def get_connection_suggestions(
         db: Session,
@@ -376,98 +387,99 @@ class StudentDirectoryService:
         limit: int = 10
     ) -> SuggestionsResponse:
         """
-        RF051 - Sugestões de conexão personalizadas baseadas em interesses comuns
+        RF051 - Sugestões de conexão personalizadas
 
         Algoritmo:
-        1. Buscar interesses do usuário atual
-        2. Encontrar outros usuários com interesses em comum
-        3. Calcular score de compatibilidade (Jaccard similarity)
-        4. Ordenar por score de compatibilidade (descending)
-        5. Retornar top N sugestões
+        1. Gerar candidatos em SQL: amigos de amigos (2 saltos) ∪ quem
+           compartilha mais interesses com o usuário (até
+           SUGGESTION_INTEREST_CANDIDATES)
+        2. Amigos em comum exatos e compatibilidade (Jaccard) de todos os
+           candidatos, em uma query cada
+        3. Ordenar por score + peso dos amigos em comum (descending)
+        4. Montar os cards só das top N sugestões, em lote (CardEnricher)
 
         Regras:
         - Não sugerir amigos existentes (status='accepted')
         - Não sugerir solicitações já enviadas (pending_sent)
         - Não sugerir o próprio usuário
         - Apenas perfis públicos
-        - Usuário deve ter pelo menos 1 interesse para sugestões
+        - Usuário deve ter pelo menos 1 interesse ou 1 amigo para sugestões
         """
         # Buscar interesses do usuário atual
-        user_interests = db.query(UserInterest.interest_id).filter(
-            UserInterest.user_id == user_id
-        ).all()
-
-        user_interest_ids = set([ui[0] for ui in user_interests])
+        user_interest_ids = {
+            interest_id
+            for (interest_id,) in db.query(UserInterest.interest_id).filter(UserInterest.user_id == user_id)
+        }
+
+        # Candidatos a 2 saltos + candidatos por interesses em comum
+        candidate_ids = set(friends_of_friends(db, user_id))
+        if user_interest_ids:
+            common = func.count().label("common")
+            candidate_ids.update(
+                other_id
+                for (other_id, _) in db.query(UserInterest.user_id, common)
+                .filter(
+                    UserInterest.interest_id.in_(user_interest_ids),
+                    UserInterest.user_id != user_id,
+                )
+                .group_by(UserInterest.user_id)
+                .order_by(common.desc(), UserInterest.user_id)
+                .limit(SUGGESTION_INTEREST_CANDIDATES)
+            )
 
-        if not user_interest_ids:
+        if not user_interest_ids and not candidate_ids:
             return SuggestionsResponse(
                 suggestions=[],
                 total=0,
                 message="Complete seu perfil com mais interesses para receber sugestões"
             )
 
-        # Query base: perfis públicos, não o próprio usuário
+        # Não sugerir amigos ou solicitações pendentes do usuário
+        adjacency = get_adjacency(db, user_id)
+        candidate_ids -= adjacency.accepted | adjacency.pending_out
+
+        # Query base: perfis públicos dos candidatos
         profiles = db.query(Profile).filter(
-            Profile.user_id != user_id,
+            Profile.user_id.in_(candidate_ids),
             Profile.is_public == True
-        ).all()
-
-        suggestions_data = []
-
-        for profile in profiles:
-            # Buscar interesses do outro usuário
-            other_interests = db.query(UserInterest.interest_id).filter(
-                UserInterest.user_id == profile.user_id
-            ).all()
-
-            other_interest_ids = set([oi[0] for oi in other_interests])
-
-            if not other_interest_ids:
-                continue
-
-            # Calcular interesses em comum
-            common_interests_ids = user_interest_ids.intersection(other_interest_ids)
-
-            if not common_interests_ids:
-                continue
-
-            # Calcular Jaccard similarity
-            compatibility_score = StudentDirectoryService._calculate_compatibility(
-                db, user_id, profile.user_id
-            )
-
-            # Buscar nomes dos interesses em comum
-            common_interest_names = db.query(Interest.name).filter(
-                Interest.id.in_(common_interests_ids)
-            ).all()
-            common_interests_list = [i[0] for i in common_interest_names]
-
-            # Verificar se já são amigos ou há solicitação pendente
-            friendship = db.query(Friendship).filter(
-                or_(
-                    and_(Friendship.user_id == user_id, Friendship.friend_id == profile.user_id),
-                    and_(Friendship.user_id == profile.user_id, Friendship.friend_id == user_id)
-                )
-            ).first()
-
-            # Não sugerir amigos ou solicitações pendentes do usuário
-            if friendship and (friendship.status == "accepted" or
-                              (friendship.user_id == user_id and friendship.status == "pending")):
-                continue
-
-            # Buscar interesses do perfil (para StudentCardOut)
-            profile_interests = db.query(Interest.name).join(UserInterest).filter(
-                UserInterest.user_id == profile.user_id
-            ).limit(3).all()
-            interests_list = [i[0] for i in profile_interests]
-
-            # Buscar status de amizade
-            friendship_status = StudentDirectoryService._get_friendship_status(
-                db, user_id, profile.user_id
-            )
-
-            suggestions_data.append({
-                "student": StudentCardOut(
+        ).all() if candidate_ids else []
+        profile_ids = [profile.user_id for profile in profiles]
+
+        # Amigos em comum exatos (os mesmos dos cards do explorar) e Jaccard
+        mutual_counts = mutual_friend_counts(db, user_id, profile_ids)
+        scores = card_enricher.compatibility_scores(db, user_id, profile_ids)
+
+        ranked = sorted(
+            profiles,
+            key=lambda profile: (
+                scores[profile.user_id]
+                + MUTUAL_FRIEND_WEIGHT * min(mutual_counts.get(profile.user_id, 0), MUTUAL_FRIEND_CAP)
+            ),
+            reverse=True,
+        )[:limit]
+
+        # Cards e interesses em comum só da página
+        page_ids = [profile.user_id for profile in ranked]
+        extras = card_enricher.enrich(db, user_id, page_ids)
+        common_names: Dict[int, List[str]] = {}
+        if page_ids and user_interest_ids:
+            rows = db.query(UserInterest.user_id, Interest.name).join(
+                Interest, Interest.id == UserInterest.interest_id
+            ).filter(
+                UserInterest.user_id.in_(page_ids),
+                UserInterest.interest_id.in_(user_interest_ids)
+            ).order_by(UserInterest.user_id, Interest.id)
+            for other_id, name in rows:
+                common_names.setdefault(other_id, []).append(name)
+
+        suggestions = []
+        for profile in ranked:
+            card = extras[profile.user_id]
+            mutual_friends = mutual_counts.get(profile.user_id, 0)
+            common_interests_list = common_names.get(profile.user_id, [])
+            compatibility_score = scores[profile.user_id]
+            suggestions.append(SuggestionOut(
+                student=StudentCardOut(
                     id=profile.user_id,
                     full_name=profile.full_name,
                     nickname=profile.nickname,
@@ -475,26 +487,17 @@ class StudentDirectoryService:
                     course=profile.course,
                     entry_year=None,
                     photo_url=profile.photo_url,
-                    interests=interests_list,
-                    friendship_status=friendship_status,
-                    compatibility_score=compatibility_score
+                    interests=card.interests,
+                    friendship_status=card.friendship_status,
+                    compatibility_score=compatibility_score,
+                    mutual_friends_count=mutual_friends
                 ),
-                "compatibility_score": compatibility_score,
-                "common_interests": common_interests_list,
-                "reason": f"Vocês compartilham {len(common_interests_list)} interesse(s) em comum"
-            })
-
-        # Ordenar por score de compatibilidade (descending)
-        suggestions_data.sort(key=lambda x: x["compatibility_score"], reverse=True)
-
-        # Limitar resultados
-        suggestions_data = suggestions_data[:limit]
-
-        # Converter para SuggestionOut
-        from app.schemas.student_directory import SuggestionOut
-        suggestions = [
-            SuggestionOut(**item) for item in suggestions_data
-        ]
+                compatibility_score=compatibility_score,
+                common_interests=common_interests_list,
+                reason=StudentDirectoryService._suggestion_reason(
+                    len(common_interests_list), mutual_friends
+                ),
+            ))
 
         message = None
         if not suggestions:
@@ -4,7 +4,7 @@ ADAPTADO PARA O SCHEMA EXISTENTE DO SUPABASE (sem migrations)
 """
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, or_, and_, text
-from typing import List, Optional
+from typing import Dict, List, Optional
 import logging
 from uuid import UUID
 
@@ -24,10 +24,42 @@ from app.schemas.student_directory import (
     SuggestionOut,
     SuggestionsResponse
 )
+from app.services.card_enrichment import CardEnricher
 
 logger = logging.getLogger(__name__)
 
 
+def _connection_statuses(db: Session, user_id: UUID, other_ids: List[UUID]) -> Dict[UUID, str]:
+    """Status de conexão da página inteira em uma query (ver _get_connection_status)"""
+    if not other_ids:
+        return {}
+    connections = db.query(Connection).filter(
+        or_(
+            and_(Connection.requester_id == user_id, Connection.addressee_id.in_(other_ids)),
+            and_(Connection.addressee_id == user_id, Connection.requester_id.in_(other_ids))
+        )
+    ).all()
+
+    statuses = {}
+    for connection in connections:
+        sent = connection.requester_id == user_id
+        other_id = connection.addressee_id if sent else connection.requester_id
+        if connection.status == "aceita":
+            statuses[other_id] = "connected"
+        else:
+            statuses[other_id] = "pending_sent" if sent else "pending_received"
+    return statuses
+
+
+card_enricher = CardEnricher(
+    link_owner=ProfileInterest.profile_id,
+    link_interest=ProfileInterest.interest_id,
+    interest_id=Interest.id,
+    interest_name=Interest.name,
+    statuses=_connection_statuses,
+)
+
+
 class StudentDirectoryService:
     """Serviço para descoberta e exploração de alunos"""
 
@@ -106,26 +138,16 @@ class StudentDirectoryService:
         # Paginação
         profiles = query.offset(filters.offset).limit(filters.limit).all()
 
+        # Interesses, status de conexão e compatibilidade (se filtrou por
+        # interesses) da página inteira, em lote
+        extras = card_enricher.enrich(
+            db, current_user_id, [p.id for p in profiles], with_compatibility=bool(filters.interests)
+        )
+
         # Converter para StudentCardOut
         students = []
         for profile in profiles:
-            # Buscar os 3 principais interesses
-            user_interests = db.query(Interest.name).join(ProfileInterest).filter(
-                ProfileInterest.profile_id == profile.id
-            ).limit(3).all()
-            interests_list = [interest.name for interest in user_interests]
-
-            # Verificar status de conexão
-            connection_status = StudentDirectoryService._get_connection_status(
-                db, current_user_id, profile.id
-            )
-
-            # Calcular score de compatibilidade (se filtrou por interesses)
-            compatibility_score = None
-            if filters.interests:
-                compatibility_score = StudentDirectoryService._calculate_compatibility(
-                    db, current_user_id, profile.id
-                )
+            card = extras[profile.id]
 
             # Nome da universidade
             university_name = profile.university.name if profile.university else None
@@ -138,9 +160,9 @@ class StudentDirectoryService:
                 course=profile.course,
                 entry_year=profile.entry_year,
                 photo_url=profile.photo_url,
-                interests=interests_list,
-                friendship_status=connection_status,
-                compatibility_score=compatibility_score
+                interests=card.interests,
+                friendship_status=card.friendship_status,
+                compatibility_score=card.compatibility_score
             ))
 
         has_more = (filters.offset + filters.limit) < total
@@ -405,16 +427,14 @@ class StudentDirectoryService:
         # Limitar resultados
         suggestions_data = suggestions_data[:limit]
 
+        # Top 3 interesses de todos os sugeridos em uma query
+        top_interests = card_enricher.top_interests(db, [data['profile'].id for data in suggestions_data])
+
         # Converter para SuggestionOut
         suggestions = []
         for data in suggestions_data:
             profile = data['profile']
-
-            # Buscar top 3 interesses do candidato
-            candidate_interest_names = db.query(Interest.name).join(ProfileInterest).filter(
-                ProfileInterest.profile_id == profile.id
-            ).limit(3).all()
-            interests_list = [i.name for i in candidate_interest_names]
+            interests_list = top_interests.get(profile.id, [])
 
             # Gerar motivo da sugestão
             reason = f"Vocês compartilham {data['common_count']} interesse(s) em comum"
@@ -509,18 +529,12 @@ class StudentDirectoryService:
         # Paginação (ordem aleatória por padrão)
         profiles = query.order_by(func.random()).offset(offset).limit(limit).all()
 
+        extras = card_enricher.enrich(db, current_user_id, [p.id for p in profiles])
+
         # Converter para StudentCardOut
         students = []
         for profile in profiles:
-            user_interests = db.query(Interest.name).join(ProfileInterest).filter(
-                ProfileInterest.profile_id == profile.id
-            ).limit(3).all()
-            interests_list = [interest.name for interest in user_interests]
-
-            connection_status = StudentDirectoryService._get_connection_status(
-                db, current_user_id, profile.id
-            )
-
+            card = extras[profile.id]
             students.append(StudentCardOut(
                 id=profile.id,
                 full_name=profile.full_name,
@@ -529,8 +543,8 @@ class StudentDirectoryService:
                 course=profile.course,
                 entry_year=profile.entry_year,
                 photo_url=profile.photo_url,
-                interests=interests_list,
-                friendship_status=connection_status,
+                interests=card.interests,
+                friendship_status=card.friendship_status,
                 compatibility_score=None
             ))
 
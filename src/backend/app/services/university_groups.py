@@ -48,7 +48,7 @@ class UniversityGroupService:
         db.commit()
         db.refresh(group)
 
-        logger.info(f"Created university group: {university_name}")
+        logger.info("Created university group: %s", university_name)
 
         return group
 
@@ -59,7 +59,7 @@ class UniversityGroupService:
         Retorna True se adicionado, False se já era membro
         """
         if not university_name:
-            logger.warning(f"User {user_id} has no university, skipping group assignment")
+            logger.warning("User %s has no university, skipping group assignment", user_id)
             return False
 
         # Garantir que o grupo existe
@@ -83,7 +83,7 @@ class UniversityGroupService:
         db.add(member)
         db.commit()
 
-        logger.info(f"Added user {user_id} to group {university_name}")
+        logger.info("Added user %s to group %s", user_id, university_name)
 
         return True
 
@@ -111,7 +111,7 @@ class UniversityGroupService:
         db.delete(member)
         db.commit()
 
-        logger.info(f"Removed user {user_id} from group {university_name}")
+        logger.info("Removed user %s from group %s", user_id, university_name)
 
         return True
 
@@ -159,8 +159,10 @@ class UniversityGroupService:
                 added_count += 1
 
         logger.info(
-            f"Synced university groups: {len(universities_created)} groups, "
-            f"{added_count} users added"
+            "Synced university groups: %s groups, "
+            "%s users added",
+            len(universities_created),
+            added_count,
         )
 
         return {
@@ -0,0 +1,223 @@
+"""
+Benchmark de serialização e compressão das respostas grandes da API
+
+Mede, para o feed de threads (20 threads com 3 top comments cada) e para o
+leaderboard (500 entradas):
+
+- tempo de serialização em cada pipeline de JSON
+- bytes no fio sem compressão, com gzip e com brotli
+- tempo de compressão
+
+Uso (a partir de src/backend):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --repeat 500 --json results/serialization.json
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.schemas.gamification import LeaderboardEntry
+from app.schemas.thread import AuthorOut, CommentOut, ThreadOut
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+WORDS = (
+    "bolsa intercâmbio estágio faculdade engenharia mentoria prova cálculo "
+    "processo seletivo dicas moradia república bandejão monitoria pesquisa "
+    "iniciação científica entrevista currículo networking evento palestra"
+).split()
+
+
+def _sentence(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def _author(rng: random.Random, user_id: int) -> AuthorOut:
+    return AuthorOut(
+        email=f"aluno{user_id}@universidade.com",
+        nickname=f"aluno_{user_id}",
+        full_name=f"Aluno Número {user_id}",
+        university=rng.choice(["USP", "UNICAMP", "FGV", "Insper", "UFRJ"]),
+        course=rng.choice(["Engenharia", "Direito", "Economia", "Medicina"]),
+        photo_url=f"/media/avatars/{user_id}_{rng.getrandbits(64):016x}.jpg",
+    )
+
+
+def build_thread_feed(n_threads: int = 20, comments_per_thread: int = 3, seed: int = 42) -> List[ThreadOut]:
+    rng = random.Random(seed)
+    now = datetime(2025, 11, 20, 12, 0, 0)
+    threads = []
+    for thread_id in range(1, n_threads + 1):
+        user_id = rng.randint(1, 5000)
+        comments = [
+            CommentOut(
+                id=thread_id * 100 + c,
+                content=_sentence(rng, rng.randint(15, 60)),
+                thread_id=thread_id,
+                user_id=rng.randint(1, 5000),
+                created_at=now - timedelta(minutes=rng.randint(1, 10000)),
+                author=_author(rng, rng.randint(1, 5000)),
+                upvotes=rng.randint(0, 80),
+                downvotes=rng.randint(0, 10),
+            )
+            for c in range(comments_per_thread)
+        ]
+        threads.append(
+            ThreadOut(
+                id=thread_id,
+                title=_sentence(rng, 8)[:100],
+                description=_sentence(rng, rng.randint(40, 120)),
+                category=rng.choice(["geral", "faculdade"]),
+                tags=rng.sample(WORDS, 3),
+                user_id=user_id,
+                university="USP",
+                created_at=now - timedelta(hours=thread_id),
+                author=_author(rng, user_id),
+                upvotes=rng.randint(0, 300),
+                downvotes=rng.randint(0, 30),
+                user_vote=rng.choice([-1, 0, 1]),
+                top_comments=comments,
+            )
+        )
+    return threads
+
+
+def build_leaderboard(n_entries: int = 500, seed: int = 42) -> List[LeaderboardEntry]:
+    rng = random.Random(seed)
+    points = sorted((rng.randint(10, 5000) for _ in range(n_entries)), reverse=True)
+    return [
+        LeaderboardEntry(
+            rank=rank,
+            user_id=rng.randint(1, 100000),
+            points=p,
+            level="Embaixador" if p > 1000 else "Conector" if p > 500 else "Colaborador",
+            full_name=f"Aluno Número {rank}",
+            photo_url=f"/media/avatars/{rank}_{rng.getrandbits(64):016x}.jpg",
+        )
+        for rank, p in enumerate(points, start=1)
+    ]
+
+
+def _pipelines(model_type) -> Dict[str, Callable[[list], bytes]]:
+    """Pipelines de serialização equivalentes aos caminhos do FastAPI"""
+    adapter = TypeAdapter(List[model_type])
+
+    def stdlib(items):
+        # JSONResponse padrão: jsonable_encoder + json.dumps
+        return json.dumps(
+            jsonable_encoder(items), ensure_ascii=False, allow_nan=False,
+            indent=None, separators=(",", ":"),
+        ).encode("utf-8")
+
+    def pydantic_json(items):
+        # Fast path do FastAPI recente (response_model + classe padrão)
+        return adapter.dump_json(items)
+
+    pipelines = {"stdlib_json": stdlib, "pydantic_dump_json": pydantic_json}
+
+    if orjson is not None:
+        def orjson_encoder(items):
+            # ORJSONResponse em FastAPI sem o fast path do pydantic
+            return orjson.dumps(jsonable_encoder(items), option=orjson.OPT_NON_STR_KEYS)
+
+        def orjson_pydantic(items):
+            # ORJSONResponse em FastAPI recente (serialize -> orjson)
+            return orjson.dumps(adapter.dump_python(items, mode="json"), option=orjson.OPT_NON_STR_KEYS)
+
+        pipelines["orjson_jsonable_encoder"] = orjson_encoder
+        pipelines["orjson_pydantic"] = orjson_pydantic
+
+    return pipelines
+
+
+def _time_ms(fn: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(repeat: int = 200) -> Dict:
+    payloads = {
+        "thread_feed": (build_thread_feed(), ThreadOut),
+        "leaderboard": (build_leaderboard(), LeaderboardEntry),
+    }
+
+    results = {}
+    for name, (items, model_type) in payloads.items():
+        pipelines = _pipelines(model_type)
+        serialization = {
+            pipeline: round(_time_ms(lambda: fn(items), repeat), 3)
+            for pipeline, fn in pipelines.items()
+        }
+
+        body = pipelines["stdlib_json"](items)
+        wire = {"identity": len(body)}
+        compression_ms = {}
+
+        wire["gzip"] = len(gzip.compress(body, compresslevel=6))
+        compression_ms["gzip"] = round(_time_ms(lambda: gzip.compress(body, compresslevel=6), repeat), 3)
+        if brotli is not None:
+            wire["br"] = len(brotli.compress(body, quality=4))
+            compression_ms["br"] = round(_time_ms(lambda: brotli.compress(body, quality=4), repeat), 3)
+
+        results[name] = {
+            "items": len(items),
+            "serialization_ms": serialization,
+            "bytes_on_wire": wire,
+            "compression_ms": compression_ms,
+        }
+    return results
+
+
+def print_report(results: Dict) -> None:
+    for name, data in results.items():
+        print(f"\n## {name} ({data['items']} itens)")
+        baseline = data["serialization_ms"]["stdlib_json"]
+        print("\n| pipeline | mediana (ms) | vs stdlib |")
+        print("|---|---:|---:|")
+        for pipeline, ms in data["serialization_ms"].items():
+            print(f"| {pipeline} | {ms:.3f} | {baseline / ms:.2f}x |")
+
+        identity = data["bytes_on_wire"]["identity"]
+        print("\n| encoding | bytes | % do original | compressão (ms) |")
+        print("|---|---:|---:|---:|")
+        for encoding, size in data["bytes_on_wire"].items():
+            ms = data["compression_ms"].get(encoding, 0.0)
+            print(f"| {encoding} | {size} | {100 * size / identity:.1f}% | {ms:.3f} |")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="Repetições por medição")
+    parser.add_argument("--json", dest="json_path", help="Salvar resultados em JSON")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
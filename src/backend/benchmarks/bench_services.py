@@ -0,0 +1,80 @@
+"""
+Benchmarks das funções de serviço mais pesadas
+
+Não roda na suíte normal (arquivos bench_* não são coletados); execute
+explicitamente a partir de src/backend:
+
+    pytest benchmarks/bench_services.py --benchmark-json benchmarks/results/services.json
+    python -m benchmarks.compare benchmarks/results/baseline.json benchmarks/results/services.json
+
+Cada benchmark também registra a quantidade de statements SQL por chamada
+em `extra_info`, para que regressões de N+1 apareçam mesmo quando o tempo
+absoluto varia entre máquinas.
+"""
+from app.api.threads import enrich_thread
+from app.core.profiling import RequestProfile, _current_profile, install_query_listeners
+from app.models.thread import Thread
+from app.schemas.student_directory import StudentFilters
+from app.services.mentorship_service import MentorshipService
+from app.services.student_directory import StudentDirectoryService
+
+
+def _count_queries(fn, *args, **kwargs) -> int:
+    install_query_listeners()
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        fn(*args, **kwargs)
+    finally:
+        _current_profile.reset(token)
+    return profile.query_count
+
+
+def test_get_connection_suggestions(benchmark, bench_db, sample_user_id):
+    benchmark.extra_info["queries"] = _count_queries(
+        StudentDirectoryService.get_connection_suggestions, bench_db, sample_user_id, limit=10
+    )
+    result = benchmark.pedantic(
+        StudentDirectoryService.get_connection_suggestions,
+        args=(bench_db, sample_user_id),
+        kwargs={"limit": 10},
+        rounds=3,
+        iterations=1,
+    )
+    assert result is not None
+
+
+def test_explore_name_search(benchmark, bench_db, sample_user_id):
+    # "natalia" sem acento precisa encontrar "Natália" pela coluna normalizada
+    filters = StudentFilters(search_name="natalia", limit=20)
+    benchmark.extra_info["queries"] = _count_queries(
+        StudentDirectoryService.get_students_list, bench_db, sample_user_id, filters
+    )
+    result = benchmark(StudentDirectoryService.get_students_list, bench_db, sample_user_id, filters)
+    assert result.total > 0
+
+
+def test_get_filter_facets(benchmark, bench_db, sample_user_id):
+    benchmark.extra_info["queries"] = _count_queries(
+        StudentDirectoryService.get_filter_facets, bench_db, sample_user_id
+    )
+    facets = benchmark(StudentDirectoryService.get_filter_facets, bench_db, sample_user_id)
+    assert facets.universities
+
+
+def test_enrich_thread(benchmark, bench_db, busiest_thread_id, sample_user_id):
+    thread = bench_db.get(Thread, busiest_thread_id)
+    benchmark.extra_info["queries"] = _count_queries(enrich_thread, thread, bench_db, sample_user_id)
+    result = benchmark(enrich_thread, thread, bench_db, sample_user_id)
+    assert result.id == busiest_thread_id
+
+
+def test_find_best_mentor(benchmark, bench_db, sample_user_id):
+    benchmark.extra_info["queries"] = _count_queries(
+        MentorshipService.find_best_mentor, bench_db, sample_user_id
+    )
+    # Função cara (varre todos os perfis): poucas rodadas bastam
+    mentor_id = benchmark.pedantic(
+        MentorshipService.find_best_mentor, args=(bench_db, sample_user_id), rounds=3, iterations=1
+    )
+    assert mentor_id is not None
@@ -0,0 +1,65 @@
+"""
+Compara dois resultados do pytest-benchmark (--benchmark-json)
+
+Reporta a variação da média de cada benchmark e do número de queries
+(extra_info["queries"]) e sai com código 1 se algum piorar além do limite.
+
+Uso (a partir de src/backend):
+    python -m benchmarks.compare baseline.json atual.json --threshold 15
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+
+def load(path: str) -> Dict[str, dict]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {bench["name"]: bench for bench in data.get("benchmarks", [])}
+
+
+def compare(baseline: Dict[str, dict], current: Dict[str, dict], threshold: float) -> List[str]:
+    """Imprime a comparação e retorna os nomes dos benchmarks que regrediram"""
+    regressions = []
+    print(f"{'benchmark':<40} {'base (ms)':>10} {'atual (ms)':>11} {'var.':>8} {'queries':>12}")
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline or name not in current:
+            status = "novo" if name not in baseline else "removido"
+            print(f"{name:<40} {status:>10}")
+            continue
+
+        base_mean = baseline[name]["stats"]["mean"] * 1000
+        cur_mean = current[name]["stats"]["mean"] * 1000
+        change = (cur_mean - base_mean) / base_mean * 100 if base_mean else 0.0
+
+        base_queries = baseline[name].get("extra_info", {}).get("queries")
+        cur_queries = current[name].get("extra_info", {}).get("queries")
+        queries = f"{base_queries}->{cur_queries}" if base_queries is not None else "-"
+
+        regressed = change > threshold or (
+            base_queries is not None and cur_queries is not None and cur_queries > base_queries
+        )
+        if regressed:
+            regressions.append(name)
+        flag = "  <-- REGRESSÃO" if regressed else ""
+        print(f"{name:<40} {base_mean:>10.2f} {cur_mean:>11.2f} {change:>+7.1f}% {queries:>12}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Piora máxima aceita na média (%%)")
+    args = parser.parse_args(argv)
+
+    regressions = compare(load(args.baseline), load(args.current), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regrediram: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Fixtures da suíte de benchmarks (pytest-benchmark)
+
+A base é gerada uma vez pelo datagen e reaproveitada entre execuções:
+
+- BENCH_DATABASE_URL: banco usado (padrão: sqlite:///./bench.db)
+- BENCH_USERS: tamanho da base criada se o banco estiver vazio (padrão: 2000)
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.text_search import install_sqlite_functions
+from app.models.social import UserInterest
+from app.models.thread import Comment, Thread
+from app.models.user import User
+from benchmarks.datagen import BENCH_EMAIL_DOMAIN, DataGenConfig, generate
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite:///./bench.db")
+BENCH_USERS = int(os.getenv("BENCH_USERS", "2000"))
+
+
+@pytest.fixture(scope="session")
+def bench_engine():
+    install_sqlite_functions()
+    engine = create_engine(BENCH_DATABASE_URL)
+    with engine.connect() as conn:
+        has_data = engine.dialect.has_table(conn, "users") and conn.execute(
+            select(func.count()).select_from(User).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+        ).scalar()
+    if not has_data:
+        generate(engine, DataGenConfig(users=BENCH_USERS), create_schema=True)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def bench_db(bench_engine):
+    """Sessão descartável: tudo que o benchmark escrever sofre rollback"""
+    connection = bench_engine.connect()
+    transaction = connection.begin()
+    session = sessionmaker(bind=connection, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def sample_user_id(bench_engine) -> int:
+    """Usuário de referência (determinístico) com interesses cadastrados"""
+    with bench_engine.connect() as conn:
+        return conn.execute(
+            select(UserInterest.user_id).order_by(UserInterest.user_id).limit(1)
+            .offset(BENCH_USERS // 2)
+        ).scalar_one()
+
+
+@pytest.fixture(scope="session")
+def busiest_thread_id(bench_engine) -> int:
+    """Thread com mais comentários (pior caso do enrich_thread)"""
+    with bench_engine.connect() as conn:
+        return conn.execute(
+            select(Thread.id)
+            .join(Comment, Comment.thread_id == Thread.id)
+            .group_by(Thread.id)
+            .order_by(func.count(Comment.id).desc(), Thread.id)
+            .limit(1)
+        ).scalar_one()
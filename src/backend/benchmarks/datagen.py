@@ -0,0 +1,479 @@
+"""
+Gerador de dados sintéticos em massa para benchmarks e testes de carga
+
+Escreve direto no banco com inserts do SQLAlchemy Core em lotes (sem passar
+pela API), o que permite montar bases de 10k a 1M de usuários em minutos.
+Tudo é derivado de uma seed, então a mesma configuração gera sempre a mesma
+base.
+
+Todos os usuários gerados têm a senha BENCH_PASSWORD e e-mails no formato
+bench<N>@bench.conecta (usados pelo locustfile).
+
+Uso (a partir de src/backend):
+    python -m benchmarks.datagen --url sqlite:///./bench.db --scale 10k --create-schema
+    python -m benchmarks.datagen --scale 100k --friends-per-user 20 --json results/datagen.json
+"""
+import argparse
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import bindparam, create_engine, delete, func, insert, select, text, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.security import hash_password
+from app.core.text_search import normalize_name
+from app.db.base import Base
+from app.models import event, mentorship, notification, poll, report  # noqa: F401 (registra tabelas)
+from app.models.event import Event, EventParticipant
+from app.models.mentorship import MentorshipQueue, MentorshipQueueState
+from app.models.notification import Notification
+from app.models.profile import Profile
+from app.models.social import Friendship, Interest, UserInterest
+from app.models.thread import Comment, Thread, ThreadVote
+from app.models.user import User, UserStats
+from app.services.mentor_availability import MentorAvailabilityService
+
+BENCH_PASSWORD = "bench123"
+BENCH_EMAIL_DOMAIN = "bench.conecta"
+CHUNK_SIZE = 5000
+
+SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+UNIVERSITIES = (
+    "USP", "UNICAMP", "UNESP", "UFRJ", "UFMG", "FGV", "Insper", "PUC-SP",
+    "PUC-Rio", "UnB", "UFSC", "UFRGS", "ITA", "Mackenzie", "UFPE",
+)
+COURSES = (
+    "Engenharia de Produção", "Engenharia Civil", "Ciência da Computação",
+    "Direito", "Medicina", "Economia", "Administração", "Arquitetura",
+    "Psicologia", "Física", "Matemática", "Relações Internacionais",
+)
+INTERESTS = (
+    "Programação", "Empreendedorismo", "Finanças", "Intercâmbio", "Pesquisa",
+    "Música", "Esportes", "Fotografia", "Literatura", "Cinema", "Voluntariado",
+    "Robótica", "Design", "Política", "Idiomas", "Games", "Xadrez", "Dança",
+    "Teatro", "Culinária", "Sustentabilidade", "Marketing", "Consultoria",
+    "Mercado Financeiro", "Inteligência Artificial", "Ciência de Dados",
+    "Startups", "Direitos Humanos", "Saúde Mental", "Educação",
+)
+THREAD_CATEGORIES = ("geral", "faculdade")
+EVENT_TYPES = ("workshop", "meetup", "study_group", "networking", "webinar", "other")
+NOTIFICATION_TYPES = (
+    "comment_on_thread", "friend_request_received", "friend_request_accepted",
+    "badge_earned", "upvote_received", "event_reminder_24h",
+)
+WORDS = (
+    "bolsa intercâmbio estágio faculdade engenharia mentoria prova cálculo "
+    "processo seletivo dicas moradia república bandejão monitoria pesquisa "
+    "iniciação científica entrevista currículo networking evento palestra"
+).split()
+FIRST_NAMES = (
+    "Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Henrique",
+    "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael",
+    "Sofia", "Thiago", "Vitória", "Yuri",
+)
+LAST_NAMES = (
+    "Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Costa", "Ferreira",
+    "Rodrigues", "Almeida", "Nascimento", "Carvalho", "Gomes", "Ribeiro",
+)
+
+
+@dataclass
+class DataGenConfig:
+    users: int = 10_000
+    seed: int = 42
+    interests_per_user: int = 5
+    friends_per_user: int = 10  # Grau médio de amizades aceitas
+    pending_per_user: float = 1.0
+    threads_per_user: float = 0.5
+    comments_per_thread: int = 3
+    votes_per_thread: int = 5
+    events_per_1k_users: int = 10
+    participants_per_event: int = 25
+    notifications_per_user: int = 5
+    queue_ratio: float = 0.01  # Fração dos usuários na fila de mentoria
+    days: int = 180  # Janela de datas gerada
+
+
+def _chunked(rows: Iterable[dict], size: int = CHUNK_SIZE) -> Iterator[List[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bulk_insert(conn: Connection, model, rows: Iterable[dict]) -> int:
+    """Insere as linhas em lotes (executemany) e retorna o total inserido"""
+    total = 0
+    table = model.__table__
+    for chunk in _chunked(rows):
+        conn.execute(table.insert(), chunk)
+        total += len(chunk)
+    return total
+
+
+def _next_id(conn: Connection, model) -> int:
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _reset_sequences(conn: Connection) -> None:
+    """Após inserir IDs explícitos, o Postgres precisa das sequences atualizadas"""
+    if conn.dialect.name != "postgresql":
+        return
+    for model in (User, UserStats, Profile, Interest, Friendship, Thread, Comment,
+                  ThreadVote, Event, Notification):
+        table = model.__tablename__
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+class DataGenerator:
+    """Gera uma base sintética completa a partir de um DataGenConfig"""
+
+    def __init__(self, engine: Engine, config: DataGenConfig):
+        self.engine = engine
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.now = datetime(2025, 11, 20, 12, 0, 0)
+        self.counts: Dict[str, int] = {}
+        self.user_ids: List[int] = []
+        self.universities: Dict[int, str] = {}
+
+    def _sentence(self, n_words: int) -> str:
+        rng = self.rng
+        return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+    def _past(self) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randint(0, self.config.days * 86400))
+
+    def run(self) -> Dict[str, int]:
+        steps = (
+            ("users", self._users),
+            ("interests", self._interests),
+            ("friendships", self._friendships),
+            ("threads", self._threads),
+            ("events", self._events),
+            ("notifications", self._notifications),
+            ("mentorship_queue", self._mentorship_queue),
+            ("mentor_availability", self._mentor_availability),
+        )
+        with self.engine.begin() as conn:
+            for name, step in steps:
+                start = time.perf_counter()
+                step(conn)
+                print(f"  {name:<18} {time.perf_counter() - start:8.2f}s")
+            _reset_sequences(conn)
+        return self.counts
+
+    # === Etapas ===
+    def _users(self, conn: Connection) -> None:
+        cfg, rng = self.config, self.rng
+        first_id = _next_id(conn, User)
+        self.user_ids = list(range(first_id, first_id + cfg.users))
+        hashed = hash_password(BENCH_PASSWORD)  # Um único hash (bcrypt é caro)
+
+        self.counts["users"] = _bulk_insert(conn, User, (
+            {
+                "id": user_id,
+                "email": f"bench{user_id}@{BENCH_EMAIL_DOMAIN}",
+                "hashed_password": hashed,
+                "is_active": True,
+                "is_admin": False,
+                "is_verified": True,
+                "created_at": self._past(),
+            }
+            for user_id in self.user_ids
+        ))
+
+        def profiles():
+            for user_id in self.user_ids:
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                university = self.universities[user_id] = rng.choice(UNIVERSITIES)
+                semester = rng.randint(1, 10)
+                nickname = f"{first.lower()}_{user_id}"
+                yield {
+                    "user_id": user_id,
+                    "full_name": f"{first} {last}",
+                    "nickname": nickname,
+                    "search_name": normalize_name(f"{first} {last}", nickname),
+                    "university": university,
+                    "course": rng.choice(COURSES),
+                    "semester": f"{semester}º",
+                    "semester_number": semester,  # Insert em lote não passa pelo validates
+                    "bio": self._sentence(rng.randint(5, 20)),
+                    "is_public": rng.random() < 0.9,
+                }
+
+        self.counts["profiles"] = _bulk_insert(conn, Profile, profiles())
+        self.counts["user_stats"] = _bulk_insert(conn, UserStats, (
+            {"user_id": user_id, "points": rng.randint(0, 2000)} for user_id in self.user_ids
+        ))
+
+    def _interests(self, conn: Connection) -> None:
+        cfg, rng = self.config, self.rng
+        existing = dict(conn.execute(select(Interest.name, Interest.id)).all())
+        missing = [name for name in INTERESTS if name not in existing]
+        if missing:
+            _bulk_insert(conn, Interest, ({"name": name} for name in missing))
+            existing = dict(conn.execute(select(Interest.name, Interest.id)).all())
+        interest_ids = list(existing.values())
+        per_user = min(cfg.interests_per_user, len(interest_ids))
+
+        self.counts["user_interests"] = _bulk_insert(conn, UserInterest, (
+            {"user_id": user_id, "interest_id": interest_id}
+            for user_id in self.user_ids
+            for interest_id in rng.sample(interest_ids, rng.randint(max(1, per_user - 2), per_user))
+        ))
+
+    def _friendships(self, conn: Connection) -> None:
+        """
+        Uma linha por par (user_low_id < user_high_id), como a API faz. Cada par
+        é gerado apenas pelo menor ID, então não há duplicatas sem precisar de
+        um set global.
+        """
+        cfg, rng = self.config, self.rng
+        ids = self.user_ids
+        n = len(ids)
+
+        def rows():
+            for index, user_id in enumerate(ids):
+                remaining = n - index - 1
+                if remaining <= 0:
+                    break
+                accepted = min(remaining, max(0, round(rng.gauss(cfg.friends_per_user / 2, 2))))
+                pending = min(remaining - accepted, int(cfg.pending_per_user + rng.random()))
+                offsets = rng.sample(range(1, remaining + 1), accepted + pending)
+                for i, offset in enumerate(offsets):
+                    other = ids[index + offset]
+                    created_at = self._past()
+                    requester = user_id if rng.random() < 0.5 else other
+                    yield {"user_low_id": min(user_id, other), "user_high_id": max(user_id, other),
+                           "requester_id": requester, "status": "accepted" if i < accepted else "pending",
+                           "created_at": created_at, "updated_at": created_at}
+
+        self.counts["friendships"] = _bulk_insert(conn, Friendship, rows())
+
+    def _threads(self, conn: Connection) -> None:
+        cfg, rng = self.config, self.rng
+        ids = self.user_ids
+        n_threads = int(len(ids) * cfg.threads_per_user)
+        first_thread = _next_id(conn, Thread)
+        first_comment = _next_id(conn, Comment)
+        thread_ids = list(range(first_thread, first_thread + n_threads))
+
+        def threads():
+            for thread_id in thread_ids:
+                author = rng.choice(ids)
+                category = rng.choice(THREAD_CATEGORIES)
+                yield {
+                    "id": thread_id,
+                    "title": self._sentence(rng.randint(3, 8))[:100],
+                    "description": self._sentence(rng.randint(20, 80)),
+                    "category": category,
+                    "tags": ",".join(rng.sample(WORDS, 2)),
+                    "created_at": self._past(),
+                    "user_id": author,
+                    "university": self.universities[author] if category == "faculdade" else None,
+                    "is_reported": rng.random() < 0.01,
+                }
+
+        self.counts["threads"] = _bulk_insert(conn, Thread, threads())
+
+        def comments():
+            comment_id = first_comment
+            for thread_id in thread_ids:
+                for _ in range(rng.randint(0, cfg.comments_per_thread * 2)):
+                    yield {
+                        "id": comment_id,
+                        "content": self._sentence(rng.randint(5, 40)),
+                        "created_at": self._past(),
+                        "thread_id": thread_id,
+                        "user_id": rng.choice(ids),
+                    }
+                    comment_id += 1
+
+        self.counts["comments"] = _bulk_insert(conn, Comment, comments())
+
+        def votes():
+            for thread_id in thread_ids:
+                voters = rng.sample(ids, min(len(ids), rng.randint(0, cfg.votes_per_thread * 2)))
+                for voter in voters:
+                    yield {
+                        "user_id": voter,
+                        "thread_id": thread_id,
+                        "value": 1 if rng.random() < 0.85 else -1,
+                    }
+
+        self.counts["thread_votes"] = _bulk_insert(conn, ThreadVote, votes())
+
+    def _events(self, conn: Connection) -> None:
+        cfg, rng = self.config, self.rng
+        ids = self.user_ids
+        n_events = max(1, len(ids) * cfg.events_per_1k_users // 1000)
+        first_event = _next_id(conn, Event)
+        event_ids = list(range(first_event, first_event + n_events))
+        capacity: Dict[int, Optional[int]] = {}
+        confirmed: Dict[int, int] = {}
+
+        def events():
+            for event_id in event_ids:
+                capacity[event_id] = rng.choice((None, 20, 50, 100))
+                # Metade no passado, metade nos próximos 60 dias
+                start = self.now + timedelta(hours=rng.randint(-cfg.days * 24, 60 * 24))
+                is_online = rng.random() < 0.4
+                yield {
+                    "id": event_id,
+                    "title": self._sentence(rng.randint(3, 7))[:200],
+                    "description": self._sentence(rng.randint(20, 60)),
+                    "event_type": rng.choice(EVENT_TYPES),
+                    "start_datetime": start,
+                    "end_datetime": start + timedelta(hours=rng.randint(1, 4)),
+                    "location": None if is_online else rng.choice(UNIVERSITIES),
+                    "is_online": is_online,
+                    "online_link": "https://meet.example.com/bench" if is_online else None,
+                    "university": rng.choice(UNIVERSITIES) if rng.random() < 0.5 else None,
+                    "max_participants": capacity[event_id],
+                    "created_by": rng.choice(ids),
+                    "is_cancelled": rng.random() < 0.05,
+                }
+
+        self.counts["events"] = _bulk_insert(conn, Event, events())
+
+        def participants():
+            for event_id in event_ids:
+                size = min(len(ids), rng.randint(0, cfg.participants_per_event * 2))
+                for user_id in rng.sample(ids, size):
+                    status = rng.choice(("confirmed", "confirmed", "maybe", "declined"))
+                    waitlisted_at = None
+                    if status == "confirmed":
+                        # Acima do limite vai para a fila de espera, como em rsvp_event
+                        limit = capacity[event_id]
+                        if limit is not None and confirmed.get(event_id, 0) >= limit:
+                            status, waitlisted_at = "waitlisted", self._past()
+                        else:
+                            confirmed[event_id] = confirmed.get(event_id, 0) + 1
+                    yield {
+                        "event_id": event_id,
+                        "user_id": user_id,
+                        "status": status,
+                        "waitlisted_at": waitlisted_at,
+                        "attended": False,
+                    }
+
+        self.counts["event_participants"] = _bulk_insert(conn, EventParticipant, participants())
+
+        # Contador de vagas (insert em lote não passa por EventService)
+        if confirmed:
+            conn.execute(
+                update(Event)
+                .where(Event.id == bindparam("event_id"))
+                .values(confirmed_count=bindparam("seats")),
+                [{"event_id": event_id, "seats": seats} for event_id, seats in confirmed.items()],
+            )
+
+    def _notifications(self, conn: Connection) -> None:
+        cfg, rng = self.config, self.rng
+
+        def rows():
+            for user_id in self.user_ids:
+                for _ in range(rng.randint(0, cfg.notifications_per_user * 2)):
+                    is_read = rng.random() < 0.6
+                    created_at = self._past()
+                    yield {
+                        "user_id": user_id,
+                        "notification_type": rng.choice(NOTIFICATION_TYPES),
+                        "title": self._sentence(4)[:200],
+                        "content": self._sentence(rng.randint(8, 20)),
+                        "is_read": is_read,
+                        "created_at": created_at,
+                        "read_at": created_at + timedelta(hours=1) if is_read else None,
+                    }
+
+        self.counts["notifications"] = _bulk_insert(conn, Notification, rows())
+
+    def _mentorship_queue(self, conn: Connection) -> None:
+        cfg, rng = self.config, self.rng
+        size = int(len(self.user_ids) * cfg.queue_ratio)
+        entries = sorted((self._past(), user_id) for user_id in rng.sample(self.user_ids, size))
+        first_seq = (conn.execute(select(func.max(MentorshipQueue.queue_seq))).scalar() or 0) + 1
+        self.counts["mentorship_queue"] = _bulk_insert(conn, MentorshipQueue, (
+            {
+                "user_id": user_id,
+                "queue_seq": first_seq + n,  # Insert em lote não usa o default do model
+                "requested_at": requested_at,
+                "priority_score": 0.0,
+            }
+            for n, (requested_at, user_id) in enumerate(entries)
+        ))
+        conn.execute(delete(MentorshipQueueState))
+        conn.execute(insert(MentorshipQueueState).values(id=1, next_seq=first_seq + len(entries)))
+
+    def _mentor_availability(self, conn: Connection) -> None:
+        # Inserts em lote não disparam os listeners do ORM
+        self.counts["mentor_availability"] = MentorAvailabilityService.rebuild(conn)
+
+
+def generate(engine: Engine, config: DataGenConfig, create_schema: bool = False) -> Dict[str, int]:
+    """Gera a base sintética e retorna o número de linhas por tabela"""
+    if create_schema:
+        if engine.dialect.name == "postgresql":
+            # Índice trigram de profiles.search_name (gin_trgm_ops)
+            with engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        Base.metadata.create_all(bind=engine)
+    return DataGenerator(engine, config).run()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    defaults = DataGenConfig()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL do banco (padrão: DATABASE_URL das settings)")
+    parser.add_argument("--scale", choices=SCALES, help="Atalho para --users")
+    parser.add_argument("--create-schema", action="store_true", help="Cria as tabelas (metadata.create_all)")
+    parser.add_argument("--json", help="Salva contagens e tempos neste arquivo")
+    for field, value in asdict(defaults).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args(argv)
+
+    config = DataGenConfig(**{field: getattr(args, field) for field in asdict(defaults)})
+    if args.scale:
+        config.users = SCALES[args.scale]
+
+    if args.url:
+        url = args.url
+    else:
+        from app.core.config import settings
+        url = settings.DATABASE_URL
+
+    engine = create_engine(url)
+    print(f"Gerando {config.users} usuários (seed={config.seed}) em {engine.url.render_as_string()}")
+    start = time.perf_counter()
+    counts = generate(engine, config, create_schema=args.create_schema)
+    elapsed = time.perf_counter() - start
+
+    for table, count in counts.items():
+        print(f"  {table:<18} {count:>10}")
+    print(f"Total: {sum(counts.values())} linhas em {elapsed:.1f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": asdict(config), "counts": counts, "seconds": elapsed}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
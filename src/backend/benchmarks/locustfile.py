@@ -0,0 +1,115 @@
+"""
+Cenários de carga HTTP (locust) para as principais jornadas dos alunos
+
+Pressupõe uma base criada com o datagen (usuários bench<N>@bench.conecta com
+senha BENCH_PASSWORD). Exemplo, a partir de src/backend:
+
+    python -m benchmarks.datagen --scale 10k
+    locust -f benchmarks/locustfile.py --host http://localhost:8000 \\
+        --users 200 --spawn-rate 20 --run-time 5m --headless \\
+        --json > benchmarks/results/locust.json
+
+- BENCH_FIRST_USER_ID / BENCH_LAST_USER_ID: faixa de IDs gerada pelo datagen
+"""
+import os
+import random
+
+from locust import HttpUser, between, task
+
+from benchmarks.datagen import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD
+
+FIRST_USER_ID = int(os.getenv("BENCH_FIRST_USER_ID", "1"))
+LAST_USER_ID = int(os.getenv("BENCH_LAST_USER_ID", "10000"))
+
+
+class StudentUser(HttpUser):
+    """Aluno navegando: feed, diretório, amigos, eventos, notificações"""
+
+    wait_time = between(1, 3)
+
+    def on_start(self):
+        self.user_id = random.randint(FIRST_USER_ID, LAST_USER_ID)
+        response = self.client.post(
+            "/auth/token",
+            data={"email": f"bench{self.user_id}@{BENCH_EMAIL_DOMAIN}", "password": BENCH_PASSWORD},
+            name="/auth/token",
+        )
+        token = response.json().get("access_token") if response.ok else None
+        if token:
+            self.client.headers["Authorization"] = f"Bearer {token}"
+        self.thread_ids = []
+        self.event_ids = []
+
+    # === Feed de threads ===
+    @task(10)
+    def thread_feed(self):
+        response = self.client.get("/api/threads/", params={"limit": 20}, name="/api/threads/")
+        if response.ok:
+            self.thread_ids = [thread["id"] for thread in response.json()]
+
+    @task(5)
+    def thread_detail(self):
+        if not self.thread_ids:
+            return
+        thread_id = random.choice(self.thread_ids)
+        self.client.get(f"/api/threads/{thread_id}", name="/api/threads/{thread_id}")
+        self.client.get(f"/api/threads/{thread_id}/comments", name="/api/threads/{thread_id}/comments")
+
+    @task(1)
+    def vote_thread(self):
+        if not self.thread_ids:
+            return
+        thread_id = random.choice(self.thread_ids)
+        self.client.post(
+            f"/api/threads/{thread_id}/vote", json={"value": 1}, name="/api/threads/{thread_id}/vote"
+        )
+
+    # === Diretório de alunos ===
+    @task(4)
+    def explore_students(self):
+        self.client.get("/api/students/explore", params={"limit": 20}, name="/api/students/explore")
+
+    @task(2)
+    def explore_facets(self):
+        self.client.get("/api/students/explore/facets", name="/api/students/explore/facets")
+
+    @task(2)
+    def suggestions(self):
+        self.client.get("/api/students/suggestions", params={"limit": 10}, name="/api/students/suggestions")
+
+    # === Amizades ===
+    @task(3)
+    def friends(self):
+        self.client.get("/api/friendships/", name="/api/friendships/")
+        self.client.get("/api/friendships/pending/received", name="/api/friendships/pending/received")
+
+    # === Eventos ===
+    @task(3)
+    def events(self):
+        response = self.client.get("/api/events/", params={"limit": 20}, name="/api/events/")
+        if response.ok:
+            self.event_ids = [event["id"] for event in response.json()]
+
+    @task(1)
+    def event_detail(self):
+        if not self.event_ids:
+            return
+        event_id = random.choice(self.event_ids)
+        self.client.get(f"/api/events/{event_id}", name="/api/events/{event_id}")
+
+    # === Notificações / gamificação / mentoria ===
+    @task(6)
+    def unread_notifications(self):
+        self.client.get("/api/notifications/unread-count", name="/api/notifications/unread-count")
+
+    @task(2)
+    def notifications(self):
+        self.client.get("/api/notifications/", name="/api/notifications/")
+
+    @task(1)
+    def leaderboard(self):
+        self.client.get("/api/gamification/leaderboard", name="/api/gamification/leaderboard")
+
+    @task(1)
+    def available_mentors(self):
+        self.client.get("/api/mentorship/available-mentors", name="/api/mentorship/available-mentors")
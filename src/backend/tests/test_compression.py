@@ -0,0 +1,63 @@
+import gzip
+
+from app.core.compression import negotiate_encoding
+
+
+def test_negotiate_prefers_server_order():
+    """Teste: servidor escolhe brotli quando o cliente aceita ambos"""
+    assert negotiate_encoding("gzip, deflate, br", ("br", "gzip")) == "br"
+    assert negotiate_encoding("gzip, deflate", ("br", "gzip")) == "gzip"
+
+
+def test_negotiate_respects_quality():
+    """Teste: q=0 desabilita um algoritmo e q maior vence"""
+    assert negotiate_encoding("br;q=0, gzip", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip;q=0.8", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("identity", ("br", "gzip")) is None
+    assert negotiate_encoding("*", ("gzip",)) == "gzip"
+
+
+def test_large_json_response_is_gzipped(client):
+    """Teste: respostas grandes são comprimidas com gzip"""
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["info"]["title"] == "ISMART Conecta API"
+
+
+def test_large_json_response_is_brotli(client):
+    """Teste: brotli é usado quando o cliente aceita"""
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()["info"]["title"] == "ISMART Conecta API"
+
+
+def test_small_response_is_not_compressed(client):
+    """Teste: respostas abaixo do tamanho mínimo vão sem compressão"""
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.json()["message"].startswith("API ISMART Conecta")
+
+
+def test_gzip_body_is_valid(client):
+    """Teste: corpo comprimido descomprime para o JSON original"""
+    with client.stream("GET", "/openapi.json", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert gzip.decompress(raw).startswith(b"{")
+
+
+def test_default_response_class_selection():
+    """Teste: engine explícito escolhe a classe de resposta"""
+    from fastapi.responses import JSONResponse
+    from app.core.responses import ORJSONResponse, get_default_response_class
+
+    assert get_default_response_class("orjson") is ORJSONResponse
+    assert get_default_response_class("json") is JSONResponse
+    assert get_default_response_class("auto") in (ORJSONResponse, JSONResponse)
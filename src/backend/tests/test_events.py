@@ -0,0 +1,271 @@
+"""
+Testes de eventos (listagem, contagens e RSVP)
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.profiling import RequestProfile, _current_profile, install_query_listeners
+from app.core.security import create_calendar_token
+from app.models.event import Event, EventParticipant
+from app.models.notification import Notification, NotificationPreference, ScheduledNotification
+from app.models.profile import Profile
+from app.models.user import User
+from app.services.event_reminders import EventReminderService
+from app.services.event_service import EventService
+from app.services.notification_service import NotificationService
+
+
+def _add_users(db, count):
+    users = [User(email=f"p{i}@test.com", hashed_password="x", is_active=True) for i in range(count)]
+    db.add_all(users)
+    db.commit()
+    return [user.id for user in users]
+
+
+def _add_events(db, creator_id, count, max_participants=None):
+    start = datetime.utcnow() + timedelta(days=1)
+    events = [
+        Event(
+            title=f"Evento {i}",
+            event_type="meetup",
+            start_datetime=start + timedelta(hours=i),
+            end_datetime=start + timedelta(hours=i + 1),
+            created_by=creator_id,
+            max_participants=max_participants,
+        )
+        for i in range(count)
+    ]
+    db.add_all(events)
+    db.commit()
+    return [event.id for event in events]
+
+
+def _count_queries(fn):
+    install_query_listeners()
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        result = fn()
+    finally:
+        _current_profile.reset(token)
+    return result, profile.query_count
+
+
+def test_list_events_aggregates_counts_and_viewer_rsvp(client, db, admin_user, auth_headers):
+    admin_id = admin_user.id
+    event_ids = _add_events(db, admin_id, 6)
+    others = _add_users(db, 3)
+    db.add_all([
+        EventParticipant(event_id=event_ids[0], user_id=admin_id, status="maybe"),
+        EventParticipant(event_id=event_ids[0], user_id=others[0], status="confirmed"),
+        EventParticipant(event_id=event_ids[0], user_id=others[1], status="confirmed"),
+        EventParticipant(event_id=event_ids[0], user_id=others[2], status="declined"),
+        EventParticipant(event_id=event_ids[1], user_id=others[0], status="confirmed"),
+    ])
+    db.commit()
+
+    def list_events(limit):
+        response = client.get(f"/api/events/?limit={limit}", headers=auth_headers)
+        assert response.status_code == 200
+        return response.json()
+
+    small, small_queries = _count_queries(lambda: list_events(2))
+    full, full_queries = _count_queries(lambda: list_events(6))
+    assert len(full) == 6
+    assert small_queries == full_queries
+
+    events = {event["id"]: event for event in full}
+    first = events[event_ids[0]]
+    assert (first["participant_count"], first["confirmed_count"], first["maybe_count"]) == (4, 2, 1)
+    assert first["user_rsvp_status"] == "maybe"
+    assert events[event_ids[1]]["user_rsvp_status"] is None
+    assert events[event_ids[2]]["participant_count"] == 0
+
+
+def test_full_event_waitlists_and_promotes_in_order(db, admin_user):
+    (event_id,) = _add_events(db, admin_user.id, 1, max_participants=2)
+    first, second, third, fourth = _add_users(db, 4)
+
+    statuses = [EventService.rsvp_event(db, event_id, user_id).status for user_id in (first, second, third, fourth)]
+    assert statuses == ["confirmed", "confirmed", "waitlisted", "waitlisted"]
+
+    # Quem já está na fila não perde a posição ao confirmar de novo
+    assert EventService.rsvp_event(db, event_id, fourth).status == "waitlisted"
+
+    EventService.rsvp_event(db, event_id, first, "declined")
+    stats = EventService.get_events_stats(db, [event_id])[event_id]
+    assert (stats["confirmed"], stats["waitlisted"]) == (2, 1)
+    assert db.get(EventParticipant, (event_id, third)).status == "confirmed"
+    assert db.get(Event, event_id).confirmed_count == 2
+
+
+def test_concurrent_rsvps_never_oversell(db, admin_user):
+    (event_id,) = _add_events(db, admin_user.id, 1, max_participants=5)
+    user_ids = _add_users(db, 20)
+    make_session = sessionmaker(bind=db.get_bind(), autoflush=False)
+
+    def rsvp(user_id):
+        session = make_session()
+        try:
+            return EventService.rsvp_event(session, event_id, user_id).status
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(rsvp, user_ids))
+
+    assert statuses.count("confirmed") == 5
+    assert statuses.count("waitlisted") == 15
+    db.expire_all()
+    assert db.get(Event, event_id).confirmed_count == 5
+
+
+def test_concurrent_repeated_rsvps_keep_seat_counter_exact(db, admin_user):
+    (event_id,) = _add_events(db, admin_user.id, 1, max_participants=5)
+    user_ids = _add_users(db, 6)
+    decliners, hesitant, newcomers = user_ids[:2], user_ids[2:4], user_ids[4:]
+    for user_id in decliners:
+        EventService.rsvp_event(db, event_id, user_id)
+    for user_id in hesitant:
+        EventService.rsvp_event(db, event_id, user_id, "maybe")
+    make_session = sessionmaker(bind=db.get_bind(), autoflush=False)
+
+    def rsvp(args):
+        session = make_session()
+        try:
+            return EventService.rsvp_event(session, event_id, *args).status
+        finally:
+            session.close()
+
+    # Cada usuário envia o mesmo RSVP várias vezes ao mesmo tempo
+    requests = [(user_id, "declined") for user_id in decliners] + [
+        (user_id, "confirmed") for user_id in hesitant + newcomers
+    ]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(rsvp, requests * 3))
+
+    db.expire_all()
+    confirmed = db.query(EventParticipant).filter(
+        EventParticipant.event_id == event_id, EventParticipant.status == "confirmed"
+    ).count()
+    assert confirmed == 4
+    assert db.get(Event, event_id).confirmed_count == confirmed
+
+
+def test_reminders_are_scheduled_on_rsvp_and_sent_once(db, admin_user):
+    (event_id,) = _add_events(db, admin_user.id, 1)
+    start = db.get(Event, event_id).start_datetime
+    confirmed, muted, declined = _add_users(db, 3)
+    db.add(NotificationPreference(user_id=muted, event_reminder=False))
+    db.commit()
+    for user_id in (confirmed, muted, declined):
+        EventService.rsvp_event(db, event_id, user_id)
+    EventService.rsvp_event(db, event_id, declined, "declined")
+
+    scheduled = db.query(ScheduledNotification).all()
+    assert {(row.user_id, row.notification_type) for row in scheduled} == {
+        (user_id, kind) for user_id in (confirmed, muted) for kind in ("event_reminder_24h", "event_reminder_1h")
+    }
+
+    # Só o de 24h venceu; rodar de novo (ou em outro worker) não duplica
+    now = start - timedelta(hours=23, minutes=45)
+    assert EventReminderService.dispatch_due(db, now=now, batch_size=1) == 1
+    assert EventReminderService.dispatch_due(db, now=now) == 0
+    reminders = db.query(Notification).all()
+    assert [(n.user_id, n.notification_type) for n in reminders] == [(confirmed, "event_reminder_24h")]
+
+    # Re-confirmar não reagenda o que já saiu
+    EventService.rsvp_event(db, event_id, confirmed, "maybe")
+    EventService.rsvp_event(db, event_id, confirmed, "confirmed")
+    assert EventReminderService.dispatch_due(db, now=now) == 0
+
+
+def test_reminder_title_fits_column_for_long_event_titles():
+    fields = NotificationService.event_reminder_fields(1, "x" * 200, 24)
+    assert len(fields["title"]) == ScheduledNotification.__table__.c.title.type.length
+
+
+def test_participants_are_paginated_with_profiles_and_exported(client, db, admin_user, auth_headers):
+    (event_id,) = _add_events(db, admin_user.id, 1)
+    user_ids = _add_users(db, 5)
+    db.add_all([
+        Profile(user_id=user_id, full_name=f"Aluno {i}", university="USP" if i % 2 else "UFMG")
+        for i, user_id in enumerate(user_ids)
+    ])
+    joined_at = datetime(2026, 1, 1)
+    db.add_all([
+        EventParticipant(event_id=event_id, user_id=user_id, joined_at=joined_at)
+        for user_id in user_ids
+    ])
+    db.commit()
+
+    def page(cursor=None):
+        url = f"/api/events/{event_id}/participants?limit=2"
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=auth_headers)
+        assert response.status_code == 200
+        return response.json()
+
+    first, first_queries = _count_queries(page)
+    assert [p["full_name"] for p in first["participants"]] == ["Aluno 0", "Aluno 1"]
+    second, second_queries = _count_queries(lambda: page(first["next_cursor"]))
+    assert [p["user_id"] for p in second["participants"]] == user_ids[2:4]
+    assert first_queries == second_queries
+    assert page(second["next_cursor"])["next_cursor"] is None
+
+    response = client.get(f"/api/events/{event_id}/participants?university=USP", headers=auth_headers)
+    assert {p["university"] for p in response.json()["participants"]} == {"USP"}
+
+    response = client.get(f"/api/events/{event_id}/participants/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0] == "user_id,full_name,university,status,attended,joined_at"
+    assert len(lines) == 6
+
+    response = client.get(
+        f"/api/events/{event_id}/participants/export?format=ndjson&status_filter=confirmed",
+        headers=auth_headers,
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["full_name"] for row in rows] == [f"Aluno {i}" for i in range(5)]
+
+
+def test_only_the_creator_exports_participants(client, db, student_user, auth_headers):
+    (event_id,) = _add_events(db, student_user.id, 1)
+    response = client.get(f"/api/events/{event_id}/participants/export", headers=auth_headers)
+    assert response.status_code == 403
+
+
+def test_calendar_feed_uses_etag_and_tracks_rsvps_and_edits(client, db, admin_user, student_user):
+    event_ids = _add_events(db, admin_user.id, 2)
+    student_id = student_user.id
+    url = f"/api/events/calendar/me.ics?token={create_calendar_token(student_id)}"
+    EventService.rsvp_event(db, event_ids[0], student_id)
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/calendar")
+    assert f"UID:event-{event_ids[0]}@conecta-ismart" in response.text
+    assert f"UID:event-{event_ids[1]}@" not in response.text
+    etag = response.headers["etag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    EventService.rsvp_event(db, event_ids[1], student_id, "maybe")
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "STATUS:TENTATIVE" in response.text
+    etag = response.headers["etag"]
+
+    event = db.get(Event, event_ids[0])
+    event.title = "Workshop; novo, título"
+    event.updated_at = datetime.utcnow() + timedelta(minutes=1)
+    db.commit()
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "SUMMARY:Workshop\\; novo\\, título" in response.text
+
+    assert client.get("/api/events/calendar/me.ics?token=1.invalid").status_code == 401
@@ -0,0 +1,187 @@
+"""
+Testes do grafo de amizades (status, pedidos, remoção)
+"""
+from datetime import datetime
+
+from app.core.profiling import RequestProfile, _current_profile, install_query_listeners
+from app.models.profile import Profile
+from app.models.social import Friendship, Interest, UserInterest
+from app.models.user import User
+from app.services.social_graph import (
+    friends_of_friends,
+    get_adjacency,
+    get_friend_status,
+    list_friend_profiles,
+    mutual_friend_counts,
+)
+from app.services import student_directory
+from app.services.student_directory import StudentDirectoryService
+
+
+def _make_users(db, n):
+    users = [User(email=f"u{i}@test.com", hashed_password="x", is_active=True) for i in range(n)]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def test_adjacency_statuses_cost_one_query(db):
+    me, friend, sent, received, stranger = _make_users(db, 5)
+    db.add_all([
+        Friendship.between(friend.id, me.id, "accepted"),
+        Friendship.between(me.id, sent.id),
+        Friendship.between(received.id, me.id),
+    ])
+    db.commit()
+    ids = [u.id for u in (me, friend, sent, received, stranger)]
+
+    install_query_listeners()
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        statuses = [get_friend_status(db, ids[0], other) for other in ids]
+        directory = [StudentDirectoryService._get_friendship_status(db, ids[0], other) for other in ids[1:]]
+    finally:
+        _current_profile.reset(token)
+
+    assert statuses == ["self", "friends", "pending", "incoming", "none"]
+    assert directory == ["connected", "pending_sent", "pending_received", "not_connected"]
+    assert profile.query_count == 1
+
+
+def test_friendship_flow_invalidates_cached_status(client, db, admin_user, student_user, auth_headers, student_token):
+    student_headers = {"Authorization": f"Bearer {student_token}"}
+    status_url = f"/api/friendships/status/{student_user.id}"
+
+    assert client.get(status_url, headers=auth_headers).json()["status"] == "none"
+
+    client.post(f"/api/profiles/{student_user.id}/friendship", headers=auth_headers)
+    assert client.get(status_url, headers=auth_headers).json()["status"] == "pending"
+    assert get_adjacency(db, student_user.id).status(admin_user.id) == "incoming"
+
+    response = client.post(
+        f"/api/profiles/{admin_user.id}/friendship/respond?accept=true", headers=student_headers
+    )
+    assert response.status_code == 200
+    assert client.get(status_url, headers=auth_headers).json()["status"] == "friends"
+
+    assert client.delete(f"/api/friendships/{student_user.id}", headers=auth_headers).status_code == 200
+    assert client.get(status_url, headers=auth_headers).json()["status"] == "none"
+    assert get_adjacency(db, student_user.id).status(admin_user.id) == "none"
+
+
+def test_friendship_is_stored_as_one_canonical_row(client, db, admin_user, student_user, auth_headers, student_token):
+    student_headers = {"Authorization": f"Bearer {student_token}"}
+    db.add_all([Profile(user_id=admin_user.id, full_name="admin"), Profile(user_id=student_user.id, full_name="aluno")])
+    db.commit()
+
+    client.post(f"/api/profiles/{admin_user.id}/friendship", headers=student_headers)
+    received = client.get("/api/friendships/pending/received", headers=auth_headers).json()
+    assert [r["user_id"] for r in received["requests"]] == [student_user.id]
+    assert client.get("/api/friendships/pending/sent", headers=auth_headers).json()["requests"] == []
+
+    # Pedido cruzado aceita a amizade sem criar uma segunda linha
+    assert client.post(f"/api/profiles/{student_user.id}/friendship", headers=auth_headers).json() == {
+        "status": "friends"
+    }
+
+    rows = db.query(Friendship).all()
+    assert len(rows) == 1
+    low, high = sorted((admin_user.id, student_user.id))
+    assert (rows[0].user_low_id, rows[0].user_high_id, rows[0].requester_id) == (low, high, student_user.id)
+    assert rows[0].status == "accepted"
+
+    for headers in (auth_headers, student_headers):
+        listing = client.get("/api/friendships/", headers=headers).json()
+        assert listing["total"] == 1
+        assert len(listing["friends"]) == 1
+
+
+def test_mutual_friends_and_friends_of_friends(db):
+    me, a, b, c, d, pending = _make_users(db, 6)
+    db.add_all([
+        Friendship.between(me.id, a.id, "accepted"),
+        Friendship.between(b.id, me.id, "accepted"),
+        Friendship.between(a.id, c.id, "accepted"),
+        Friendship.between(c.id, b.id, "accepted"),
+        Friendship.between(d.id, a.id, "accepted"),
+        Friendship.between(a.id, pending.id, "accepted"),
+        Friendship.between(me.id, pending.id),
+    ])
+    db.add_all([Profile(user_id=u.id, full_name=f"user{u.id}") for u in (c, d, pending)])
+    db.commit()
+
+    assert mutual_friend_counts(db, me.id, [c.id, d.id, pending.id, a.id]) == {c.id: 2, d.id: 1, pending.id: 1}
+    # Amigos e pedidos pendentes não são candidatos
+    assert friends_of_friends(db, me.id) == {c.id: 2, d.id: 1}
+    assert friends_of_friends(db, me.id, limit=1) == {c.id: 2}
+
+    result = StudentDirectoryService.get_connection_suggestions(db, me.id)
+    assert [(s.student.id, s.student.mutual_friends_count) for s in result.suggestions] == [(c.id, 2), (d.id, 1)]
+    assert result.suggestions[0].reason == "Vocês têm 2 amigo(s) em comum"
+
+
+def test_friend_listing_is_one_joined_query_with_cursor_pages(db):
+    me, *others = _make_users(db, 6)
+    names = ["Ana", "Bruno", "Beatriz", "Carla", "Bia"]
+    # Mesmo created_at para todos: a página seguinte depende do desempate por id
+    created_at = datetime(2026, 1, 1, 12, 0, 0)
+    friendships = [Friendship.between(me.id, other.id, "accepted") for other in others]
+    for friendship in friendships:
+        friendship.created_at = created_at
+    db.add_all(friendships)
+    db.add_all([Profile(user_id=other.id, full_name=name) for other, name in zip(others, names)])
+    db.commit()
+    me_id = me.id
+
+    install_query_listeners()
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        first, cursor = list_friend_profiles(db, me_id, limit=3)
+    finally:
+        _current_profile.reset(token)
+    assert profile.query_count == 1
+    assert len(first) == 3 and cursor is not None
+
+    second, last_cursor = list_friend_profiles(db, me_id, cursor=cursor, limit=3)
+    assert last_cursor is None
+    assert sorted(row.full_name for row in first + second) == sorted(names)
+
+    prefixed, _ = list_friend_profiles(db, me_id, name_prefix="b")
+    assert sorted(row.full_name for row in prefixed) == ["Beatriz", "Bia", "Bruno"]
+
+
+def test_friend_listing_rejects_invalid_cursor(client, auth_headers):
+    response = client.get("/api/friendships/?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_suggestions_use_exact_mutual_counts_in_constant_queries(db, monkeypatch):
+    me, friend, *others = _make_users(db, 12)
+    interest = Interest(name="xadrez")
+    db.add(interest)
+    db.commit()
+    db.add_all([Profile(user_id=u.id, full_name=f"user{u.id}") for u in others])
+    db.add_all([UserInterest(user_id=u.id, interest_id=interest.id) for u in [me, *others]])
+    db.add(Friendship.between(me.id, friend.id, "accepted"))
+    db.add(Friendship.between(friend.id, others[0].id, "accepted"))
+    db.commit()
+
+    # Candidato por interesse fora do conjunto (limitado) de amigos de amigos
+    monkeypatch.setattr(student_directory, "friends_of_friends", lambda db, user_id: {})
+
+    install_query_listeners()
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        result = StudentDirectoryService.get_connection_suggestions(db, me.id, limit=5)
+    finally:
+        _current_profile.reset(token)
+
+    assert len(result.suggestions) == 5
+    top = result.suggestions[0]
+    assert (top.student.id, top.student.mutual_friends_count) == (others[0].id, 1)
+    assert top.common_interests == ["xadrez"] and top.compatibility_score == 100.0
+    # Sem varrer os perfis um a um: o custo não depende de quantos candidatos há
+    assert profile.query_count <= 9
@@ -0,0 +1,54 @@
+"""
+Testes do logging estruturado (JSON, correlation id e amostragem)
+"""
+import json
+import logging
+
+from app.core.logging_config import (
+    JSONFormatter,
+    RequestIdFilter,
+    SamplingFilter,
+    request_id_var,
+)
+
+
+def _record(level=logging.INFO, msg="User %s joined", args=(42,), **extra):
+    record = logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_request_id_and_extra():
+    token = request_id_var.set("abc123")
+    try:
+        record = _record(event_id=7)
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    payload = json.loads(JSONFormatter().format(record))
+    assert payload["msg"] == "User 42 joined"
+    assert payload["level"] == "INFO"
+    assert payload["request_id"] == "abc123"
+    assert payload["event_id"] == 7
+
+
+def test_sampling_filter_only_drops_sampled_info_logs():
+    drop_all = SamplingFilter(0.0)
+    assert drop_all.filter(_record(sampled=True)) is False
+    assert drop_all.filter(_record()) is True
+    assert drop_all.filter(_record(level=logging.WARNING, sampled=True)) is True
+    assert SamplingFilter(1.0).filter(_record(sampled=True)) is True
+
+
+def test_request_id_header_is_propagated(client):
+    response = client.get("/", headers={"X-Request-ID": "req-123"})
+    assert response.headers["x-request-id"] == "req-123"
+
+
+def test_request_id_is_generated_when_missing_or_invalid(client):
+    generated = client.get("/").headers["x-request-id"]
+    assert len(generated) == 32
+
+    response = client.get("/", headers={"X-Request-ID": "bad id; with spaces"})
+    assert response.headers["x-request-id"] != "bad id; with spaces"
@@ -0,0 +1,245 @@
+"""
+Testes do matching de mentoria
+"""
+from app.models.mentorship import Mentorship, MentorshipQueue
+from app.models.profile import Profile
+from app.models.social import Interest, UserInterest
+from app.models.user import User
+from app.core.semester import parse_semester
+from app.services.mentor_matching import MentorPool, _hungarian, solve_assignment
+from app.services.mentorship_service import MentorshipService
+
+
+def _make_user(db, email, semester, university="USP", interests=()):
+    user = User(email=email, hashed_password="x", is_active=True, is_verified=True)
+    db.add(user)
+    db.flush()
+    db.add(Profile(user_id=user.id, full_name=email.split("@")[0], university=university, semester=semester))
+    for interest_id in interests:
+        db.add(UserInterest(user_id=user.id, interest_id=interest_id))
+    db.commit()
+    return user
+
+
+def _make_interests(db, n=6):
+    interests = [Interest(name=f"interesse_{i}") for i in range(n)]
+    db.add_all(interests)
+    db.commit()
+    return [interest.id for interest in interests]
+
+
+def test_parse_semester():
+    assert parse_semester("4º") == 4
+    assert parse_semester("10°") == 10
+    assert parse_semester("5o semestre") == 5
+    assert parse_semester("7") == 7
+    assert parse_semester("Coordenacao") is None
+    assert parse_semester("Mentora") is None
+    assert parse_semester("2024") is None
+    assert parse_semester(None) is None
+
+
+def test_semester_number_follows_semester(db):
+    user = _make_user(db, "aluno@test.com", "3º semestre")
+    profile = db.query(Profile).filter(Profile.user_id == user.id).one()
+    assert profile.semester_number == 3
+
+    profile.semester = "Coordenacao"
+    db.commit()
+    assert db.query(Profile.semester_number).filter(Profile.user_id == user.id).scalar() is None
+
+
+def test_find_best_mentor_prefers_compatibility_and_university(db):
+    i = _make_interests(db)
+    mentee = _make_user(db, "mentee@test.com", "1º", "USP", [i[0], i[1], i[2]])
+    _make_user(db, "calouro@test.com", "2º", "USP", [i[0], i[1], i[2]])  # Semestre baixo
+    _make_user(db, "outra@test.com", "6º", "UNICAMP", [i[0], i[1]])  # 66.67
+    best = _make_user(db, "mesma@test.com", "5º", "USP", [i[0]])  # 33.33 + 10
+    _make_user(db, "invalido@test.com", "Coordenacao", "USP", [i[0], i[1], i[2]])
+
+    assert MentorshipService.find_best_mentor(db, mentee.id) == _user_id(db, "outra@test.com")
+
+    # Mentor mais compatível lotado -> próximo da lista
+    full = _user_id(db, "outra@test.com")
+    for n in range(MentorshipService.MAX_MENTEES_PER_MENTOR):
+        other = _make_user(db, f"m{n}@test.com", "1º")
+        db.add(Mentorship(mentor_id=full, mentee_id=other.id, status="active"))
+    db.commit()
+
+    assert MentorshipService.find_best_mentor(db, mentee.id) == best.id
+
+
+def test_pool_scores_match_calculate_compatibility(db):
+    i = _make_interests(db)
+    mentor = _make_user(db, "mentor@test.com", "7º", "USP", [i[0], i[1], i[3], i[4]])
+    mentee = _make_user(db, "mentee@test.com", "1º", "FGV", [i[1], i[3], i[5]])
+
+    pool = MentorPool.load(db, min_semester=4, max_mentees=3)
+    match = pool.best_for(mentee.id, "FGV", _bits(db, mentee.id))
+
+    assert match.mentor_id == mentor.id
+    assert match.compatibility == MentorshipService.calculate_compatibility(db, mentor.id, mentee.id)
+
+
+def test_process_queue_respects_capacity_in_one_pass(db):
+    i = _make_interests(db)
+    mentor = _make_user(db, "mentor@test.com", "8º", "USP", [i[0]])
+    mentees = [_make_user(db, f"mentee{n}@test.com", "1º", "USP", [i[0]]) for n in range(5)]
+    for mentee in mentees:
+        db.add(MentorshipQueue(user_id=mentee.id))
+    db.commit()
+
+    matches = MentorshipService.process_queue(db, limit=10)
+
+    assert matches == MentorshipService.MAX_MENTEES_PER_MENTOR
+    active = db.query(Mentorship).filter(Mentorship.mentor_id == mentor.id, Mentorship.status == "active")
+    assert active.count() == MentorshipService.MAX_MENTEES_PER_MENTOR
+    assert db.query(MentorshipQueue).count() == len(mentees) - MentorshipService.MAX_MENTEES_PER_MENTOR
+
+
+def test_available_mentors_and_stats_use_sql_eligibility(client, db, student_user, student_token):
+    _make_user(db, "veterano@test.com", "6o semestre")
+    full = _make_user(db, "lotado@test.com", "8º")
+    _make_user(db, "calouro@test.com", "2º")
+    _make_user(db, "coord@test.com", "Coordenacao")
+    for n in range(MentorshipService.MAX_MENTEES_PER_MENTOR):
+        other = _make_user(db, f"m{n}@test.com", "1º")
+        db.add(Mentorship(mentor_id=full.id, mentee_id=other.id, status="active"))
+    db.add(MentorshipQueue(user_id=student_user.id))
+    db.commit()
+    headers = {"Authorization": f"Bearer {student_token}"}
+
+    mentors = client.get("/api/mentorship/available-mentors", headers=headers).json()
+    assert [m["full_name"] for m in mentors] == ["veterano"]
+    assert mentors[0]["available_slots"] == MentorshipService.MAX_MENTEES_PER_MENTOR
+
+    stats = client.get("/api/mentorship/stats").json()
+    assert stats == {
+        "active_mentorships": MentorshipService.MAX_MENTEES_PER_MENTOR,
+        "in_queue": 1,
+        "available_mentors": 1,
+    }
+
+
+def test_available_mentors_ordered_by_compatibility_and_paginated(client, db, student_user, student_token):
+    i = _make_interests(db)
+    db.add(Profile(user_id=student_user.id, full_name="aluno", university="USP", semester="1º"))
+    db.add_all([UserInterest(user_id=student_user.id, interest_id=interest) for interest in i[:3]])
+    db.commit()
+    low = _make_user(db, "baixa@test.com", "5º", "FGV", [i[0]])  # 33.33
+    high = _make_user(db, "alta@test.com", "5º", "FGV", [i[0], i[1], i[2]])  # 100
+    same = _make_user(db, "mesma@test.com", "5º", "USP", [i[0], i[4]])  # 25 + bônus
+    headers = {"Authorization": f"Bearer {student_token}"}
+
+    mentors = client.get("/api/mentorship/available-mentors", headers=headers).json()
+    assert [m["user_id"] for m in mentors] == [high.id, same.id, low.id]
+    assert [m["compatibility"] for m in mentors] == [100.0, 25.0, 33.33]
+
+    page = client.get("/api/mentorship/available-mentors?skip=1&limit=1", headers=headers).json()
+    assert [m["user_id"] for m in page] == [same.id]
+
+    # Read model acompanha mentorias criadas/finalizadas e mudança de semestre
+    mentorships = []
+    for n in range(MentorshipService.MAX_MENTEES_PER_MENTOR):
+        other = _make_user(db, f"m{n}@test.com", "1º")
+        mentorships.append(MentorshipService.create_mentorship(db, high.id, other.id))
+    low_profile = db.query(Profile).filter(Profile.user_id == low.id).one()
+    low_profile.semester = "2º"
+    db.commit()
+    mentors = client.get("/api/mentorship/available-mentors", headers=headers).json()
+    assert [m["user_id"] for m in mentors] == [same.id]
+    assert client.get("/api/mentorship/stats").json()["available_mentors"] == 1
+
+    MentorshipService.complete_mentorship(db, mentorships[0].id, high.id)
+    mentors = client.get("/api/mentorship/available-mentors", headers=headers).json()
+    assert [(m["user_id"], m["available_slots"]) for m in mentors] == [(high.id, 1), (same.id, 3)]
+    assert client.get("/api/mentorship/stats").json()["available_mentors"] == 2
+
+
+def test_queue_position_and_admin_snapshot(client, db, student_user, student_token, auth_headers):
+    # Mesmo requested_at (server_default): a ordem vem do queue_seq
+    first, second = (_make_user(db, f"fila{n}@test.com", "1º") for n in range(2))
+    db.add_all([MentorshipQueue(user_id=first.id), MentorshipQueue(user_id=second.id)])
+    db.commit()
+    db.add(MentorshipQueue(user_id=student_user.id))
+    db.commit()
+    headers = {"Authorization": f"Bearer {student_token}"}
+
+    response = client.get("/api/mentorship/queue/my-position", headers=headers)
+    assert response.json()["position"] == 3
+    assert response.json()["total_in_queue"] == 3
+
+    MentorshipService.create_mentorship(db, _make_user(db, "mentor@test.com", "6º").id, first.id)
+    response = client.get("/api/mentorship/queue/my-position", headers=headers)
+    assert (response.json()["position"], response.json()["total_in_queue"]) == (2, 2)
+
+    assert client.get("/api/mentorship/queue/snapshot", headers=headers).status_code == 403
+    snapshot = client.get("/api/mentorship/queue/snapshot", headers=auth_headers).json()
+    assert snapshot["total_in_queue"] == 2
+    assert [(e["user_id"], e["position"]) for e in snapshot["entries"]] == [(second.id, 1), (student_user.id, 2)]
+
+
+def _queue_where_greedy_is_suboptimal(db):
+    i = _make_interests(db)
+    mentor_a = _make_user(db, "a@test.com", "6º", "USP", [i[0], i[1]])
+    mentor_b = _make_user(db, "b@test.com", "6º", "FGV", [i[0], i[2]])
+    # Mentor A só tem uma vaga livre
+    for n in range(MentorshipService.MAX_MENTEES_PER_MENTOR - 1):
+        other = _make_user(db, f"ocupado{n}@test.com", "1º")
+        db.add(Mentorship(mentor_id=mentor_a.id, mentee_id=other.id, status="active"))
+    first = _make_user(db, "primeiro@test.com", "1º", "Insper", [i[0], i[1], i[2]])
+    second = _make_user(db, "segundo@test.com", "1º", "Insper", [i[1]])
+    db.add(MentorshipQueue(user_id=first.id))
+    db.commit()
+    db.add(MentorshipQueue(user_id=second.id))
+    db.commit()
+    return mentor_a, mentor_b, first, second
+
+
+def test_batch_assignment_beats_greedy(db):
+    mentor_a, mentor_b, first, second = _queue_where_greedy_is_suboptimal(db)
+
+    report = MentorshipService.assign_queue_batch(db, dry_run=False)
+
+    assert report["greedy"]["total_score"] < report["optimal"]["total_score"]
+    assert report["optimal"]["matched"] == 2
+    pairs = {(m.mentee_id, m.mentor_id) for m in db.query(Mentorship).filter(Mentorship.mentee_id.in_([first.id, second.id]))}
+    assert pairs == {(first.id, mentor_b.id), (second.id, mentor_a.id)}
+    assert db.query(MentorshipQueue).count() == 0
+
+
+def test_batch_assignment_dry_run_endpoint(client, db, auth_headers, student_token):
+    _queue_where_greedy_is_suboptimal(db)
+
+    forbidden = client.post("/api/mentorship/queue/assign", headers={"Authorization": f"Bearer {student_token}"})
+    assert forbidden.status_code == 403
+
+    response = client.post("/api/mentorship/queue/assign", headers=auth_headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["dry_run"] is True
+    assert len(report["assignments"]) == 2
+    assert db.query(MentorshipQueue).count() == 2
+
+
+def test_hungarian_fallback_matches_solver():
+    cost = [
+        [4, 1, 3, 9],
+        [2, 0, 5, 8],
+        [3, 2, 2, 7],
+    ]
+    total = lambda pairs: sum(cost[r][c] for r, c in pairs)
+    assert total(_hungarian(cost)) == total(solve_assignment(cost)) == 5
+    tall = [list(col) for col in zip(*cost)]
+    assert len(solve_assignment(tall)) == 3
+
+
+def _user_id(db, email):
+    return db.query(User.id).filter(User.email == email).scalar()
+
+
+def _bits(db, user_id):
+    bits = 0
+    for (interest_id,) in db.query(UserInterest.interest_id).filter(UserInterest.user_id == user_id):
+        bits |= 1 << interest_id
+    return bits
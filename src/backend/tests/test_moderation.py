@@ -0,0 +1,280 @@
+"""
+Testes de moderação (denúncias e estatísticas)
+"""
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.event import Event, EventParticipant
+from app.models.mentorship import MentorAvailability, Mentorship
+from app.core.profiling import RequestProfile, _current_profile, install_query_listeners
+from app.models.notification import Notification
+from app.models.poll import Poll, PollOption, PollVote
+from app.models.profile import Profile
+from app.models.report import Report, ReportTarget
+from app.models.thread import Comment, CommentVote, Thread, ThreadVote
+from app.models.user import User
+from app.services.event_service import EventService
+from app.services.moderation_stats import ModerationStatsService, stats_cache
+from app.services.purge_service import PurgeService
+from app.services.report_service import ReportService
+
+
+def test_moderation_stats_come_from_one_query(db, client, admin_user, student_user, auth_headers):
+    stats_cache.invalidate()
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    db.add_all([
+        Report(reporter_id=student_user.id, target_type="thread", target_id=1, category="spam"),
+        Report(reporter_id=student_user.id, target_type="comment", target_id=2, category="spam", status="approved"),
+        Report(
+            reporter_id=admin_user.id, target_type="user", target_id=3, category="fake",
+            status="rejected", created_at=yesterday,
+        ),
+    ])
+    db.commit()
+
+    install_query_listeners()
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        stats = ModerationStatsService.get_stats(db, days=7)
+    finally:
+        _current_profile.reset(token)
+    assert profile.query_count == 1
+
+    assert stats["total_reports"] == 3
+    assert stats["by_status"] == {"pending": 1, "reviewed": 0, "approved": 1, "rejected": 1}
+    assert stats["by_type"] == {"thread": 1, "comment": 1, "user": 1}
+    assert stats["by_category"]["spam"] == 2
+    assert len(stats["daily"]) == 7
+    assert [day["total"] for day in stats["daily"][-2:]] == [1, 2]
+    assert stats["daily"][-2]["by_status"]["rejected"] == 1
+
+    # Criar denúncia pela API invalida o cache
+    response = client.post(
+        "/api/moderation/reports",
+        json={"target_type": "user", "target_id": student_user.id, "category": "other"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    response = client.get("/api/moderation/stats?days=7", headers=auth_headers)
+    assert response.json()["total_reports"] == 4
+
+
+def test_reports_are_aggregated_per_target_and_auto_hide(db, client, admin_user, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_AUTO_HIDE_THRESHOLD", 3)
+    author = User(email="autor@test.com", hashed_password="x", is_active=True)
+    db.add(author)
+    db.commit()
+    hot = Thread(title="Polêmica", description="...", category="geral", user_id=author.id)
+    mild = Thread(title="Spam leve", description="...", category="geral", user_id=author.id)
+    db.add_all([hot, mild])
+    db.commit()
+    hot_id, mild_id = hot.id, mild.id
+    reporters = [User(email=f"r{i}@test.com", hashed_password="x", is_active=True) for i in range(3)]
+    db.add_all(reporters)
+    db.commit()
+
+    for reporter, category in zip(reporters, ["harassment", "harassment", "spam"]):
+        ReportService.record_report(
+            db, Report(reporter_id=reporter.id, target_type="thread", target_id=hot_id, category=category)
+        )
+    ReportService.record_report(
+        db, Report(reporter_id=reporters[0].id, target_type="thread", target_id=hot_id, category="offensive")
+    )
+    ReportService.record_report(
+        db, Report(reporter_id=reporters[0].id, target_type="thread", target_id=mild_id, category="spam")
+    )
+    db.commit()
+
+    assert db.get(Thread, hot_id).is_hidden is True
+    assert db.get(Thread, mild_id).is_hidden is False
+
+    response = client.get("/api/moderation/queue", headers=auth_headers)
+    assert response.status_code == 200
+    queue = response.json()
+    assert [item["target_id"] for item in queue] == [hot_id, mild_id]
+    first = queue[0]
+    assert (first["report_count"], first["reporter_count"], first["top_category"]) == (4, 3, "harassment")
+    assert first["severity"] == 9.0 and first["hidden_at"] is not None
+
+    # Revisar a denúncia do alvo leve tira ele da fila
+    report_id = db.query(Report.id).filter(Report.target_id == mild_id).scalar()
+    response = client.put(
+        f"/api/moderation/reports/{report_id}", json={"status": "rejected"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    queue = client.get("/api/moderation/queue", headers=auth_headers).json()
+    assert [item["target_id"] for item in queue] == [hot_id]
+
+
+def test_bulk_moderation_is_set_based_with_per_item_results(db, client, admin_user, student_user, auth_headers):
+    spammer = User(email="spam@test.com", hashed_password="x", is_active=True)
+    db.add(spammer)
+    db.commit()
+    threads = [
+        Thread(title=f"Spam {i}", description="...", category="geral", user_id=spammer.id) for i in range(3)
+    ]
+    db.add_all(threads)
+    db.commit()
+    thread_ids = [thread.id for thread in threads]
+    comment = Comment(content="compre já", thread_id=thread_ids[0], user_id=spammer.id)
+    db.add(comment)
+    db.commit()
+    db.add(CommentVote(comment_id=comment.id, user_id=student_user.id, value=1))
+    for thread_id in thread_ids:
+        ReportService.record_report(
+            db, Report(reporter_id=student_user.id, target_type="thread", target_id=thread_id, category="spam")
+        )
+    db.commit()
+    report_ids = [report_id for (report_id,) in db.query(Report.id).order_by(Report.id)]
+
+    # Resolver denúncias: ids inexistentes voltam como not_found
+    response = client.post(
+        "/api/moderation/reports/bulk",
+        json={"report_ids": report_ids[:2] + [999999], "status": "rejected"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["processed"] == 2
+    assert body["results"][-1] == {"id": 999999, "result": "not_found"}
+    pending = dict(db.query(ReportTarget.target_id, ReportTarget.pending_count))
+    assert pending == {thread_ids[0]: 0, thread_ids[1]: 0, thread_ids[2]: 1}
+
+    # Ocultar threads aprova as denúncias pendentes delas
+    response = client.post(
+        "/api/moderation/content/bulk",
+        json={"target_type": "thread", "ids": thread_ids[1:], "action": "hide"},
+        headers=auth_headers,
+    )
+    assert [item["result"] for item in response.json()["results"]] == ["hidden", "hidden"]
+    db.expire_all()
+    assert db.query(Report.status).filter(Report.target_id == thread_ids[2]).scalar() == "approved"
+    assert db.get(Thread, thread_ids[2]).is_hidden is True
+
+    # Excluir threads leva comentários e votos junto
+    response = client.post(
+        "/api/moderation/content/bulk",
+        json={"target_type": "thread", "ids": [thread_ids[0], 999999], "action": "delete"},
+        headers=auth_headers,
+    )
+    assert response.json()["processed"] == 1
+    assert db.query(Comment).count() == 0 and db.query(CommentVote).count() == 0
+
+    # Banir: desativa a conta e exclui o restante do conteúdo
+    response = client.post(
+        f"/api/moderation/users/{spammer.id}/ban", json={"delete_content": True}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["threads"] == 2
+    db.expire_all()
+    assert db.get(User, spammer.id).is_active is False
+    assert db.query(Thread).filter(Thread.user_id == spammer.id).count() == 0
+
+    response = client.post("/api/moderation/users/999999/ban", json={}, headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_purge_deletes_thread_and_user_graphs_in_batches(db, client, student_user, auth_headers):
+    author = User(email="antigo@test.com", hashed_password="x", is_active=True)
+    db.add(author)
+    db.commit()
+    author_id = author.id
+    popular = Thread(title="Popular", description="...", category="geral", user_id=student_user.id)
+    own = Thread(title="Do autor", description="...", category="geral", user_id=author_id)
+    db.add_all([popular, own])
+    db.commit()
+    popular_id = popular.id
+    comments = [
+        Comment(content=f"c{i}", thread_id=popular_id, user_id=author_id if i % 2 else student_user.id)
+        for i in range(5)
+    ]
+    db.add_all(comments)
+    db.commit()
+    db.add_all([CommentVote(comment_id=comment.id, user_id=author_id, value=1) for comment in comments])
+    db.add(ThreadVote(thread_id=popular_id, user_id=author_id, value=1))
+
+    poll = Poll(title="Enquete", created_by=student_user.id)
+    db.add(poll)
+    db.commit()
+    option = PollOption(poll_id=poll.id, label="Sim", votes_count=1)
+    db.add(option)
+    db.commit()
+    db.add(PollVote(poll_id=poll.id, option_id=option.id, user_id=author_id))
+    db.add(Notification(user_id=author_id, notification_type="mention", title="t", content="c"))
+    db.commit()
+
+    # Conta: some o conteúdo do autor, inclusive votos e comentários na thread alheia
+    response = client.delete(f"/api/moderation/users/{author_id}", headers=auth_headers)
+    assert response.status_code == 200
+    deleted = response.json()["deleted"]
+    assert deleted["comments"] == 2 and deleted["comment_votes"] == 5 and deleted["users"] == 1
+    db.expire_all()
+    assert db.get(User, author_id) is None
+    assert db.query(Thread).count() == 1 and db.query(Comment).count() == 3
+    assert db.query(CommentVote).count() == db.query(ThreadVote).count() == 0
+    assert db.get(PollOption, option.id).votes_count == 0
+    assert db.query(Notification).count() == 0
+
+    # Thread: lotes pequenos apagam tudo do mesmo jeito
+    counts = PurgeService.purge_thread(db, popular_id, batch_size=2)
+    assert counts == {"comment_votes": 0, "comments": 3, "thread_votes": 0, "threads": 1}
+    assert db.query(Comment).count() == 0 and db.query(Thread).count() == 0
+
+
+def test_purge_user_frees_event_seats_and_promotes_waitlist(db, admin_user):
+    users = [User(email=f"u{i}@test.com", hashed_password="x", is_active=True) for i in range(2)]
+    db.add_all(users)
+    db.commit()
+    leaving, waiting = users[0].id, users[1].id
+    start = datetime.utcnow() + timedelta(days=2)
+    event = Event(
+        title="Workshop", event_type="workshop", start_datetime=start,
+        end_datetime=start + timedelta(hours=2), created_by=admin_user.id, max_participants=1,
+    )
+    db.add(event)
+    db.commit()
+    event_id = event.id
+    EventService.rsvp_event(db, event_id, leaving)
+    assert EventService.rsvp_event(db, event_id, waiting).status == "waitlisted"
+
+    PurgeService.purge_user(db, leaving)
+
+    db.expire_all()
+    assert db.get(Event, event_id).confirmed_count == 1
+    assert db.get(EventParticipant, (event_id, waiting)).status == "confirmed"
+
+
+def test_purge_user_refreshes_mentor_availability(db):
+    mentor = User(email="mentor@test.com", hashed_password="x", is_active=True)
+    mentee = User(email="mentee@test.com", hashed_password="x", is_active=True)
+    db.add_all([mentor, mentee])
+    db.commit()
+    mentor_id, mentee_id = mentor.id, mentee.id
+    db.add_all([
+        Profile(user_id=mentor_id, full_name="Mentora", semester="6º"),
+        Profile(user_id=mentee_id, full_name="Caloura", semester="1º"),
+    ])
+    db.commit()
+    db.add(Mentorship(mentor_id=mentor_id, mentee_id=mentee_id, status="active"))
+    db.commit()
+    assert db.get(MentorAvailability, mentor_id).active_mentees == 1
+
+    PurgeService.purge_user(db, mentee_id)
+
+    db.expire_all()
+    assert db.get(MentorAvailability, mentor_id).active_mentees == 0
+    assert db.query(Mentorship).count() == 0
+
+
+def test_hidden_thread_is_not_found_for_non_admins(db, client, admin_user, student_user, auth_headers, student_token):
+    thread = Thread(title="Oculta", description="Conteúdo ocultado", category="geral", user_id=admin_user.id, is_hidden=True)
+    db.add(thread)
+    db.commit()
+    student = {"Authorization": f"Bearer {student_token}"}
+
+    assert client.get(f"/api/threads/{thread.id}", headers=student).status_code == 404
+    assert client.get(f"/api/threads/{thread.id}/comments", headers=student).status_code == 404
+    response = client.post(f"/api/threads/{thread.id}/comments", json={"content": "olá!"}, headers=student)
+    assert response.status_code == 404
+    assert client.get(f"/api/threads/{thread.id}", headers=auth_headers).status_code == 200
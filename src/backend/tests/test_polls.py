@@ -0,0 +1,86 @@
+"""
+Testes de enquetes (serialização em lote e feed)
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import selectinload
+
+from app.api.polls import _serialize_polls
+from app.core.profiling import RequestProfile, _current_profile, install_query_listeners
+from app.models.poll import Poll, PollOption, PollVote
+from app.models.profile import Profile
+from app.models.user import User
+
+
+def _add_polls(db, creator_ids, count):
+    now = datetime.utcnow()
+    polls = [
+        Poll(
+            title=f"Enquete {i}",
+            audience="faculdade" if i % 2 else "geral",
+            created_by=creator_ids[i % len(creator_ids)],
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+    db.add_all(polls)
+    db.commit()
+    db.add_all(PollOption(poll_id=poll.id, label=label) for poll in polls for label in ("Sim", "Não"))
+    db.commit()
+    return [poll.id for poll in polls]
+
+
+def test_poll_page_loads_creators_and_viewer_votes_in_two_queries(db, admin_user):
+    creators = [User(email=f"c{i}@test.com", hashed_password="x", is_active=True) for i in range(2)]
+    db.add_all(creators)
+    db.commit()
+    db.add(Profile(user_id=creators[0].id, full_name="Criadora", university="USP"))
+    poll_ids = _add_polls(db, [creator.id for creator in creators], 5)
+    option_id = db.query(PollOption.id).filter(PollOption.poll_id == poll_ids[0], PollOption.label == "Não").scalar()
+    db.add(PollVote(poll_id=poll_ids[0], option_id=option_id, user_id=admin_user.id))
+    db.commit()
+
+    polls = db.query(Poll).options(selectinload(Poll.options)).order_by(Poll.created_at.desc()).all()
+    db.refresh(admin_user)
+    install_query_listeners()
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        serialized = _serialize_polls(polls, admin_user, db)
+    finally:
+        _current_profile.reset(token)
+
+    assert profile.query_count == 2
+    assert [poll.id for poll in serialized] == poll_ids
+    assert serialized[0].user_vote == "Não" and serialized[1].user_vote is None
+    assert serialized[0].creator.university == "USP" and serialized[1].creator.full_name is None
+
+
+def test_poll_feed_pages_by_cursor_and_filters(client, db, auth_headers):
+    creators = [User(email=f"c{i}@test.com", hashed_password="x", is_active=True) for i in range(2)]
+    db.add_all(creators)
+    db.commit()
+    db.add_all([
+        Profile(user_id=creators[0].id, full_name="Da USP", university="USP"),
+        Profile(user_id=creators[1].id, full_name="Da UFMG", university="UFMG"),
+    ])
+    poll_ids = _add_polls(db, [creator.id for creator in creators], 7)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/polls/feed", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(poll["id"] for poll in body["polls"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == poll_ids
+
+    response = client.get("/api/polls/feed?university=USP", headers=auth_headers)
+    assert [poll["id"] for poll in response.json()["polls"]] == poll_ids[::2]
+    response = client.get("/api/polls/feed?audience=faculdade&university=UFMG", headers=auth_headers)
+    assert [poll["id"] for poll in response.json()["polls"]] == poll_ids[1::2]
+
+    assert client.get("/api/polls/feed?cursor=@@", headers=auth_headers).status_code == 400
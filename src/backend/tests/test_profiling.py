@@ -0,0 +1,50 @@
+"""
+Testes do profiling de requisições (contagem de queries, Server-Timing, /metrics)
+"""
+from app.core.profiling import RequestProfile, metrics_registry, normalize_statement
+
+
+def test_normalize_statement_groups_parameter_lists():
+    a = normalize_statement("SELECT * FROM users WHERE id IN (?, ?, ?)")
+    b = normalize_statement("SELECT *  FROM users\n WHERE id IN (?)")
+    assert a == b
+    assert normalize_statement("SELECT * FROM t WHERE x = 10 AND y = 'abc'") == (
+        "SELECT * FROM t WHERE x = ? AND y = ?"
+    )
+
+
+def test_repeated_statements_flags_n_plus_one():
+    profile = RequestProfile()
+    for user_id in range(12):
+        profile.record(f"SELECT * FROM profiles WHERE user_id = {user_id}", 1.0)
+    profile.record("SELECT * FROM threads", 5.0)
+
+    repeated = profile.repeated_statements(threshold=10)
+    assert profile.query_count == 13
+    assert len(repeated) == 1
+    assert repeated[0][1].count == 12
+    assert profile.worst_statements(limit=1)[0][1].count == 12
+
+
+def test_server_timing_header_counts_queries(client, auth_headers):
+    response = client.get("/profiles/me", headers=auth_headers)
+    assert response.status_code == 200
+
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith("db;dur=")
+    assert "app;dur=" in server_timing
+    query_count = int(server_timing.split('desc="')[1].split(" ")[0])
+    assert query_count > 0
+
+
+def test_metrics_endpoint_uses_route_template(client, auth_headers):
+    metrics_registry.reset()
+    client.get("/profiles/me", headers=auth_headers)
+    client.get("/rota-que-nao-existe")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/profiles/me",status="200"} 1' in body
+    assert 'route="unmatched",status="404"' in body
+    assert "db_queries_total" in body
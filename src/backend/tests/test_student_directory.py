@@ -0,0 +1,108 @@
+"""
+Testes do diretório de alunos (busca por nome, autocomplete e cards)
+"""
+from app.core.profiling import RequestProfile, _current_profile, install_query_listeners
+from app.core.text_search import normalize_name, similarity, word_similarity
+from app.models.profile import Profile
+from app.models.social import Friendship, Interest, UserInterest
+from app.models.user import User
+from app.schemas.student_directory import StudentFilters
+from app.services.social_graph import invalidate_adjacency
+from app.services.student_directory import StudentDirectoryService
+
+
+def _add_profiles(db, names):
+    users = [User(email=f"{i}@test.com", hashed_password="x", is_active=True) for i in range(len(names))]
+    db.add_all(users)
+    db.commit()
+    db.add_all([Profile(user_id=user.id, full_name=name) for user, name in zip(users, names)])
+    db.commit()
+    return [user.id for user in users]
+
+
+def test_normalization_and_trigrams_match_pg_trgm():
+    assert normalize_name("Júlia  Souza", "ju_souza") == "julia souza ju souza"
+    assert round(similarity("word", "two words"), 6) == 0.363636
+    assert word_similarity("word", "two words") == 0.8
+
+
+def test_search_name_follows_profile_updates(db, admin_user):
+    profile = Profile(user_id=admin_user.id, full_name="João Pedro", nickname="jp")
+    db.add(profile)
+    db.commit()
+    assert profile.search_name == "joao pedro jp"
+
+    profile.full_name = "João Paulo"
+    assert profile.search_name == "joao paulo jp"
+
+
+def test_explore_search_ignores_accents_and_ranks_by_relevance(client, db, admin_user, auth_headers):
+    _add_profiles(db, ["Júlia Souza", "Julio Alves", "Carla Julia Mendes", "Marcos Lima"])
+
+    response = client.get("/api/students/explore?search_name=julia", headers=auth_headers)
+    assert response.status_code == 200
+    names = [s["full_name"] for s in response.json()["students"]]
+    # Correspondências exatas primeiro; "Julio" entra como nome parecido
+    assert set(names[:2]) == {"Júlia Souza", "Carla Julia Mendes"}
+    assert names[2:] == ["Julio Alves"]
+
+    # Erro de digitação ainda encontra pelo word_similarity
+    response = client.get("/api/students/explore?search_name=marcoz", headers=auth_headers)
+    assert [s["full_name"] for s in response.json()["students"]] == ["Marcos Lima"]
+
+
+def test_autocomplete_matches_word_prefixes(client, db, admin_user, auth_headers):
+    _add_profiles(db, ["Ágata Ribeiro", "Carla Agatha", "Bruno Lima"])
+
+    response = client.get("/api/students/autocomplete?q=aga", headers=auth_headers)
+    assert response.status_code == 200
+    assert {s["full_name"] for s in response.json()} == {"Ágata Ribeiro", "Carla Agatha"}
+
+
+def test_friend_search_uses_normalized_names(client, db, admin_user, auth_headers):
+    admin_id = admin_user.id
+    ids = _add_profiles(db, ["Otávio Reis", "Natália Costa"])
+    db.add_all([Friendship.between(admin_id, other, "accepted") for other in ids])
+    db.commit()
+
+    response = client.get("/api/friendships/search?query=otavio", headers=auth_headers)
+    assert [f["full_name"] for f in response.json()] == ["Otávio Reis"]
+
+
+def test_card_enrichment_query_count_does_not_grow_with_page(db, admin_user):
+    viewer_id = admin_user.id
+    interests = [Interest(name=name) for name in ("Python", "Música", "Xadrez", "Cinema")]
+    db.add_all(interests)
+    db.commit()
+    interest_ids = [interest.id for interest in interests]
+    ids = _add_profiles(db, [f"Aluno {i}" for i in range(6)])
+    db.add_all([UserInterest(user_id=viewer_id, interest_id=interest_ids[0])])
+    db.add_all([
+        UserInterest(user_id=user_id, interest_id=interest_id)
+        for user_id in ids
+        for interest_id in interest_ids
+    ])
+    db.add(Friendship.between(viewer_id, ids[0]))
+    db.commit()
+
+    def explore(limit):
+        invalidate_adjacency(db, viewer_id)
+        filters = StudentFilters(interests=["Python"], order_by="name", limit=limit)
+        install_query_listeners()
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            result = StudentDirectoryService.get_students_list(db, viewer_id, filters)
+        finally:
+            _current_profile.reset(token)
+        return result, profile.query_count
+
+    small, small_queries = explore(2)
+    full, full_queries = explore(6)
+    assert small_queries == full_queries
+
+    cards = {card.id: card for card in full.students}
+    assert cards[ids[0]].friendship_status == "pending_sent"
+    assert cards[ids[1]].friendship_status == "not_connected"
+    assert cards[ids[1]].interests == ["Python", "Música", "Xadrez"]
+    assert cards[ids[1]].compatibility_score == 25.0